@@ -0,0 +1,312 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from datetime import date
+from typing import Optional, TextIO
+
+from config import APP_NAME, RACE_DEFAULT_HOST, RACE_DEFAULT_PORT, PROFILES_INDEX_PATH, EXPORT_CHUNK_ROWS
+from enums.settings import Language, Difficulty
+from utils.history import EXPORT_FORMAT_CSV, HistoryExporter, HistoryFilter
+from utils.profiles import ProfileManager
+from utils.race_server import run_race_server
+from utils.text_generator import TextGenerator, load_words
+
+EXPORT_FORMAT_JSONL = "jsonl"
+EXPORT_FORMAT_TXT = "txt"
+
+DEFAULT_CHUNK_SIZE = 250
+IN_FLIGHT_CHUNKS_PER_WORKER = 4
+
+
+def _init_worker(languages: list[Language]):
+    """
+    Инициализация процесса-исполнителя: корпуса загружаются один раз на процесс.
+
+    Args:
+        languages: Языки, корпуса которых понадобятся процессу
+    """
+
+    for language in languages:
+        load_words(language)
+
+
+def _generate_chunk(
+        language: Language,
+        difficulty: Difficulty,
+        max_len: int,
+        seed_start: int,
+        seed_stop: int
+) -> list[tuple[int, list[str]]]:
+    """
+    Генерирует пачку текстов с сидами из диапазона [seed_start, seed_stop).
+
+    Returns:
+        Список пар (сид, строки текста)
+    """
+
+    return [
+        (seed, TextGenerator.from_difficulty(language, difficulty, max_len=max_len, seed=seed).text)
+        for seed in range(seed_start, seed_stop)
+    ]
+
+
+def _write_exercise(output: TextIO, export_format: str, language: Language, difficulty: Difficulty, seed: int, lines: list[str]):
+    if export_format == EXPORT_FORMAT_JSONL:
+        output.write(json.dumps(
+            {
+                "language": language.value,
+                "difficulty": difficulty.value,
+                "seed": seed,
+                "lines": lines
+            },
+            ensure_ascii=False
+        ))
+        output.write("\n")
+    else:
+        output.write(f"# {language.label} / {difficulty.label} / сид {seed}\n")
+        output.write("\n".join(lines))
+        output.write("\n\n")
+
+
+def generate_exercises(
+        output: TextIO,
+        languages: list[Language],
+        difficulties: list[Difficulty],
+        count: int,
+        seed: int = 0,
+        max_len: int = 50,
+        export_format: str = EXPORT_FORMAT_JSONL,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> tuple[int, int]:
+    """
+    Генерирует упражнения для всех сочетаний языка и сложности в пуле процессов
+    и потоково записывает их в порядке сидов.
+
+    Args:
+        output: Поток для записи
+        languages: Языки
+        difficulties: Сложности
+        count: Количество текстов на каждое сочетание
+        seed: Начальный сид; тексты получают сиды seed, seed + 1, ...
+        max_len: Максимальная длина строки
+        export_format: Формат вывода (jsonl или txt)
+        workers: Количество процессов (опционально)
+        chunk_size: Количество текстов в одной задаче
+
+    Returns:
+        Количество текстов и количество символов
+    """
+
+    workers = workers or os.cpu_count() or 1
+
+    tasks = [
+        (language, difficulty, max_len, start, min(start + chunk_size, seed + count))
+        for language in languages
+        for difficulty in difficulties
+        for start in range(seed, seed + count, chunk_size)
+    ]
+
+    max_in_flight = workers * IN_FLIGHT_CHUNKS_PER_WORKER
+
+    texts_count = 0
+    chars_count = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(languages,)) as executor:
+        pending: deque[tuple[Language, Difficulty, Future]] = deque()
+        tasks_iter = iter(tasks)
+
+        def submit_next() -> bool:
+            task = next(tasks_iter, None)
+
+            if task is None:
+                return False
+
+            pending.append((task[0], task[1], executor.submit(_generate_chunk, *task)))
+
+            return True
+
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        while pending:
+            language, difficulty, future = pending.popleft()
+
+            submit_next()
+
+            for text_seed, lines in future.result():
+                _write_exercise(output, export_format, language, difficulty, text_seed, lines)
+
+                texts_count += 1
+                chars_count += sum(len(line) for line in lines)
+
+    return texts_count, chars_count
+
+
+def _parse_enum_list(values: list[str], enum_class) -> list:
+    if "all" in values:
+        return list(enum_class)
+
+    return [enum_class(value) for value in values]
+
+
+def _positive_int(value: str) -> int:
+    """
+    Тип аргумента: целое число больше нуля.
+
+    Raises:
+        argparse.ArgumentTypeError: Не число или число меньше 1
+    """
+
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается целое число: {value}")
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"ожидается число больше нуля: {value}")
+
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description=f"{APP_NAME} - командная строка")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser("generate", help="Пакетная генерация упражнений")
+    generate_parser.add_argument(
+        "-l", "--language", nargs="+", default=["all"],
+        choices=[language.value for language in Language] + ["all"],
+        help="Языки текста"
+    )
+    generate_parser.add_argument(
+        "-d", "--difficulty", nargs="+", default=["all"],
+        choices=[difficulty.value for difficulty in Difficulty] + ["all"],
+        help="Сложности"
+    )
+    generate_parser.add_argument("-n", "--count", type=_positive_int, default=1000, help="Текстов на каждое сочетание")
+    generate_parser.add_argument("-s", "--seed", type=int, default=0, help="Начальный сид")
+    generate_parser.add_argument("--max-len", type=int, default=50, help="Максимальная длина строки")
+    generate_parser.add_argument(
+        "-f", "--format", default=EXPORT_FORMAT_JSONL, choices=[EXPORT_FORMAT_JSONL, EXPORT_FORMAT_TXT],
+        help="Формат вывода"
+    )
+    generate_parser.add_argument("-o", "--output", default="-", help="Файл вывода (- для stdout)")
+    generate_parser.add_argument("-w", "--workers", type=_positive_int, default=None, help="Количество процессов")
+    generate_parser.add_argument("--chunk-size", type=_positive_int, default=DEFAULT_CHUNK_SIZE, help="Текстов в одной задаче")
+
+    race_parser = subparsers.add_parser("race-server", help="Сервер гонок для локальной сети")
+    race_parser.add_argument("--host", default=RACE_DEFAULT_HOST, help="Адрес (0.0.0.0 для локальной сети)")
+    race_parser.add_argument("--port", type=int, default=RACE_DEFAULT_PORT, help="Порт")
+
+    export_parser = subparsers.add_parser("export", help="Выгрузка истории результатов")
+    export_parser.add_argument(
+        "-f", "--format", default=EXPORT_FORMAT_CSV, choices=[EXPORT_FORMAT_CSV, EXPORT_FORMAT_JSONL],
+        help="Формат вывода"
+    )
+    export_parser.add_argument("-o", "--output", default="-", help="Файл вывода (- для stdout)")
+    export_parser.add_argument(
+        "-p", "--profile", nargs="+", default=["all"], help="Идентификаторы или имена профилей (all - все)"
+    )
+    export_parser.add_argument(
+        "-d", "--difficulty", nargs="+", default=["all"],
+        choices=[difficulty.value for difficulty in Difficulty] + ["all"],
+        help="Сложности"
+    )
+    export_parser.add_argument("--since", type=date.fromisoformat, default=None, help="Первый день (ГГГГ-ММ-ДД)")
+    export_parser.add_argument("--until", type=date.fromisoformat, default=None, help="Последний день (ГГГГ-ММ-ДД)")
+
+    return parser
+
+
+def run_generate(args: argparse.Namespace) -> int:
+    languages = _parse_enum_list(args.language, Language)
+    difficulties = _parse_enum_list(args.difficulty, Difficulty)
+
+    started = time.perf_counter()
+
+    if args.output == "-":
+        texts_count, chars_count = generate_exercises(
+            sys.stdout, languages, difficulties, args.count, args.seed, args.max_len,
+            args.format, args.workers, args.chunk_size
+        )
+    else:
+        with open(args.output, "w", encoding="utf-8") as output:
+            texts_count, chars_count = generate_exercises(
+                output, languages, difficulties, args.count, args.seed, args.max_len,
+                args.format, args.workers, args.chunk_size
+            )
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+
+    print(
+        f"Сгенерировано текстов: {texts_count} за {elapsed:.2f} сек "
+        f"({texts_count / elapsed:.0f} текстов/сек, {chars_count / elapsed:.0f} символов/сек)",
+        file=sys.stderr
+    )
+
+    return 0
+
+
+def run_export(args: argparse.Namespace) -> int:
+    manager = ProfileManager(PROFILES_INDEX_PATH)
+    manager.load()
+
+    if "all" in args.profile:
+        profiles = manager.profiles
+    else:
+        profiles = [
+            profile for profile in manager.profiles
+            if profile.id in args.profile or profile.name in args.profile
+        ]
+
+        if not profiles:
+            print(f"Профили не найдены: {', '.join(args.profile)}", file=sys.stderr)
+
+            return 1
+
+    difficulties = {difficulty.value for difficulty in _parse_enum_list(args.difficulty, Difficulty)}
+
+    history_filter = HistoryFilter.from_dates(args.since, args.until, difficulties)
+    sources = [(profile.name, profile.history_path) for profile in profiles]
+
+    def report(exporter: HistoryExporter):
+        print(f"\rВыгружено строк: {exporter.rows} ({exporter.progress:.0%})", end="", file=sys.stderr)
+
+    if args.output == "-":
+        rows = HistoryExporter(sys.stdout, args.format, sources, history_filter).run(EXPORT_CHUNK_ROWS, report)
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="") as output:
+            rows = HistoryExporter(output, args.format, sources, history_filter).run(EXPORT_CHUNK_ROWS, report)
+
+    print(f"\rВыгружено строк: {rows}".ljust(40), file=sys.stderr)
+
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "generate":
+        return run_generate(args)
+
+    if args.command == "export":
+        return run_export(args)
+
+    if args.command == "race-server":
+        print(f"Сервер гонок запущен на {args.host}:{args.port}", file=sys.stderr)
+
+        run_race_server(args.host, args.port)
+
+        return 0
+
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
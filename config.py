@@ -3,6 +3,7 @@ APP_NAME = "ForTrain"
 ROUTE_MENU_PATH = "/"
 ROUTE_TRAINER = "/game"
 ROUTE_SETTINGS = "/settings"
+ROUTE_STATS = "/stats"
 
 ROUTE_SPECIAL_SYMBOL = "#"
 ROUTE_BACK = ROUTE_SPECIAL_SYMBOL + "back"
@@ -16,6 +17,7 @@ MAIN_STYLE_PATH = STYLES_DIR_PATH + "main.json"
 MENU_STYLE_PATH = STYLES_DIR_PATH + "menu.json"
 TRAINER_STYLE_PATH = STYLES_DIR_PATH + "trainer.json"
 SETTINGS_STYLE_PATH = STYLES_DIR_PATH + "settings.json"
+STATS_STYLE_PATH = STYLES_DIR_PATH + "stats.json"
 
 WORDS_DIR_PATH = DATA_DIR_PATH + "words/"
 RUSSIAN_WORDS_PATH = WORDS_DIR_PATH + "russian.txt"
@@ -25,3 +27,61 @@ ENGLISH_WORDS_PATH = WORDS_DIR_PATH + "english.txt"
 RUSSIAN_WORDS_REGEX = r"[А-ЯЁа-яё0-9.,!?;:'\"()[\]{}<>\/\\|@#$%^&*_=+~`№-]+"
 ENGLISH_WORDS_REGEX = r"[A-Za-z0-9.,!?;:'\"()[\]{}<>\/\\|@#$%^&*_=+~`№-]+"
 MIX_WORDS_REGEX = r"[А-ЯЁа-яёA-Za-z0-9.,!?;:'\"()[\]{}<>\/\\|@#$%^&*_=+~`№-]+"
+
+MAX_TEXT_SEED = 2 ** 32
+GENERATED_TEXT_CACHE_SIZE = 128
+
+ENDLESS_COUNTDOWN_SECONDS = 60
+
+NORMALIZATION_CHUNK_SIZE = 1024 * 1024
+NORMALIZED_TEXT_CACHE_SIZE = 8
+
+SESSIONS_DIR_PATH = DATA_DIR_PATH + "sessions/"
+LAST_SESSION_PATH = SESSIONS_DIR_PATH + "last.ftks"
+SNAPSHOT_PATH = SESSIONS_DIR_PATH + "snapshot.json"
+SNAPSHOT_TEXT_PATH = SESSIONS_DIR_PATH + "snapshot_text.bin"
+HISTORY_PATH = SESSIONS_DIR_PATH + "history.jsonl"
+
+GHOST_TICK_MS = 50
+
+RACE_DEFAULT_HOST = "127.0.0.1"
+RACE_DEFAULT_PORT = 8765
+RACE_DEFAULT_ROOM = "default"
+RACE_BROADCAST_INTERVAL = 0.02
+RACE_PROGRESS_INTERVAL = 0.1
+RACE_POLL_MS = 100
+
+SPEED_BUCKET_SECONDS = 0.5
+SPEED_INSTANT_WINDOW_SECONDS = 5
+SPEED_ROLLING_WINDOW_SECONDS = 30
+
+ERROR_MODEL_SIZE = 160
+ERROR_MODEL_PATH = DATA_DIR_PATH + "error_model.bin"
+
+TEXT_LOOKAHEAD_LINES = 3
+TEXT_HISTORY_LINES = 1
+
+SCHEDULER_BUDGET_MS = 8
+SCHEDULER_POLL_MS = 15
+SCHEDULER_WORKERS = 2
+
+TEXT_FONT_FAMILY = "Segoe UI"
+FONT_PREVIEW_THROTTLE_MS = 16
+
+FILE_WATCH_INTERVAL_MS = 1000
+
+PROFILES_DIR_PATH = DATA_DIR_PATH + "profiles/"
+PROFILES_INDEX_PATH = PROFILES_DIR_PATH + "index.json"
+DEFAULT_PROFILE_ID = "default"
+DEFAULT_PROFILE_NAME = "Общий"
+
+EXPORT_CHUNK_ROWS = 500
+
+PERF_HUD_KEY = "<F12>"
+PERF_HUD_REFRESH_MS = 250
+PERF_SAMPLES_WINDOW = 512
+
+METRICS_DIR_PATH = DATA_DIR_PATH + "metrics/"
+METRICS_PATH = METRICS_DIR_PATH + "trainer.prom"
+METRICS_WRITE_INTERVAL_MS = 15000
+METRICS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
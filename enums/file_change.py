@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class FileChange(StrEnum):
+    CREATED = "created"
+    MODIFIED = "modified"
+    DELETED = "deleted"
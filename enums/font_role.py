@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class FontRole(StrEnum):
+    TEXT = "text"
+    PREVIEW = "preview"
@@ -0,0 +1,7 @@
+from enum import IntEnum
+
+
+class KeystrokeAction(IntEnum):
+    INSERT = 0
+    DELETE = 1
+    LINE = 2
@@ -1,10 +1,11 @@
 from enum import Enum
 
-from config import ROUTE_MENU_PATH, ROUTE_TRAINER, ROUTE_SETTINGS, ROUTE_BACK
+from config import ROUTE_MENU_PATH, ROUTE_TRAINER, ROUTE_SETTINGS, ROUTE_STATS, ROUTE_BACK
 
 
 class Route(Enum):
     ROUTE_MENU = ROUTE_MENU_PATH
     ROUTE_TRAINER = ROUTE_TRAINER
     ROUTE_SETTINGS = ROUTE_SETTINGS
+    ROUTE_STATS = ROUTE_STATS
     ROUTE_BACK = ROUTE_BACK
@@ -7,6 +7,8 @@ class SettingsParam(Enum):
     THEME_MODE = "theme_mode"
     FONT_SIZE = "font_size"
     CHALLENGES = "challenges"
+    RENDERER = "renderer"
+    VERSION = "version"
 
 class Language(StrEnum):
     RUSSIAN = "russian"
@@ -50,6 +52,7 @@ class Difficulty(StrEnum):
 
 class Challenges(StrEnum):
     ON_TIME = "on_time"
+    ENDLESS = "endless"
 
     def __str__(self):
         return self.label
@@ -57,7 +60,25 @@ class Challenges(StrEnum):
     @property
     def label(self) -> Optional[str]:
         labels = {
-            self.ON_TIME: "На время"
+            self.ON_TIME: "На время",
+            self.ENDLESS: "Бесконечный текст"
+        }
+
+        return labels.get(self)
+
+
+class Renderer(StrEnum):
+    TEXT = "text"
+    CANVAS = "canvas"
+
+    def __str__(self):
+        return self.label
+
+    @property
+    def label(self) -> Optional[str]:
+        labels = {
+            self.TEXT: "Текстовое поле",
+            self.CANVAS: "Холст"
         }
 
         return labels.get(self)
@@ -10,6 +10,7 @@ class BaseFrame(ABC):
     def __init__(self, parent, controller, title: str = APP_NAME):
         self._parent = parent
         self._controller = controller
+        self._title = title
 
         self._controller.title(title)
 
@@ -41,3 +42,38 @@ class BaseFrame(ABC):
         """
 
         pass
+
+    @property
+    def keep_alive(self) -> bool:
+        """
+        Сохранять ли фрейм при переходе вперёд.
+        Такой фрейм не уничтожается, а скрывается (suspend) и показывается снова (resume) при возврате назад,
+        продолжая получать изменения настроек, пока скрыт.
+        """
+
+        return False
+
+    def suspend(self):
+        """Вызывается перед скрытием фрейма, который сохраняется при переходе."""
+
+        pass
+
+    def resume(self):
+        """Вызывается после повторного показа сохранённого фрейма."""
+
+        self._controller.title(self._title)
+
+    def close_profile(self):
+        """Вызывается перед сменой профиля пользователя: фрейм сохраняет данные текущего профиля."""
+
+        pass
+
+    def open_profile(self):
+        """Вызывается после смены профиля пользователя: фрейм загружает данные нового профиля."""
+
+        pass
+
+    def close(self):
+        """Вызывается перед уничтожением фрейма: при переходе на другой маршрут или закрытии приложения."""
+
+        pass
@@ -1,4 +1,6 @@
-from tkinter import ttk
+import tkinter as tk
+from tkinter import ttk, simpledialog
+from typing import Optional
 
 from config import APP_NAME, MENU_STYLE_PATH
 from enums.route import Route
@@ -11,6 +13,9 @@ class MenuFrame(BaseFrame):
     def __init__(self, parent, controller):
         super().__init__(parent, controller, f"{APP_NAME} - Меню")
 
+        self.__profiles_box: Optional[ttk.Combobox] = None
+        self.__profile_ids: list[str] = []
+
     @property
     def content(self) -> ttk.Frame:
         frame = ttk.Frame(self._parent)
@@ -34,9 +39,11 @@ class MenuFrame(BaseFrame):
         subtitle = ttk.Label(
             center_frame,
             text="Клавиатурный тренажёр",
-            font=("Segoe UI Light", 20)
+            font=self._controller.fonts.get("Segoe UI Light", 20)
         )
-        subtitle.grid(row=1, column=0, pady=(0, 50))
+        subtitle.grid(row=1, column=0, pady=(0, 25))
+
+        self.__build_profiles(center_frame).grid(row=2, column=0, pady=(0, 25))
 
         btn_play = ttk.Button(
             center_frame,
@@ -44,7 +51,7 @@ class MenuFrame(BaseFrame):
             command=lambda: self._controller.go(Route.ROUTE_TRAINER),
             style="Menu.TButton"
         )
-        btn_play.grid(row=2, column=0, pady=(0, 25))
+        btn_play.grid(row=3, column=0, pady=(0, 25))
 
         btn_settings = ttk.Button(
             center_frame,
@@ -52,7 +59,23 @@ class MenuFrame(BaseFrame):
             command=lambda: self._controller.go(Route.ROUTE_SETTINGS),
             style="Menu.TButton"
         )
-        btn_settings.grid(row=3, column=0, pady=(0, 25))
+        btn_settings.grid(row=4, column=0, pady=(0, 25))
+
+        btn_stats = ttk.Button(
+            center_frame,
+            text="СТАТИСТИКА",
+            command=lambda: self._controller.go(Route.ROUTE_STATS),
+            style="Menu.TButton"
+        )
+        btn_stats.grid(row=5, column=0, pady=(0, 25))
+
+        btn_window = ttk.Button(
+            center_frame,
+            text="НОВОЕ ОКНО",
+            command=self._controller.open_window,
+            style="Menu.TButton"
+        )
+        btn_window.grid(row=6, column=0, pady=(0, 25))
 
         btn_exit = ttk.Button(
             center_frame,
@@ -60,10 +83,65 @@ class MenuFrame(BaseFrame):
             command=self._controller.destroy,
             style="Menu.TButton"
         )
-        btn_exit.grid(row=4, column=0)
+        btn_exit.grid(row=7, column=0)
 
         return frame
 
+    def __build_profiles(self, master) -> ttk.Frame:
+        """Выбор профиля пользователя."""
+
+        frame = ttk.Frame(master)
+
+        ttk.Label(frame, text="Профиль:", font=self._controller.fonts.get("Segoe UI", 14)).pack(side="left", padx=(0, 10))
+
+        self.__profiles_box = ttk.Combobox(frame, state="readonly", width=25)
+        self.__profiles_box.bind("<<ComboboxSelected>>", lambda _: self.__on_profile_selected())
+        self.__profiles_box.pack(side="left", padx=(0, 10))
+
+        ttk.Button(
+            frame,
+            text="НОВЫЙ",
+            command=self.__create_profile
+        ).pack(side="left")
+
+        self.__fill_profiles()
+
+        return frame
+
+    def __fill_profiles(self):
+        self.__profile_ids = [profile.id for profile in self._controller.profiles]
+
+        self.__profiles_box.config(values=[profile.name for profile in self._controller.profiles])
+        self.__profiles_box.current(self.__profile_ids.index(self._controller.profile.id))
+
+    def __on_profile_selected(self):
+        index = self.__profiles_box.current()
+
+        if 0 <= index < len(self.__profile_ids):
+            self._controller.switch_profile(self.__profile_ids[index])
+
+    def __create_profile(self):
+        name = simpledialog.askstring("Новый профиль", "Имя профиля:", parent=self._parent)
+
+        if not name or not name.strip():
+            return
+
+        profile = self._controller.create_profile(name.strip())
+
+        if profile is not None:
+            self._controller.switch_profile(profile.id)
+
+        self.__fill_profiles()
+
+    def open_profile(self):
+        if self.__profiles_box is None:
+            return
+
+        try:
+            self.__fill_profiles()
+        except tk.TclError:
+            pass
+
     def _configure_style(self, style: ttk.Style):
         self._controller.configure_style_by_path(style, MENU_STYLE_PATH)
 
@@ -0,0 +1,141 @@
+import tkinter as tk
+import tracemalloc
+from typing import Callable, Optional
+
+from config import PERF_HUD_REFRESH_MS
+from utils.perf_counters import TimingCounter
+
+HUD_BG = "#101010"
+HUD_FG = "#7cfc00"
+
+_tracing_users = 0
+_tracing_owned = False
+
+
+def _acquire_tracing():
+    """Включить tracemalloc для процесса, если его ещё никто не включил; счётчик общий для всех HUD."""
+
+    global _tracing_users, _tracing_owned
+
+    if _tracing_users == 0 and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+        _tracing_owned = True
+
+    _tracing_users += 1
+
+
+def _release_tracing():
+    """Выключить tracemalloc, когда закрыт последний HUD, - только если его включили HUD."""
+
+    global _tracing_users, _tracing_owned
+
+    _tracing_users = max(_tracing_users - 1, 0)
+
+    if _tracing_users == 0 and _tracing_owned:
+        tracemalloc.stop()
+
+        _tracing_owned = False
+
+
+def format_timing(counter: TimingCounter) -> str:
+    """Последнее, среднее и p99 значения счётчика в миллисекундах."""
+
+    values = (counter.last, counter.mean, counter.percentile(0.99))
+
+    return " / ".join("-" if value is None else f"{value * 1000:.2f}" for value in values)
+
+
+class PerfHud:
+    """
+    Оверлей с внутренними метриками поверх фрейма.
+    Метрики собираются в счётчики по ходу работы, а оверлей только читает их по таймеру не чаще
+    раза в PERF_HUD_REFRESH_MS, поэтому сам почти не влияет на то, что измеряет. Пока в процессе
+    показан хотя бы один оверлей, включён tracemalloc (он замедляет выделение памяти, поэтому
+    работает только на это время и учитывает только память, выделенную после его включения).
+    """
+
+    def __init__(self, parent, font, collect: Callable[[], list[str]]):
+        """
+        Args:
+            parent: Родительский виджет
+            font: Шрифт
+            collect: Функция, возвращающая строки метрик
+        """
+
+        self.__parent = parent
+        self.__collect = collect
+
+        self.__label = tk.Label(parent, text="", font=font, bg=HUD_BG, fg=HUD_FG, justify="left", anchor="nw", padx=8, pady=6)
+
+        self.__job: Optional[str] = None
+        self.__visible = False
+
+    @property
+    def visible(self) -> bool:
+        return self.__visible
+
+    def toggle(self):
+        if self.__visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        if self.__visible:
+            return
+
+        self.__visible = True
+
+        _acquire_tracing()
+
+        try:
+            self.__label.place(relx=1.0, y=0, anchor="ne")
+            self.__label.lift()
+        except tk.TclError:
+            return
+
+        self.__refresh()
+
+    def hide(self):
+        if not self.__visible:
+            return
+
+        self.__visible = False
+
+        if self.__job is not None:
+            try:
+                self.__label.after_cancel(self.__job)
+            except tk.TclError:
+                pass
+
+            self.__job = None
+
+        _release_tracing()
+
+        try:
+            self.__label.place_forget()
+        except tk.TclError:
+            pass
+
+    def __refresh(self):
+        self.__job = None
+
+        if not self.__visible:
+            return
+
+        lines = self.__collect()
+
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+
+            lines.append(
+                f"Память Python с открытия HUD: {current / 2 ** 20:.1f} МБ (пик {peak / 2 ** 20:.1f} МБ)"
+            )
+
+        try:
+            self.__label.config(text="\n".join(lines))
+
+            self.__job = self.__label.after(PERF_HUD_REFRESH_MS, self.__refresh)
+        except tk.TclError:
+            pass
@@ -0,0 +1,683 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from abc import ABC, abstractmethod
+from collections import deque
+from tkinter import ttk
+from typing import Optional
+
+from enums.settings import Renderer
+
+CORRECT_COLOR = "green"
+WRONG_COLOR = "red"
+ACTIVE_COLOR = "blue"
+GHOST_COLOR = "gray"
+PREVIEW_COLOR = "gray"
+DEFAULT_TEXT_COLOR = "black"
+
+STATE_PENDING = 0
+STATE_CORRECT = 1
+STATE_WRONG = 2
+
+CANVAS_PADDING = 10
+CANVAS_CURRENT_ROWS = 2
+GHOST_MARKER_HEIGHT = 3
+
+
+class LineRenderer(ABC):
+    """Базовый класс отображения текста: предыдущие строки, текущая строка и строки впереди."""
+
+    @property
+    @abstractmethod
+    def widget(self) -> tk.Widget:
+        """Виджет для размещения во фрейме."""
+
+        pass
+
+    @abstractmethod
+    def show_line(self, line: str, preview: list[str], history: Optional[list[str]] = None):
+        """
+        Показать новую строку.
+
+        Args:
+            line: Текущая строка
+            preview: Следующие строки
+            history: Предыдущие строки (опционально)
+        """
+
+        pass
+
+    @abstractmethod
+    def update(self, typed: str, matches: bytearray, start: int = 0):
+        """
+        Обновить отображение после ввода.
+
+        Args:
+            typed: Введённый текст
+            matches: Совпадения введённых символов с ожидаемыми
+            start: Первая позиция, ввод на которой изменился
+        """
+
+        pass
+
+    @abstractmethod
+    def show_ghost(self, offset: Optional[int]):
+        """
+        Отметить позицию призрака.
+
+        Args:
+            offset: Позиция в текущей строке или None, чтобы убрать отметку
+        """
+
+        pass
+
+    @abstractmethod
+    def set_font(self, font: tkfont.Font):
+        """
+        Сменить шрифт без пересоздания виджета: показанные строки и ввод сохраняются.
+        Вызывается и после перенастройки текущего объекта шрифта, чтобы пересчитать раскладку.
+
+        Args:
+            font: Шрифт
+        """
+
+        pass
+
+
+class TextLineRenderer(LineRenderer):
+    """
+    Отображение текста в tk.Text.
+    В виджете лежат только видимые строки; при вводе перерисовывается лишь изменившийся хвост строки текущего ввода.
+    """
+
+    def __init__(self, master, font: tkfont.Font, bg: str, lookahead: int = 0, history: int = 0):
+        self.__text = tk.Text(
+            master,
+            font=font,
+            bg=bg,
+            borderwidth=0,
+            height=1 + lookahead + history,
+            wrap="word",
+            bd=0,
+            highlightthickness=0
+        )
+        self.__text.tag_configure("center", justify="center")
+        self.__text.tag_config("correct", foreground=CORRECT_COLOR)
+        self.__text.tag_config("wrong", foreground=WRONG_COLOR)
+        self.__text.tag_config("active", background=ACTIVE_COLOR)
+        self.__text.tag_config("ghost", underline=True, background=GHOST_COLOR)
+        self.__text.tag_config("preview", foreground=PREVIEW_COLOR)
+        self.__text.config(state="disabled")
+
+        self.__lookahead = lookahead
+        self.__history = history
+
+        self.__line = ""
+        self.__row = 1
+        self.__ghost_offset: Optional[int] = None
+
+    @property
+    def widget(self) -> tk.Text:
+        return self.__text
+
+    def show_line(self, line: str, preview: list[str], history: Optional[list[str]] = None):
+        text = self.__text
+
+        history = (history or [])[-self.__history:] if self.__history else []
+
+        self.__line = line
+        self.__row = len(history) + 1
+
+        text.config(state="normal")
+
+        text.delete("1.0", "end")
+
+        for history_line in history:
+            text.insert("end", history_line + "\n", "preview")
+
+        text.insert("end", line)
+
+        for preview_line in preview[:self.__lookahead]:
+            text.insert("end", "\n" + preview_line, "preview")
+
+        text.tag_add("center", "1.0", "end")
+
+        self.__draw_ghost()
+
+        text.config(state="disabled")
+
+    def update(self, typed: str, matches: bytearray, start: int = 0):
+        """Заменяются только символы строки начиная со start - одной вставкой с группами по тегам."""
+
+        text = self.__text
+        row = self.__row
+        line = self.__line
+
+        typed_len = len(typed)
+        start = min(start, typed_len, len(line))
+
+        chunks: list = []
+        run_chars: list[str] = []
+        run_tag: Optional[str] = None
+
+        for i in range(start, min(typed_len, len(line))):
+            if matches[i]:
+                ch, tag = line[i], "correct"
+            else:
+                ch, tag = (typed[i] if typed[i] != " " else "_"), "wrong"
+
+            if tag != run_tag and run_chars:
+                chunks += ["".join(run_chars), (run_tag, "center")]
+                run_chars = []
+
+            run_tag = tag
+            run_chars.append(ch)
+
+        if run_chars:
+            chunks += ["".join(run_chars), (run_tag, "center")]
+
+        if typed_len < len(line):
+            ch = line[typed_len]
+
+            chunks += [ch, ("active", "center") if typed_len > 0 and ch.strip() else ("center",)]
+            chunks += [line[typed_len + 1:], ("center",)]
+
+        text.config(state="normal")
+
+        text.delete(f"{row}.{start}", f"{row}.end")
+
+        if chunks:
+            text.insert(f"{row}.{start}", *chunks)
+
+        self.__draw_ghost()
+
+        text.config(state="disabled")
+
+    def show_ghost(self, offset: Optional[int]):
+        self.__ghost_offset = offset
+
+        self.__draw_ghost()
+
+    def set_font(self, font: tkfont.Font):
+        self.__text.config(font=font)
+
+    def __draw_ghost(self):
+        self.__text.tag_remove("ghost", "1.0", "end")
+
+        if self.__ghost_offset is not None and self.__ghost_offset < len(self.__line):
+            self.__text.tag_add("ghost", f"{self.__row}.{self.__ghost_offset}")
+
+
+class GlyphPool:
+    """
+    Набор текстовых элементов холста под символы одной строки.
+    Элементы создаются только при появлении более длинной строки и дальше переиспользуются.
+    """
+
+    def __init__(self, canvas: tk.Canvas, tag: str, font: tkfont.Font):
+        self.__canvas = canvas
+        self.__tag = tag
+        self.__font = font
+
+        self.__items: list[int] = []
+        self.__visible = False
+
+        self.__line: Optional[str] = None
+        self.__positions: list[tuple[int, int]] = []
+        self.__rows_count = 0
+        self.__width = 0
+        self.__cells: list[tuple[int, str]] = []
+
+    @property
+    def line(self) -> Optional[str]:
+        return self.__line
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def rows_count(self) -> int:
+        return self.__rows_count
+
+    @property
+    def cells(self) -> list[tuple[int, str]]:
+        return self.__cells
+
+    def position(self, index: int) -> tuple[int, int]:
+        return self.__positions[index]
+
+    def fill(self, line: str, positions: list[tuple[int, int]], rows_count: int, width: int, color: str):
+        """Записать в элементы символы новой строки."""
+
+        canvas = self.__canvas
+        items = self.__items
+
+        while len(items) < len(line):
+            items.append(canvas.create_text(
+                0, 0,
+                text="",
+                anchor="nw",
+                font=self.__font,
+                tags=(self.__tag,),
+                state="normal" if self.__visible else "hidden"
+            ))
+
+        previous_len = len(self.__line) if self.__line is not None else len(items)
+
+        for index, char in enumerate(line):
+            canvas.coords(items[index], *positions[index])
+            canvas.itemconfigure(items[index], text=char, fill=color)
+
+        for index in range(len(line), min(previous_len, len(items))):
+            canvas.itemconfigure(items[index], text="")
+
+        self.__line = line
+        self.__positions = positions
+        self.__rows_count = rows_count
+        self.__width = width
+        self.__cells = [(STATE_PENDING, char) for char in line]
+
+    def place(self, positions: list[tuple[int, int]], rows_count: int, width: int):
+        """Переставить символы строки без смены содержимого (при изменении ширины)."""
+
+        for index, position in enumerate(positions):
+            self.__canvas.coords(self.__items[index], *position)
+
+        self.__positions = positions
+        self.__rows_count = rows_count
+        self.__width = width
+
+    def set_cell(self, index: int, cell: tuple[int, str], color: str):
+        self.__cells[index] = cell
+
+        self.__canvas.itemconfigure(self.__items[index], text=cell[1], fill=color)
+
+    def set_font(self, font: tkfont.Font):
+        self.__font = font
+
+        self.__canvas.itemconfigure(self.__tag, font=font)
+
+    def set_visible(self, visible: bool):
+        self.__visible = visible
+
+        self.__canvas.itemconfigure(self.__tag, state="normal" if visible else "hidden")
+
+    def invalidate(self):
+        """Пометить содержимое устаревшим: при следующем заполнении оно будет перезаписано."""
+
+        self.__line = None
+
+
+class CanvasLineRenderer(LineRenderer):
+    """
+    Отображение текста на tk.Canvas.
+    Существуют только элементы видимых строк. Текущая строка - по элементу на символ; при вводе перекрашиваются
+    только символы, состояние которых изменилось, поэтому стоимость нажатия не зависит от длины строки.
+    Символы следующей строки заранее раскладываются во втором, скрытом наборе элементов, пока печатается текущая,
+    так что переход на новую строку - это переключение видимости двух наборов и сдвиг строк предпросмотра,
+    элементы которых переиспользуются по кругу.
+    """
+
+    def __init__(self, master, font: tkfont.Font, bg: str, lookahead: int = 0, history: int = 0):
+        self.__font = font
+        self.__line_height = self.__font.metrics("linespace")
+
+        self.__pending_color = ttk.Style().lookup("TLabel", "foreground") or DEFAULT_TEXT_COLOR
+
+        self.__canvas = tk.Canvas(
+            master,
+            bg=bg,
+            height=self.__line_height * (history + CANVAS_CURRENT_ROWS + lookahead) + 2 * CANVAS_PADDING,
+            borderwidth=0,
+            highlightthickness=0
+        )
+        self.__canvas.bind("<Configure>", self.__on_resize)
+
+        self.__current_top = CANVAS_PADDING + history * self.__line_height
+
+        self.__cursor = self.__canvas.create_rectangle(0, 0, 0, 0, fill=ACTIVE_COLOR, outline="", state="hidden")
+        self.__ghost = self.__canvas.create_rectangle(0, 0, 0, 0, fill=GHOST_COLOR, outline="", state="hidden")
+
+        self.__front = GlyphPool(self.__canvas, "glyphs-0", self.__font)
+        self.__back = GlyphPool(self.__canvas, "glyphs-1", self.__font)
+
+        self.__history_items = [self.__create_line_item("s") for _ in range(history)]
+        self.__preview_items: deque[int] = deque(self.__create_line_item("n") for _ in range(lookahead))
+        self.__item_texts: dict[int, str] = {}
+
+        self.__char_widths: dict[str, int] = {}
+
+        self.__preview: list[str] = []
+        self.__history: list[str] = []
+        self.__typed_len = 0
+        self.__cursor_index: Optional[int] = None
+        self.__ghost_offset: Optional[int] = None
+        self.__prepare_job: Optional[str] = None
+
+    @property
+    def widget(self) -> tk.Canvas:
+        return self.__canvas
+
+    def show_line(self, line: str, preview: list[str], history: Optional[list[str]] = None):
+        width = self.__available_width()
+
+        if self.__back.line != line or self.__back.width != width:
+            self.__fill_pool(self.__back, line, width)
+
+        self.__front.set_visible(False)
+        self.__back.set_visible(True)
+
+        self.__front, self.__back = self.__back, self.__front
+        self.__back.invalidate()
+
+        previous_preview = self.__preview
+
+        if previous_preview and previous_preview[0] == line:
+            self.__preview_items.rotate(-1)
+
+        self.__preview = preview[:len(self.__preview_items)]
+        self.__history = (history or [])[-len(self.__history_items):] if self.__history_items else []
+        self.__typed_len = 0
+
+        self.__place_lines()
+
+        self.__cursor_index = -1
+        self.__move_cursor(None)
+        self.show_ghost(self.__ghost_offset)
+
+        self.__schedule_prepare()
+
+    def update(self, typed: str, matches: bytearray, start: int = 0):
+        pool = self.__front
+        cells = pool.cells
+        line = pool.line or ""
+
+        typed_len = len(typed)
+        stop = min(max(typed_len, self.__typed_len), len(line))
+
+        for i in range(min(start, stop), stop):
+            if i >= typed_len:
+                cell = (STATE_PENDING, line[i])
+            elif matches[i]:
+                cell = (STATE_CORRECT, line[i])
+            else:
+                cell = (STATE_WRONG, typed[i] if typed[i] != " " else "_")
+
+            if cells[i] != cell:
+                pool.set_cell(i, cell, self.__state_color(cell[0]))
+
+        self.__typed_len = typed_len
+
+        if 0 < typed_len < len(line) and line[typed_len].strip():
+            self.__move_cursor(typed_len)
+        else:
+            self.__move_cursor(None)
+
+    def show_ghost(self, offset: Optional[int]):
+        self.__ghost_offset = offset
+
+        if offset is None or offset >= len(self.__front.line or ""):
+            self.__canvas.itemconfigure(self.__ghost, state="hidden")
+
+            return
+
+        x0, y0, x1, y1 = self.__cell_box(offset)
+
+        self.__canvas.coords(self.__ghost, x0, y1 - GHOST_MARKER_HEIGHT, x1, y1)
+        self.__canvas.itemconfigure(self.__ghost, state="normal")
+
+    def set_font(self, font: tkfont.Font):
+        if font is not self.__font:
+            self.__font = font
+
+            self.__front.set_font(font)
+            self.__back.set_font(font)
+
+            for item in (*self.__history_items, *self.__preview_items):
+                self.__canvas.itemconfigure(item, font=font)
+
+        self.__line_height = self.__font.metrics("linespace")
+        self.__char_widths.clear()
+
+        history = len(self.__history_items)
+        lookahead = len(self.__preview_items)
+
+        self.__current_top = CANVAS_PADDING + history * self.__line_height
+
+        self.__canvas.config(
+            height=self.__line_height * (history + CANVAS_CURRENT_ROWS + lookahead) + 2 * CANVAS_PADDING
+        )
+
+        self.__relayout()
+
+    def __create_line_item(self, anchor: str) -> int:
+        return self.__canvas.create_text(0, 0, text="", anchor=anchor, font=self.__font, fill=PREVIEW_COLOR, justify="center")
+
+    def __state_color(self, state: int) -> str:
+        if state == STATE_CORRECT:
+            return CORRECT_COLOR
+
+        if state == STATE_WRONG:
+            return WRONG_COLOR
+
+        return self.__pending_color
+
+    def __char_width(self, char: str) -> int:
+        width = self.__char_widths.get(char)
+
+        if width is None:
+            width = self.__font.measure(char)
+
+            self.__char_widths[char] = width
+
+        return width
+
+    def __cell_box(self, index: int) -> tuple[int, int, int, int]:
+        x, y = self.__front.position(index)
+
+        return x, y, x + self.__char_width(self.__front.line[index]), y + self.__line_height
+
+    def __move_cursor(self, index: Optional[int]):
+        if index == self.__cursor_index:
+            return
+
+        self.__cursor_index = index
+
+        if index is None:
+            self.__canvas.itemconfigure(self.__cursor, state="hidden")
+
+            return
+
+        self.__canvas.coords(self.__cursor, *self.__cell_box(index))
+        self.__canvas.itemconfigure(self.__cursor, state="normal")
+
+    def __available_width(self) -> int:
+        width = self.__canvas.winfo_width()
+
+        if width <= 1:
+            width = int(self.__canvas.cget("width"))
+
+        return max(width - 2 * CANVAS_PADDING, 1)
+
+    def __wrap(self, line: str, max_width: int) -> list[tuple[int, int, int]]:
+        """
+        Перенос строки по словам.
+
+        Returns:
+            Список строк экрана (начало, конец, ширина без завершающих пробелов)
+        """
+
+        rows = []
+
+        row_start = 0
+        row_width = 0
+        visible_width = 0
+        word_start = 0
+
+        while word_start < len(line):
+            word_end = word_start
+
+            while word_end < len(line) and line[word_end] != " ":
+                word_end += 1
+
+            word_width = sum(self.__char_width(ch) for ch in line[word_start:word_end])
+
+            if row_width and row_width + word_width > max_width:
+                rows.append((row_start, word_start, visible_width))
+
+                row_start = word_start
+                row_width = 0
+
+            row_width += word_width
+
+            visible_width = row_width
+
+            while word_end < len(line) and line[word_end] == " ":
+                row_width += self.__char_width(" ")
+                word_end += 1
+
+            word_start = word_end
+
+            if word_start >= len(line):
+                rows.append((row_start, word_start, visible_width))
+
+        return rows
+
+    def __layout(self, line: str, width: int) -> tuple[list[tuple[int, int]], int]:
+        """
+        Раскладка символов строки.
+
+        Returns:
+            Координаты символов и количество строк экрана
+        """
+
+        positions = []
+
+        rows = self.__wrap(line, width)
+
+        for row_index, (start, end, row_width) in enumerate(rows):
+            x = CANVAS_PADDING + max((width - row_width) // 2, 0)
+            y = self.__current_top + row_index * self.__line_height
+
+            for index in range(start, end):
+                positions.append((x, y))
+
+                x += self.__char_width(line[index])
+
+        return positions, max(len(rows), 1)
+
+    def __fill_pool(self, pool: GlyphPool, line: str, width: int):
+        positions, rows_count = self.__layout(line, width)
+
+        pool.fill(line, positions, rows_count, width, self.__pending_color)
+
+    def __set_item_text(self, item: int, text: str):
+        if self.__item_texts.get(item) != text:
+            self.__item_texts[item] = text
+
+            self.__canvas.itemconfigure(item, text=text)
+
+    def __place_lines(self):
+        """Расставить строки истории и предпросмотра вокруг текущей строки."""
+
+        canvas = self.__canvas
+        width = self.__front.width or self.__available_width()
+        center = CANVAS_PADDING + width // 2
+
+        y = self.__current_top
+        history = self.__history
+
+        for index, item in enumerate(reversed(self.__history_items)):
+            text = history[-1 - index] if index < len(history) else ""
+
+            self.__set_item_text(item, text)
+
+            canvas.coords(item, center, y)
+            canvas.itemconfigure(item, width=width)
+
+            bbox = canvas.bbox(item) if text else None
+
+            y -= (bbox[3] - bbox[1]) if bbox else self.__line_height
+
+        y = self.__current_top + max(self.__front.rows_count, CANVAS_CURRENT_ROWS) * self.__line_height
+
+        for index, item in enumerate(self.__preview_items):
+            text = self.__preview[index] if index < len(self.__preview) else ""
+
+            self.__set_item_text(item, text)
+
+            canvas.coords(item, center, y)
+            canvas.itemconfigure(item, width=width)
+
+            bbox = canvas.bbox(item) if text else None
+
+            y += (bbox[3] - bbox[1]) if bbox else self.__line_height
+
+    def __schedule_prepare(self):
+        if self.__prepare_job is not None:
+            self.__canvas.after_cancel(self.__prepare_job)
+
+        self.__prepare_job = self.__canvas.after_idle(self.__prepare_next)
+
+    def __prepare_next(self):
+        """Заранее разложить следующую строку в скрытом наборе элементов."""
+
+        self.__prepare_job = None
+
+        if not self.__preview:
+            return
+
+        line = self.__preview[0]
+        width = self.__available_width()
+
+        if self.__back.line != line or self.__back.width != width:
+            self.__fill_pool(self.__back, line, width)
+
+    def __on_resize(self, event):
+        pool = self.__front
+
+        if pool.line is None or pool.width == self.__available_width():
+            return
+
+        self.__relayout()
+
+    def __relayout(self):
+        """Заново разложить видимые строки: после смены ширины холста или шрифта."""
+
+        width = self.__available_width()
+        pool = self.__front
+
+        if pool.line is not None:
+            pool.place(*self.__layout(pool.line, width), width)
+
+        self.__back.invalidate()
+
+        self.__place_lines()
+
+        cursor_index = self.__cursor_index
+
+        self.__cursor_index = -1
+
+        self.__move_cursor(cursor_index)
+        self.show_ghost(self.__ghost_offset)
+
+        self.__schedule_prepare()
+
+
+def create_line_renderer(renderer: Renderer, master, font: tkfont.Font, bg: str, lookahead: int = 0, history: int = 0) -> LineRenderer:
+    """
+    Создаёт отображение текста выбранного типа.
+
+    Args:
+        renderer: Тип отображения
+        master: Родительский виджет
+        font: Шрифт
+        bg: Цвет фона
+        lookahead: Количество строк впереди
+        history: Количество предыдущих строк
+    """
+
+    if renderer is Renderer.CANVAS:
+        return CanvasLineRenderer(master, font, bg, lookahead, history)
+
+    return TextLineRenderer(master, font, bg, lookahead, history)
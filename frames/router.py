@@ -0,0 +1,156 @@
+import tkinter as tk
+from time import perf_counter
+from tkinter import ttk
+from typing import Optional
+
+from config import ROUTE_SPECIAL_SYMBOL
+from enums.route import Route
+from frames.base import BaseFrame
+from utils.metrics import NAVIGATION_SECONDS
+
+
+class FrameRouter:
+    """
+    Переходы между фреймами одного окна.
+    Окно держит один показанный фрейм и, возможно, один скрытый фрейм с keep_alive, к которому
+    можно вернуться назад без пересоздания.
+    """
+
+    def __init__(self, container: tk.Frame, controller, frames: dict[Route, type[BaseFrame]], style: ttk.Style):
+        """
+        Args:
+            container: Контейнер для содержимого фреймов
+            controller: Окно, которое фреймы получают как контроллер
+            frames: Классы фреймов по маршрутам
+            style: Стиль ttk
+        """
+
+        self.__container = container
+        self.__controller = controller
+        self.__frames = frames
+        self.__style = style
+
+        self.__frame: Optional[BaseFrame] = None
+
+        self.__content: Optional[ttk.Frame] = None
+
+        self.__route: Optional[Route] = None
+
+        self.__routes_history: list[Route] = []
+
+        self.__suspended: Optional[tuple[Route, BaseFrame, ttk.Frame]] = None
+
+    @property
+    def route(self) -> Optional[Route]:
+        return self.__route
+
+    @property
+    def frames(self) -> list[BaseFrame]:
+        """Открытые фреймы: показанный и скрытый."""
+
+        return [frame for frame in (self.__frame, self.__suspended[1] if self.__suspended else None) if frame]
+
+    def go(self, route: Route, force_refresh: bool = False):
+        if not force_refresh and self.__route == route and self.__content:
+            self.__frame.refresh(self.__style)
+
+            return
+
+        if route not in self.__frames.keys() and  route.value[0] != ROUTE_SPECIAL_SYMBOL:
+            return
+
+        started = perf_counter()
+
+        going_back = route is Route.ROUTE_BACK
+
+        if going_back:
+            if len(self.__routes_history) > 1:
+                self.__routes_history.pop()
+
+                route = self.__routes_history[-1]
+        else:
+            self.__routes_history.append(route)
+
+        suspended = self.__suspended
+        self.__suspended = None
+
+        if suspended is not None and not (going_back and suspended[0] == route):
+            self.__close_frame(*suspended[1:])
+
+            suspended = None
+
+        if self.__frame is not None:
+            if not going_back and self.__frame.keep_alive:
+                self.__frame.suspend()
+                self.__content.grid_remove()
+
+                self.__suspended = (self.__route, self.__frame, self.__content)
+            else:
+                self.__close_frame(self.__frame, self.__content)
+
+        self.__frame = None
+        self.__content = None
+
+        if suspended is not None:
+            _, frame, frame_content = suspended
+
+            frame.refresh(self.__style)
+
+            frame_content.grid()
+
+            frame.resume()
+        else:
+            frame_class = self.__frames.get(route)
+
+            if not frame_class:
+                return
+
+            frame = frame_class(parent=self.__container, controller=self.__controller)
+
+            frame.refresh(self.__style)
+
+            frame_content = frame.content
+
+            frame_content.grid(row=0, column=0, sticky="nsew")
+
+        self.__frame = frame
+
+        self.__content = frame_content
+
+        self.__route = route
+
+        NAVIGATION_SECONDS[route].observe(perf_counter() - started)
+
+    def close(self):
+        """Закрыть все фреймы окна."""
+
+        if self.__frame is not None:
+            self.__frame.close()
+
+            self.__frame = None
+
+        if self.__suspended is not None:
+            self.__suspended[1].close()
+
+            self.__suspended = None
+
+    @staticmethod
+    def __close_frame(frame: BaseFrame, content: Optional[ttk.Frame]):
+        frame.close()
+
+        if content:
+            content.destroy()
+
+    @staticmethod
+    def build_container(master) -> tk.Frame:
+        """Создать контейнер для фреймов."""
+
+        container = tk.Frame(master, padx=25, pady=25)
+
+        container.pack(fill="both", expand=True)
+
+        container.grid_rowconfigure(0, weight=1)
+
+        container.grid_columnconfigure(0, weight=1)
+
+        return container
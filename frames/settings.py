@@ -1,17 +1,18 @@
 import tkinter as tk
 from abc import ABC, abstractmethod
 from tkinter import ttk
-from typing import Any
+from typing import Any, Optional
 
-from config import SETTINGS_STYLE_PATH, APP_NAME
+from config import SETTINGS_STYLE_PATH, APP_NAME, TEXT_FONT_FAMILY, FONT_PREVIEW_THROTTLE_MS
+from enums.font_role import FontRole
 from enums.route import Route
 from enums.theme_mode import ThemeMode
-from enums.settings import SettingsParam, Language, Difficulty, Challenges
+from enums.settings import SettingsParam, Language, Difficulty, Challenges, Renderer
 from frames.base import BaseFrame
 
-from settings import DEFAULT_SETTINGS, MIN_FONT_SIZE, MAX_FONT_SIZE, Settings
+from settings import DEFAULT_SETTINGS, MIN_FONT_SIZE, MAX_FONT_SIZE, SETTINGS_SCHEMA, Settings
 
-from utils.validators import num_validator, enum_value_validator
+from utils.fonts import FontRegistry
 
 
 class SettingsRadioButton(ttk.Radiobutton):
@@ -58,8 +59,10 @@ class LanguageGroup(SettingsGroup):
         return self.__var.get()
 
     def set(self, value: Language):
-        if enum_value_validator(value, Language):
-            self.__var.set(Language(value))
+        member = SETTINGS_SCHEMA.field(SettingsParam.LANGUAGE.value).lookup(value)
+
+        if member is not None:
+            self.__var.set(member)
 
 
 class DifficultyGroup(SettingsGroup):
@@ -80,8 +83,34 @@ class DifficultyGroup(SettingsGroup):
         return self.__var.get()
 
     def set(self, value: Difficulty):
-        if enum_value_validator(value, Difficulty):
-            self.__var.set(Difficulty(value))
+        member = SETTINGS_SCHEMA.field(SettingsParam.DIFFICULTY.value).lookup(value)
+
+        if member is not None:
+            self.__var.set(member)
+
+
+class RendererGroup(SettingsGroup):
+    def __init__(self, master, initial_value: Renderer):
+        super().__init__(master, " Отображение текста ")
+        self.__var = tk.StringVar(value=initial_value)
+
+        for renderer in Renderer:
+            SettingsRadioButton(
+                self,
+                text=renderer.label,
+                variable=self.__var,
+                value=renderer
+            ).pack(side="left", padx=(0, 20))
+
+    @property
+    def get(self) -> str:
+        return self.__var.get()
+
+    def set(self, value: Renderer):
+        member = SETTINGS_SCHEMA.field(SettingsParam.RENDERER.value).lookup(value)
+
+        if member is not None:
+            self.__var.set(member)
 
 
 class ThemeGroup(SettingsGroup):
@@ -111,8 +140,10 @@ class ThemeGroup(SettingsGroup):
         return ThemeMode(self.__var.get())
 
     def set(self, value: ThemeMode):
-        if enum_value_validator(value, ThemeMode):
-            self.__var.set(ThemeMode(value))
+        member = SETTINGS_SCHEMA.field(SettingsParam.THEME_MODE.value).lookup(value)
+
+        if member is not None:
+            self.__var.set(member)
 
 
 class ChallengesGroup(SettingsGroup):
@@ -120,6 +151,7 @@ class ChallengesGroup(SettingsGroup):
         super().__init__(master, " Усложнения ")
 
         self.__on_time_var = tk.BooleanVar()
+        self.__endless_var = tk.BooleanVar()
 
         self.__unpack_settings(initial_values)
 
@@ -132,10 +164,20 @@ class ChallengesGroup(SettingsGroup):
             offvalue=False
         ).pack(side="left", padx=(0, 20))
 
+        ttk.Checkbutton(
+            self,
+            text=Challenges.ENDLESS.label,
+            variable=self.__endless_var,
+            style="SettingsCheckbutton.TCheckbutton",
+            onvalue=True,
+            offvalue=False
+        ).pack(side="left", padx=(0, 20))
+
     @property
     def get(self) -> dict[str, Any]:
         return {
-            Challenges.ON_TIME: self.__on_time_var.get()
+            Challenges.ON_TIME: self.__on_time_var.get(),
+            Challenges.ENDLESS: self.__endless_var.get()
         }
 
     def set(self, value: dict):
@@ -148,12 +190,21 @@ class ChallengesGroup(SettingsGroup):
                 DEFAULT_SETTINGS.get(SettingsParam.CHALLENGES.value).get(Challenges.ON_TIME.value)
             )
         )
+        self.__endless_var.set(
+            settings.get(
+                Challenges.ENDLESS.value,
+                DEFAULT_SETTINGS.get(SettingsParam.CHALLENGES.value).get(Challenges.ENDLESS.value)
+            )
+        )
 
 
 class FontSizeGroup(SettingsGroup):
-    def __init__(self, master, initial_size: int):
+    def __init__(self, master, fonts: FontRegistry, initial_size: int):
         super().__init__(master, " Размер шрифта ")
 
+        self.__fonts = fonts
+        self.__preview_job: Optional[str] = None
+
         self.__var = tk.IntVar()
 
         self.set(initial_size)
@@ -180,22 +231,29 @@ class FontSizeGroup(SettingsGroup):
         self.preview = ttk.Label(
             self,
             text="Аа Бб Вв - Aa Bb Cc - 12345 !?#@",
+            font=fonts.role(FontRole.PREVIEW, TEXT_FONT_FAMILY, self.get),
             padding=25
         )
         self.preview.pack(fill="x")
 
-        self.__update_preview()
-
     def __on_change(self):
-        self.__update_preview()
+        """Обновление образца при перетаскивании ползунка - не чаще раза за кадр."""
+
+        if self.__preview_job is None:
+            self.__preview_job = self.after(FONT_PREVIEW_THROTTLE_MS, self.__update_preview)
 
     def __update_preview(self):
-        size = self.__var.get()
+        self.__preview_job = None
+
+        try:
+            size = self.get
+        except tk.TclError:
+            return
 
-        self.preview.config(font=("Segoe UI", size))
+        self.__fonts.resize(FontRole.PREVIEW, size)
 
     def __get_validated_value(self) -> int:
-        value: int = num_validator(self.__var.get(), MIN_FONT_SIZE, MAX_FONT_SIZE)
+        value: int = SETTINGS_SCHEMA.field(SettingsParam.FONT_SIZE.value).validate(self.__var.get())
 
         return value
 
@@ -204,7 +262,7 @@ class FontSizeGroup(SettingsGroup):
         return self.__get_validated_value()
 
     def set(self, value: int):
-        self.__var.set(num_validator(value, MIN_FONT_SIZE, MAX_FONT_SIZE))
+        self.__var.set(SETTINGS_SCHEMA.field(SettingsParam.FONT_SIZE.value).validate(value))
 
 
 class SettingsFrame(BaseFrame):
@@ -218,6 +276,7 @@ class SettingsFrame(BaseFrame):
         self.__theme_group = None
         self.__challenges_group = None
         self.__font_group = None
+        self.__renderer_group = None
 
     @property
     def content(self) -> ttk.Frame:
@@ -269,10 +328,22 @@ class SettingsFrame(BaseFrame):
         )
         self.__font_group = FontSizeGroup(
             groups_container,
+            fonts=self._controller.fonts,
             initial_size=current.font_size
         )
+        self.__renderer_group = RendererGroup(
+            groups_container,
+            initial_value=current.renderer
+        )
 
-        for group in (self.__language_group, self.__difficulty_group, self.__theme_group, self.__challenges_group, self.__font_group):
+        for group in (
+                self.__language_group,
+                self.__difficulty_group,
+                self.__theme_group,
+                self.__challenges_group,
+                self.__font_group,
+                self.__renderer_group
+        ):
             group.pack(fill="x", pady=(0, 5))
 
     def __apply_and_back(self):
@@ -281,7 +352,8 @@ class SettingsFrame(BaseFrame):
             SettingsParam.DIFFICULTY.value: self.__difficulty_group.get,
             SettingsParam.FONT_SIZE.value: self.__font_group.get,
             SettingsParam.CHALLENGES.value: self.__challenges_group.get,
-            SettingsParam.THEME_MODE.value: self.__theme_group.get.value
+            SettingsParam.THEME_MODE.value: self.__theme_group.get.value,
+            SettingsParam.RENDERER.value: self.__renderer_group.get
         }
 
         self._controller.save_settings(new_settings)
@@ -0,0 +1,382 @@
+import tkinter as tk
+from datetime import date
+from tkinter import ttk, filedialog
+from typing import Optional
+
+from config import APP_NAME, STATS_STYLE_PATH, EXPORT_CHUNK_ROWS
+from enums.route import Route
+from enums.settings import Language, Difficulty
+from enums.task_priority import TaskPriority
+from frames.base import BaseFrame
+from utils.error_model import ErrorModel
+from utils.fonts import FONT_WEIGHT_BOLD
+from utils.history import EXPORT_FORMAT_CSV, EXPORT_FORMAT_JSONL, HistoryExporter, HistoryFilter
+from utils.scheduler import Offload, ScheduledTask
+
+KEYBOARD_LAYOUTS = {
+    Language.RUSSIAN: ("ё1234567890-=", "йцукенгшщзхъ", "фывапролджэ", "ячсмитьбю."),
+    Language.ENGLISH: ("`1234567890-=", "qwertyuiop[]", "asdfghjkl;'", "zxcvbnm,./")
+}
+
+ROW_OFFSETS = (0, 0.5, 0.75, 1.25)
+
+KEY_SIZE = 54
+KEY_GAP = 6
+KEYBOARD_PADDING = 10
+
+NO_DATA_COLOR = "#5a5a5a"
+HEAT_COLORS = ((0.0, (46, 125, 50)), (0.5, (249, 168, 37)), (1.0, (198, 40, 40)))
+
+MAX_ERROR_RATE = 0.3
+
+MODE_ERRORS = "errors"
+MODE_LATENCY = "latency"
+
+ALL_DIFFICULTIES_LABEL = "Все сложности"
+
+
+def heat_color(value: float) -> str:
+    """
+    Цвет тепловой карты для значения от 0 до 1 (зелёный - жёлтый - красный).
+
+    Args:
+        value: Значение от 0 до 1
+    """
+
+    value = min(max(value, 0.0), 1.0)
+
+    for (left_value, left_color), (right_value, right_color) in zip(HEAT_COLORS, HEAT_COLORS[1:]):
+        if value <= right_value:
+            ratio = (value - left_value) / (right_value - left_value)
+
+            red, green, blue = (round(left + (right - left) * ratio) for left, right in zip(left_color, right_color))
+
+            return f"#{red:02x}{green:02x}{blue:02x}"
+
+    return NO_DATA_COLOR
+
+
+class StatsFrame(BaseFrame):
+    """Статистика: тепловая карта клавиатуры."""
+
+    def __init__(self, parent, controller):
+        super().__init__(parent, controller, f"{APP_NAME} - Статистика")
+
+        self.__model: ErrorModel = ErrorModel()
+
+        self.__canvas: Optional[tk.Canvas] = None
+        self.__details_label = None
+
+        self.__mode_var: Optional[tk.StringVar] = None
+        self.__layout_var: Optional[tk.StringVar] = None
+
+        self.__cells: dict[Language, dict[str, tuple[int, int]]] = {}
+        self.__cells_state: dict[tuple[Language, str], tuple[str, str]] = {}
+        self.__visible_layout: Optional[Language] = None
+
+        self.__export_difficulty_box: Optional[ttk.Combobox] = None
+        self.__export_since_var: Optional[tk.StringVar] = None
+        self.__export_until_var: Optional[tk.StringVar] = None
+        self.__export_all_profiles_var: Optional[tk.BooleanVar] = None
+        self.__export_label = None
+        self.__export_task: Optional[ScheduledTask] = None
+
+    @property
+    def content(self) -> ttk.Frame:
+        frame = ttk.Frame(self._parent)
+
+        ttk.Label(frame, text="СТАТИСТИКА", style="FrameTitle.TLabel").pack(pady=(0, 25))
+
+        controls = ttk.Frame(frame)
+        controls.pack(pady=(0, 15))
+
+        self.__mode_var = tk.StringVar(value=MODE_ERRORS)
+        self.__layout_var = tk.StringVar(value=self.__default_layout())
+
+        for text, value in (("Ошибки", MODE_ERRORS), ("Скорость", MODE_LATENCY)):
+            ttk.Radiobutton(
+                controls,
+                text=text,
+                variable=self.__mode_var,
+                value=value,
+                style="StatsRadioButton.TRadiobutton",
+                command=self.__redraw
+            ).pack(side="left", padx=(0, 20))
+
+        for language in KEYBOARD_LAYOUTS:
+            ttk.Radiobutton(
+                controls,
+                text=language.label,
+                variable=self.__layout_var,
+                value=language.value,
+                style="StatsRadioButton.TRadiobutton",
+                command=self.__redraw
+            ).pack(side="left", padx=(0, 20))
+
+        rows_count = max(len(rows) for rows in KEYBOARD_LAYOUTS.values())
+        max_row_width = max(len(row) + offset for rows in KEYBOARD_LAYOUTS.values() for row, offset in zip(rows, ROW_OFFSETS))
+
+        self.__canvas = tk.Canvas(
+            frame,
+            width=int(max_row_width * (KEY_SIZE + KEY_GAP)) + 2 * KEYBOARD_PADDING,
+            height=rows_count * (KEY_SIZE + KEY_GAP) + 2 * KEYBOARD_PADDING,
+            highlightthickness=0,
+            bg=self._parent.cget("bg")
+        )
+        self.__canvas.pack()
+
+        self.__build_keyboards()
+
+        self.__details_label = ttk.Label(frame, text="", style="StatsParamLabel.TLabel", justify="left")
+        self.__details_label.pack(pady=(15, 0))
+
+        self.__build_export(frame)
+
+        ttk.Button(
+            frame,
+            text="В МЕНЮ",
+            style="StatsBackButton.TButton",
+            command=lambda: self._controller.go(Route.ROUTE_MENU)
+        ).pack(pady=(25, 0))
+
+        self.__load_model()
+        self.__redraw()
+
+        return frame
+
+    def __build_export(self, frame: ttk.Frame):
+        export_frame = ttk.Frame(frame)
+        export_frame.pack(pady=(20, 0))
+
+        self.__export_difficulty_box = ttk.Combobox(
+            export_frame,
+            state="readonly",
+            width=15,
+            values=[ALL_DIFFICULTIES_LABEL] + [difficulty.label for difficulty in Difficulty]
+        )
+        self.__export_difficulty_box.current(0)
+        self.__export_difficulty_box.pack(side="left", padx=(0, 10))
+
+        self.__export_since_var = tk.StringVar()
+        self.__export_until_var = tk.StringVar()
+        self.__export_all_profiles_var = tk.BooleanVar(value=False)
+
+        for text, variable in (("с", self.__export_since_var), ("по", self.__export_until_var)):
+            ttk.Label(export_frame, text=text, style="StatsParamLabel.TLabel").pack(side="left", padx=(0, 5))
+            ttk.Entry(export_frame, textvariable=variable, width=11).pack(side="left", padx=(0, 10))
+
+        ttk.Checkbutton(
+            export_frame,
+            text="Все профили",
+            variable=self.__export_all_profiles_var,
+            onvalue=True,
+            offvalue=False
+        ).pack(side="left", padx=(0, 10))
+
+        ttk.Button(export_frame, text="ЭКСПОРТ", command=self.__export_history).pack(side="left")
+
+        self.__export_label = ttk.Label(frame, text="", style="StatsParamLabel.TLabel")
+        self.__export_label.pack(pady=(5, 0))
+
+    def __export_filter(self) -> HistoryFilter:
+        """
+        Raises:
+            ValueError: Неверная дата
+        """
+
+        since, until = (
+            date.fromisoformat(value) if value else None
+            for value in (self.__export_since_var.get().strip(), self.__export_until_var.get().strip())
+        )
+
+        difficulty_index = self.__export_difficulty_box.current()
+
+        difficulties = {list(Difficulty)[difficulty_index - 1].value} if difficulty_index > 0 else None
+
+        return HistoryFilter.from_dates(since, until, difficulties)
+
+    def __export_history(self):
+        """Выгрузить историю результатов в файл. Чтение и запись идут порциями в пуле потоков."""
+
+        if self.__export_task is not None and not self.__export_task.finished:
+            return
+
+        try:
+            history_filter = self.__export_filter()
+        except ValueError as ex:
+            self._controller.show_warning("Неверная дата", f"Дата указывается в формате ГГГГ-ММ-ДД.\n{ex}")
+
+            return
+
+        file_path = filedialog.asksaveasfilename(
+            title="Экспорт истории",
+            defaultextension=f".{EXPORT_FORMAT_CSV}",
+            filetypes=[("Таблица CSV", f"*.{EXPORT_FORMAT_CSV}"), ("JSON Lines", f"*.{EXPORT_FORMAT_JSONL}")]
+        )
+
+        if not file_path:
+            return
+
+        export_format = EXPORT_FORMAT_JSONL if file_path.lower().endswith(f".{EXPORT_FORMAT_JSONL}") else EXPORT_FORMAT_CSV
+
+        if self.__export_all_profiles_var.get():
+            profiles = self._controller.profiles
+        else:
+            profiles = [self._controller.profile]
+
+        sources = [(profile.name, profile.history_path) for profile in profiles]
+
+        self.__set_export_text("Экспорт...")
+
+        self.__export_task = self._controller.scheduler.submit(
+            self.__export_steps(file_path, export_format, sources, history_filter),
+            name="export",
+            priority=TaskPriority.LOW,
+            on_done=lambda rows: self.__set_export_text(f"Выгружено строк: {rows}"),
+            on_error=self.__on_export_error
+        )
+
+    def __export_steps(self, file_path: str, export_format: str, sources: list[tuple[str, str]], history_filter: HistoryFilter):
+        exporter = HistoryExporter(file_path, export_format, sources, history_filter)
+
+        try:
+            while not exporter.finished:
+                yield Offload(exporter.write_chunk, EXPORT_CHUNK_ROWS)
+
+                self.__set_export_text(f"Экспорт: {exporter.progress:.0%}, строк: {exporter.rows}")
+        finally:
+            if not exporter.finished:
+                exporter.cancel()
+
+        return exporter.rows
+
+    def __on_export_error(self, ex: Exception):
+        self.__set_export_text("")
+
+        self._controller.show_warning("Не удалось выгрузить историю", f"Текст ошибки:\n{ex}")
+
+    def __set_export_text(self, text: str):
+        try:
+            self.__export_label.config(text=text)
+        except tk.TclError:
+            pass
+
+    def __default_layout(self) -> str:
+        language = self._controller.settings.language
+
+        if language in KEYBOARD_LAYOUTS:
+            return language.value
+
+        return Language.RUSSIAN.value
+
+    def __build_keyboards(self):
+        """Создать элементы всех раскладок один раз; дальше меняются только цвета и подписи."""
+
+        canvas = self.__canvas
+
+        key_font = self._controller.fonts.get("Segoe UI", 12, FONT_WEIGHT_BOLD)
+        value_font = self._controller.fonts.get("Segoe UI", 8)
+
+        for language, rows in KEYBOARD_LAYOUTS.items():
+            cells = {}
+            tag = f"layout-{language.value}"
+
+            for row_index, (row, offset) in enumerate(zip(rows, ROW_OFFSETS)):
+                y = KEYBOARD_PADDING + row_index * (KEY_SIZE + KEY_GAP)
+
+                for key_index, char in enumerate(row):
+                    x = KEYBOARD_PADDING + (key_index + offset) * (KEY_SIZE + KEY_GAP)
+
+                    rect = canvas.create_rectangle(x, y, x + KEY_SIZE, y + KEY_SIZE, fill=NO_DATA_COLOR, outline="", tags=(tag,))
+                    canvas.create_text(x + 8, y + 6, text=char.upper(), anchor="nw", fill="white", font=key_font, tags=(tag,))
+                    value = canvas.create_text(x + KEY_SIZE - 6, y + KEY_SIZE - 4, text="", anchor="se", fill="white", font=value_font, tags=(tag,))
+
+                    cells[char] = (rect, value)
+
+            canvas.itemconfigure(tag, state="hidden")
+
+            self.__cells[language] = cells
+
+    def __load_model(self):
+        self.__model = self._controller.error_model
+
+    def __redraw(self):
+        """Перекрасить клавиши; элементы холста меняются только у клавиш, чьё состояние изменилось."""
+
+        canvas = self.__canvas
+        model = self.__model
+        layout = Language(self.__layout_var.get())
+        mode = self.__mode_var.get()
+
+        if self.__visible_layout is not layout:
+            if self.__visible_layout is not None:
+                canvas.itemconfigure(f"layout-{self.__visible_layout.value}", state="hidden")
+
+            canvas.itemconfigure(f"layout-{layout.value}", state="normal")
+
+            self.__visible_layout = layout
+
+        cells = self.__cells[layout]
+
+        latencies = {char: model.mean_latency(char) for char in cells}
+        known_latencies = [latency for latency in latencies.values() if latency is not None]
+
+        min_latency = min(known_latencies, default=0.0)
+        latency_range = max(max(known_latencies, default=0.0) - min_latency, 1e-9)
+
+        for char, (rect, value_item) in cells.items():
+            if mode == MODE_ERRORS:
+                rate = model.error_rate(char)
+
+                if rate is None:
+                    state = (NO_DATA_COLOR, "")
+                else:
+                    state = (heat_color(rate / MAX_ERROR_RATE), f"{rate * 100:.0f}%")
+            else:
+                latency = latencies[char]
+
+                if latency is None:
+                    state = (NO_DATA_COLOR, "")
+                else:
+                    state = (heat_color((latency - min_latency) / latency_range), f"{latency * 1000:.0f}мс")
+
+            key = (layout, char)
+
+            if self.__cells_state.get(key) == state:
+                continue
+
+            self.__cells_state[key] = state
+
+            canvas.itemconfigure(rect, fill=state[0])
+            canvas.itemconfigure(value_item, text=state[1])
+
+        self.__details_label.config(text=self.__details_text(latencies))
+
+    def __details_text(self, latencies: dict[str, Optional[float]]) -> str:
+        confusions = self.__model.top_confusions(5)
+
+        slowest = sorted(
+            ((latency, char) for char, latency in latencies.items() if latency is not None),
+            reverse=True
+        )[:5]
+
+        confusions_text = ", ".join(f"{expected or '?'}→{typed or '?'} ({count})" for expected, typed, count in confusions) or "нет данных"
+        slowest_text = ", ".join(f"{char.upper()} ({latency * 1000:.0f} мс)" for latency, char in slowest) or "нет данных"
+
+        return f"Частые путаницы: {confusions_text}\nМедленные клавиши: {slowest_text}"
+
+    def open_profile(self):
+        self.__load_model()
+        self.__redraw()
+
+    def close(self):
+        if self.__export_task is not None:
+            self.__export_task.cancel()
+
+            self.__export_task = None
+
+    def _configure_style(self, style: ttk.Style):
+        self._controller.configure_style_by_path(style, STATS_STYLE_PATH)
+
+    def refresh(self, style: ttk.Style):
+        self._configure_style(style)
@@ -1,190 +1,42 @@
-import re
+import os
+import random
+import secrets
 import time
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-from typing import Optional
-import random
+import tkinter.font as tkfont
+from tkinter import ttk, messagebox, filedialog, simpledialog
+from time import perf_counter
+from typing import Optional, Union
 
 from frames.base import BaseFrame
+from frames.perf_hud import PerfHud, format_timing
+from frames.renderers import LineRenderer, create_line_renderer
 from enums.route import Route
-from enums.settings import Difficulty, Language
+from enums.settings import SettingsParam, Difficulty, Challenges
 from settings import Settings
-from config import APP_NAME, MENU_STYLE_PATH, RUSSIAN_WORDS_PATH, RUSSIAN_WORDS_REGEX, \
-    ENGLISH_WORDS_PATH, ENGLISH_WORDS_REGEX, MIX_WORDS_REGEX
-from utils.storage import load_txt
-from utils.text_files import load_text_from_file_with_regex
-
-RUS_TO_LAT = {
-    "а": "a", "А": "A",
-    "е": "e", "Е": "E",
-    "о": "o", "О": "O",
-    "с": "c", "С": "C",
-    "р": "p", "Р": "P",
-    "у": "y", "К": "K",
-    "х": "x", "Х": "X",
-    "М": "M", "Т": "T",
-    "Н": "H", "В": "B"
-}
-
-CONFUSABLES = RUS_TO_LAT.copy()
-
-CONFUSABLES.update({v: k for k, v in RUS_TO_LAT.items()})
-
-LAT_TO_RUS = {v: k for k, v in RUS_TO_LAT.items()}
-
-SPLIT_CHARS = [" ", ".", ",", ";", "!", "?"]
-
-
-class TextGenerator:
-    """Тренажёр."""
-
-    def __init__(
-            self,
-            language: Language,
-            text: Optional[str] = None,
-            max_len: Optional[int] = 50,
-            symbols: bool = False,
-            letters: bool = False,
-            register: bool = False
-    ):
-        self.__language = language
-        self.__text = text
-        self.__max_len = max_len
-        self.__symbols = symbols
-        self.__letters = letters
-        self.__register = register
-
-    @property
-    def text(self) -> list[str]:
-        if not self.__text:
-            self.generate_text()
-        else:
-            if self.__language is Language.RUSSIAN:
-                regex_prompt = RUSSIAN_WORDS_REGEX
-            elif self.__language is Language.ENGLISH:
-                regex_prompt = ENGLISH_WORDS_REGEX
-            else:
-                regex_prompt = MIX_WORDS_REGEX
-
-            self.__text = " ".join(re.findall(re.compile(regex_prompt), self.__text))
-
-        if self.__symbols:
-            self.__generate_symbols()
-
-        if self.__register:
-            self.__generate_register()
-
-        return self.__split_text()
-
-    def generate_text(self):
-        target_len = random.randrange(125, 250)
-
-        if self.__letters:
-            join_symbol = ""
-        else:
-            join_symbol = " "
-
-        if self.__language is Language.RUSSIAN:
-            words = load_text_from_file_with_regex(RUSSIAN_WORDS_PATH, RUSSIAN_WORDS_REGEX)
-        elif self.__language is Language.ENGLISH:
-            words = load_text_from_file_with_regex(ENGLISH_WORDS_PATH, ENGLISH_WORDS_REGEX)
-        else:
-            words = load_text_from_file_with_regex(RUSSIAN_WORDS_PATH, RUSSIAN_WORDS_REGEX) + \
-                    load_text_from_file_with_regex(ENGLISH_WORDS_PATH, ENGLISH_WORDS_REGEX)
-
-        result = []
-
-        while sum(len(w) for w in result) + len(result) - 1 < target_len:
-            word = random.choice(words)
-
-            if self.__letters:
-                result.append(random.choice(word))
-            else:
-                result.append(word)
-
-        result = [r.strip() for r in result]
-
-        self.__text = join_symbol.join(result)
-
-    def __generate_symbols(self):
-        symbols = '!"№;%:?*()'
-        result = []
-
-        for ch in self.__text:
-            result.append(ch)
-            if random.random() < 0.25:
-                for _ in range(random.randint(1, 2)):
-                    result.append(random.choice(symbols))
-
-        self.__text = "".join(result)
-
-    def __generate_register(self):
-        self.__text = "".join(
-            ch.upper() if ch.isalpha() and random.random() < 0.5 else ch.lower()
-            if ch.isalpha() else ch
-            for ch in self.__text
-        )
-
-    def __split_text(self) -> list[str]:
-        result = []
-        index = 0
-        letter = self.__max_len
-
-        while index < len(self.__text):
-            chunk = self.__text[index:index + letter]
-            cut_pos = None
-
-            for idx in range(len(chunk) - 1, -1, -1):
-                if chunk[idx] in SPLIT_CHARS:
-                    cut_pos = idx + 1
-                    break
-
-            if cut_pos is None:
-                part = chunk
-                index += letter
-            else:
-                part = chunk[:cut_pos]
-                index += cut_pos
-
-            result.append(part)
-
-        for line_index in range(len(result)):
-            line = result[line_index]
-
-            while "  " in line:
-                line = line.replace("  ", " ")
-
-            result[line_index] = line.strip()
-
-        return result
-
-
-class TextSwapper:
-    def __init__(self, text: list[str]):
-        self.__text = text
-        self.__current_index = 0
-        self.__max_index = len(text) - 1
-
-    @property
-    def current(self) -> Optional[str]:
-        if self.__current_index > self.__max_index:
-            return None
-
-        return self.__text[self.__current_index]
-
-    @property
-    def next(self) -> Optional[str]:
-        if self.__current_index > self.__max_index:
-            return None
-
-        line = self.__text[self.__current_index]
-        self.__current_index += 1
-
-        return line
-
-    @property
-    def index_decorated(self) -> str:
-        return f"{self.__current_index}/{self.__max_index + 1}"
+from config import APP_NAME, MENU_STYLE_PATH, MAX_TEXT_SEED, ENDLESS_COUNTDOWN_SECONDS, GHOST_TICK_MS, \
+    RACE_DEFAULT_HOST, RACE_DEFAULT_PORT, RACE_POLL_MS, TEXT_LOOKAHEAD_LINES, TEXT_HISTORY_LINES, TEXT_FONT_FAMILY, \
+    PERF_HUD_KEY
+from enums.font_role import FontRole
+from enums.keystroke_action import KeystrokeAction
+from enums.task_priority import TaskPriority
+from utils.error_model import ErrorModel
+from utils.ghost import GhostTimeline
+from utils.history import append_result
+from utils.keystrokes import KeystrokeRecorder, save_keystrokes, load_keystrokes
+from utils.language_profiles import LanguageProfile, get_language_profile
+from utils.metrics import KEYSTROKE_SECONDS, GENERATION_SECONDS
+from utils.perf_counters import TimingCounter
+from utils.profiles import Profile
+from utils.race_client import RaceClient
+from utils.scheduler import Offload, ScheduledTask
+from utils.session_snapshot import SNAPSHOT_KIND_GENERATED, SNAPSHOT_KIND_ENDLESS, SNAPSHOT_KIND_CUSTOM, save_snapshot, \
+    load_snapshot, clear_snapshot, save_snapshot_text, load_snapshot_text
+from utils.speed_metrics import SpeedMeter
+from utils.text_generator import TextGenerator, TextSwapper, EndlessTextSwapper
+from utils.text_normalization import load_normalized_text, get_file_digest
+
+SNAPSHOT_VERSION = 1
 
 
 class TrainerFrame(BaseFrame):
@@ -192,39 +44,76 @@ class TrainerFrame(BaseFrame):
         super().__init__(parent, controller, f"{APP_NAME} - Тренажёр")
 
         self.__settings: Settings = self._controller.settings
+        self.__user_profile: Profile = self._controller.profile
+        self.__profile_switching = False
+        self.__profile: LanguageProfile = get_language_profile(self.__settings.language)
 
         self.__countdown_label = None
         self.__elapsed_label = None
         self.__upload_text_btn = None
-        self.__text_swapper = None
-        self.__text_display = None
+        self.__upload_task: Optional[ScheduledTask] = None
+        self.__text_swapper: Optional[Union[TextSwapper, EndlessTextSwapper]] = None
+        self.__renderer: Optional[LineRenderer] = None
+        self.__seed: Optional[int] = None
+        self.__text_kind: Optional[str] = None
+        self.__text_id: Optional[str] = None
 
         self.__current_line = ""
+        self.__current_line_normalized = ""
         self.__typed_text = ""
+        self.__recorder = KeystrokeRecorder()
+        self.__line_matches = bytearray()
+        self.__correct_in_line = 0
+        self.__meter = SpeedMeter()
+        self.__error_model: ErrorModel = self._controller.error_model
+        self.__last_insert_time: Optional[float] = None
         self.__errors = 0
-        self.__correct_chars_typed_in_previous_lines = 0
         self.__countdown_running = False
+        self.__countdown_job: Optional[str] = None
         self.__countdown_time_total: Optional[int] = None
         self.__countdown_time_left: Optional[int] = None
         self.__elapsed_running = False
         self.__elapsed_start = None
+        self.__elapsed_offset = 0.0
 
         self.__entry = None
+        self.__input_job: Optional[str] = None
         self.__stats_label = None
 
+        self.__played_lines: list[str] = []
+        self.__ghost: Optional[GhostTimeline] = None
+        self.__ghost_position: Optional[tuple[int, int]] = None
+        self.__ghost_label = None
+
+        self.__race_client: Optional[RaceClient] = None
+        self.__race_label = None
+
+        self.__subscriptions: list[int] = []
+
+        self.__hud: Optional[PerfHud] = None
+        self.__hud_binding: Optional[str] = None
+        self.__input_timing = TimingCounter()
+        self.__render_timing = TimingCounter()
+        self.__generation_timing = TimingCounter()
+
+    @property
+    def keep_alive(self) -> bool:
+        return True
+
     @property
     def content(self) -> ttk.Frame:
         frame = ttk.Frame(self._parent)
 
-        font_size = self.__settings.font_size
+        fonts = self._controller.fonts
+        text_font = fonts.role(FontRole.TEXT, TEXT_FONT_FAMILY, self.__settings.font_size)
 
         header = ttk.Frame(frame, height=50)
         header.pack(fill="x")
 
-        self.__countdown_label = ttk.Label(header, text="01:00", font=("Segue UI", 25))
+        self.__countdown_label = ttk.Label(header, text="01:00", font=fonts.get("Segue UI", 25))
         self.__countdown_label.pack_forget()
 
-        self.__elapsed_label = ttk.Label(header, text="00:00", font=("Segue UI", 14))
+        self.__elapsed_label = ttk.Label(header, text="00:00", font=fonts.get("Segue UI", 14))
         self.__elapsed_label.pack_forget()
 
         header_buttons = ttk.Frame(header)
@@ -237,17 +126,38 @@ class TrainerFrame(BaseFrame):
             style="TrainerHeader.TButton"
         ).pack(side="left", padx=5)
 
+        ttk.Button(
+            header_buttons,
+            text="СИД",
+            command=lambda: self.__ask_seed(),
+            style="TrainerHeader.TButton"
+        ).pack(side="left", padx=5)
+
+        ttk.Button(
+            header_buttons,
+            text="ПРИЗРАК",
+            command=lambda: self.__start_ghost_race(),
+            style="TrainerHeader.TButton"
+        ).pack(side="left", padx=5)
+
+        ttk.Button(
+            header_buttons,
+            text="ГОНКА",
+            command=lambda: self.__join_race(),
+            style="TrainerHeader.TButton"
+        ).pack(side="left", padx=5)
+
         ttk.Button(
             header_buttons,
             text="В МЕНЮ",
-            command=lambda: (self.__stop_timers(), self._controller.go(Route.ROUTE_MENU)),
+            command=lambda: self._controller.go(Route.ROUTE_MENU),
             style="TrainerHeader.TButton"
         ).pack(side="left", padx=5)
 
         ttk.Button(
             header_buttons,
             text="НАСТРОЙКИ",
-            command=lambda: (self.__stop_timers(), self._controller.go(Route.ROUTE_SETTINGS)),
+            command=lambda: self._controller.go(Route.ROUTE_SETTINGS),
             style="TrainerHeader.TButton"
         ).pack(side="left", padx=5)
 
@@ -260,29 +170,38 @@ class TrainerFrame(BaseFrame):
         )
         self.__upload_text_btn.pack_forget()
 
-        self.__text_display = tk.Text(
+        self.__renderer = create_line_renderer(
+            self.__settings.renderer,
             frame,
-            font=("Segoe UI", font_size),
-            bg=self._parent.cget("bg"),
-            borderwidth=0,
-            height=1,
-            wrap="word",
-            bd=0,
-            highlightthickness=0
+            text_font,
+            self._parent.cget("bg"),
+            TEXT_LOOKAHEAD_LINES,
+            TEXT_HISTORY_LINES
         )
-        self.__text_display.pack(pady=(0, 25), fill="x", expand=True)
-        self.__text_display.tag_configure("center", justify="center")
-        self.__text_display.config(state="disabled")
+        self.__renderer.widget.pack(pady=(0, 25), fill="x", expand=True)
 
-        self.__entry = tk.Entry(frame, font=("Segoe UI", font_size), width=50)
+        self.__entry = tk.Entry(frame, font=text_font, width=50, validate="key")
+        self.__entry.config(validatecommand=(self.__entry.register(self.__on_entry_edit),))
         self.__entry.pack()
-        self.__entry.bind("<KeyRelease>", self.__check_input)
 
-        self.__stats_label = ttk.Label(frame, text="", font=("Segoe UI", 14)) # Ошибки: 0
+        self.__stats_label = ttk.Label(frame, text="", font=fonts.get("Segoe UI", 14)) # Ошибки: 0
         self.__stats_label.pack(pady=10)
 
+        self.__ghost_label = ttk.Label(frame, text="", font=fonts.get("Segoe UI", 12))
+        self.__ghost_label.pack()
+
+        self.__race_label = ttk.Label(frame, text="", font=fonts.get("Segoe UI", 12), justify="left")
+        self.__race_label.pack(pady=(10, 0))
+
+        self.__hud = PerfHud(frame, fonts.get("Consolas", 10), self.__collect_perf)
+        self.__bind_hud()
+
         self.__prepare_ui()
-        self.__update_text_display()
+
+        if not self.__restore_snapshot():
+            self.__update_text_display()
+
+        self.__subscribe_settings()
 
         return frame
 
@@ -295,30 +214,392 @@ class TrainerFrame(BaseFrame):
         if self.__settings.difficulty in [Difficulty.EASY, Difficulty.NORMAL]:
             self.__upload_text_btn.pack(side="left", padx=5)
 
+    def __subscribe_settings(self):
+        """Подписаться на изменения настроек: каждое применяется на месте, без пересоздания фрейма."""
+
+        store = self._controller.settings_store
+
+        self.__subscriptions = [
+            store.subscribe(
+                (SettingsParam.FONT_SIZE.value, SettingsParam.RENDERER.value),
+                self.__on_display_settings_changed
+            ),
+            store.subscribe(
+                (SettingsParam.LANGUAGE.value, SettingsParam.DIFFICULTY.value, Challenges.ENDLESS.value),
+                self.__on_text_settings_changed
+            ),
+            store.subscribe((Challenges.ON_TIME.value,), self.__on_time_setting_changed)
+        ]
+
+    def __unsubscribe_settings(self):
+        store = self._controller.settings_store
+
+        for subscription_id in self.__subscriptions:
+            store.unsubscribe(subscription_id)
+
+        self.__subscriptions = []
+
+    def __on_display_settings_changed(self, changes: dict):
+        """
+        Размер меняется у общего шрифта текста одним Font.configure - поле ввода подхватывает его само,
+        отображению текста остаётся пересчитать раскладку. Текст и ввод не трогаются.
+        """
+
+        self.__settings = self._controller.settings
+
+        font = self._controller.fonts.role(FontRole.TEXT, TEXT_FONT_FAMILY, self.__settings.font_size)
+
+        if SettingsParam.RENDERER.value in changes:
+            self.__replace_renderer(font)
+        else:
+            self.__renderer.set_font(font)
+
+    def __replace_renderer(self, font: tkfont.Font):
+        master = self.__renderer.widget.master
+
+        self.__renderer.widget.destroy()
+
+        self.__renderer = create_line_renderer(
+            self.__settings.renderer,
+            master,
+            font,
+            self._parent.cget("bg"),
+            TEXT_LOOKAHEAD_LINES,
+            TEXT_HISTORY_LINES
+        )
+        self.__renderer.widget.pack(before=self.__entry, pady=(0, 25), fill="x", expand=True)
+
+        self.__renderer.show_line(
+            self.__current_line,
+            self.__text_swapper.peek(TEXT_LOOKAHEAD_LINES),
+            self.__played_lines[-1 - TEXT_HISTORY_LINES:-1]
+        )
+        self.__renderer.update(self.__typed_text, self.__line_matches)
+        self.__draw_ghost_marker()
+
+    def __on_text_settings_changed(self, changes: dict):
+        """
+        Текст генерируется заново, только если он зависит от изменившихся настроек:
+        загруженный текст и забег с призраком сохраняются, пока не сменился язык.
+        """
+
+        self.__settings = self._controller.settings
+
+        if SettingsParam.LANGUAGE.value in changes:
+            self.__profile = get_language_profile(self.__settings.language)
+
+        if SettingsParam.DIFFICULTY.value in changes:
+            if self.__settings.difficulty in [Difficulty.EASY, Difficulty.NORMAL]:
+                self.__upload_text_btn.pack(side="left", padx=5)
+            else:
+                self.__upload_text_btn.pack_forget()
+
+        if self.__profile_switching:
+            return
+
+        if SettingsParam.LANGUAGE.value in changes or self.__text_kind in (SNAPSHOT_KIND_GENERATED, SNAPSHOT_KIND_ENDLESS):
+            self.__cancel_upload()
+            self.__update_text_display()
+
+    def __on_time_setting_changed(self, changes: dict):
+        self.__settings = self._controller.settings
+
+        if self.__settings.on_time:
+            self.__countdown_label.pack(side="left", padx=(0, 25))
+        else:
+            self.__countdown_label.pack_forget()
+
+            self.__countdown_running = False
+
+        self.__update_time_labels()
+
+    def suspend(self):
+        self.__cancel_input_check()
+        self.__pause_timers()
+        self.__unbind_hud()
+
+    def close_profile(self):
+        self.__cancel_input_check()
+        self.__cancel_upload()
+        self.__pause_timers()
+        self.__save_snapshot()
+
+        self.__profile_switching = True
+
+    def open_profile(self):
+        """Продолжить упражнение нового профиля с того места, где он остановился, или начать новое."""
+
+        self.__profile_switching = False
+
+        self.__user_profile = self._controller.profile
+        self.__settings = self._controller.settings
+        self.__error_model = self._controller.error_model
+
+        if not self.__restore_snapshot():
+            self.__update_text_display()
+
+    def resume(self):
+        super().resume()
+
+        self.__bind_hud()
+        self.__update_time_labels()
+
+        self.__entry.focus_set()
+
+    def close(self):
+        self.__unsubscribe_settings()
+        self.__cancel_input_check()
+        self.__cancel_upload()
+        self.__save_snapshot()
+        self.__stop_timers()
+        self.__leave_race()
+        self.__save_error_model()
+        self.__unbind_hud()
+
+    def __bind_hud(self):
+        if self.__hud_binding is None:
+            self.__hud_binding = self._parent.winfo_toplevel().bind(PERF_HUD_KEY, lambda _: self.__hud.toggle(), add="+")
+
+    def __unbind_hud(self):
+        if self.__hud is not None:
+            self.__hud.hide()
+
+        if self.__hud_binding is not None:
+            try:
+                self._parent.winfo_toplevel().unbind(PERF_HUD_KEY, self.__hud_binding)
+            except tk.TclError:
+                pass
+
+            self.__hud_binding = None
+
+    def __collect_perf(self) -> list[str]:
+        """Строки HUD: значения берутся из уже собранных счётчиков."""
+
+        try:
+            after_count = len(self.__entry.tk.splitlist(self.__entry.tk.call("after", "info")))
+        except tk.TclError:
+            after_count = 0
+
+        scheduler_stats = self._controller.scheduler.stats
+        generation_time = self.__generation_timing.last
+
+        return [
+            "мс: последнее / среднее / p99",
+            f"Нажатие: {format_timing(self.__input_timing)}",
+            f"Отрисовка: {format_timing(self.__render_timing)}",
+            f"Генерация текста: {'-' if generation_time is None else f'{generation_time * 1000:.2f}'}",
+            f"Ожидают after: {after_count}",
+            f"Планировщик: в очереди {scheduler_stats['ready']}, в потоках {scheduler_stats['waiting']}"
+        ]
+
+    def __join_race(self):
+        address = simpledialog.askstring(
+            "Гонка",
+            "Адрес сервера гонки (хост:порт):",
+            initialvalue=f"{RACE_DEFAULT_HOST}:{RACE_DEFAULT_PORT}",
+            parent=self._parent
+        )
+
+        if not address:
+            return
+
+        name = simpledialog.askstring("Гонка", "Ваше имя:", parent=self._parent)
+
+        if not name:
+            return
+
+        host, _, port = address.rpartition(":")
+
+        try:
+            port = int(port)
+        except ValueError:
+            self._controller.show_error("Неверный адрес", f"Не удалось разобрать адрес {address}.")
+
+            return
+
+        self.__leave_race()
+
+        self.__race_client = RaceClient(host or RACE_DEFAULT_HOST, port, name)
+        self.__race_client.start()
+
+        self.__race_label.config(text="Гонка: подключение...")
+
+        self._parent.after(RACE_POLL_MS, self.__poll_race)
+
+    def __leave_race(self):
+        if self.__race_client is not None:
+            self.__race_client.close()
+
+            self.__race_client = None
+
+    def __poll_race(self):
+        """Забрать события гонки из сетевого потока и обновить соперников."""
+
+        client = self.__race_client
+
+        if client is None:
+            return
+
+        text = None
+
+        for event_type, payload in client.poll():
+            if event_type == "state":
+                opponents = [player for player in payload if player.get("id") != client.player_id]
+
+                text = "\n".join(
+                    f"{player.get('name')}: строка {player.get('line', 0) + 1}, символ {player.get('offset', 0)}, {player.get('cpm', 0)} CPM"
+                    for player in opponents
+                ) or "Гонка: ждём соперников"
+            elif event_type == "error":
+                text = f"Гонка: ошибка соединения ({payload})"
+            elif event_type == "closed":
+                if text is None:
+                    text = "Гонка: соединение закрыто"
+
+                self.__race_client = None
+
+        if text is not None:
+            try:
+                self.__race_label.config(text=text)
+            except tk.TclError:
+                self.__leave_race()
+
+                return
+
+        if self.__race_client is not None:
+            self._parent.after(RACE_POLL_MS, self.__poll_race)
+
     def __stop_timers(self):
         self.__countdown_running = False
         self.__elapsed_running = False
 
-    def __update_text_display(self, text: Optional[str] = None):
-        generated_text = TextGenerator(
-            self.__settings.language,
-            text,
-            symbols=self.__settings.difficulty in [Difficulty.HARD, Difficulty.INSANE],
-            letters=self.__settings.difficulty in [Difficulty.HARD, Difficulty.INSANE],
-            register=self.__settings.difficulty in [Difficulty.NORMAL, Difficulty.INSANE]
-        ).text
+    def __pause_timers(self):
+        """Остановить таймеры, сохранив прошедшее время: они продолжатся со следующим нажатием."""
+
+        if self.__elapsed_running and self.__elapsed_start is not None:
+            self.__elapsed_offset = time.time() - self.__elapsed_start
+
+        if self.__countdown_job is not None:
+            self._parent.after_cancel(self.__countdown_job)
+
+            self.__countdown_job = None
+
+        self.__stop_timers()
+
+    def __ask_seed(self):
+        seed = simpledialog.askinteger(
+            "Сид упражнения",
+            "Введите сид, чтобы получить тот же текст, что и у других:",
+            initialvalue=self.__seed,
+            minvalue=0,
+            maxvalue=MAX_TEXT_SEED - 1,
+            parent=self._parent
+        )
+
+        if seed is not None:
+            self.__update_text_display(seed=seed)
+
+    def __update_text_display(
+            self,
+            seed: Optional[int] = None,
+            text_generator: Optional[TextGenerator] = None,
+            text_id: Optional[str] = None
+    ):
+        """
+        Начать новое упражнение.
+
+        Args:
+            seed: Сид генерации (опционально)
+            text_generator: Генератор загруженного текста (опционально)
+            text_id: Идентификатор загруженного текста (опционально)
+        """
+
+        started = perf_counter()
+
+        if self.__settings.endless and text_generator is None:
+            if seed is None:
+                seed = random.randrange(MAX_TEXT_SEED)
+
+            self.__seed = seed
+            self.__text_kind = SNAPSHOT_KIND_ENDLESS
+            self.__text_id = None
+
+            self.__text_swapper = TextGenerator.endless_swapper(self.__settings.language, self.__settings.difficulty, seed=seed)
+        elif text_generator is None:
+            text_generator = TextGenerator.from_difficulty(self.__settings.language, self.__settings.difficulty, seed=seed)
+
+            self.__seed = text_generator.seed
+            self.__text_kind = SNAPSHOT_KIND_GENERATED
+            self.__text_id = None
+
+            self.__text_swapper = text_generator.swapper
+        else:
+            self.__seed = text_generator.seed
+            self.__text_kind = SNAPSHOT_KIND_CUSTOM
+            self.__text_id = text_id or secrets.token_hex(8)
+
+            self.__text_swapper = text_generator.swapper
+
+        generation_time = perf_counter() - started
 
-        self.__text_swapper = TextSwapper(generated_text)
+        self.__generation_timing.record(generation_time)
+        GENERATION_SECONDS.observe(generation_time)
 
+        self.__ghost = None
+
+        self.__start_exercise()
+
+    def __start_ghost_race(self):
+        try:
+            session = load_keystrokes(self.__user_profile.last_session_path)
+        except Exception as ex:
+            self._controller.show_error("Ошибка загрузки призрака", f"Текст ошибки:\n{ex}")
+
+            return
+
+        if session is None or not session[1].get("lines"):
+            self._controller.show_info("Призрак", "Пока нет записанного прохождения.")
+
+            return
+
+        recorder, meta = session
+        lines = meta["lines"]
+
+        self.__seed = meta.get("seed")
+        self.__text_kind = None
+        self.__text_id = None
+        self.__text_swapper = TextSwapper.from_lines(lines)
+        self.__ghost = GhostTimeline(recorder, lines)
+
+        self.__start_exercise()
+
+    def __start_exercise(self):
         self.__stop_timers()
 
         self.__elapsed_start = None
+        self.__elapsed_offset = 0.0
+
+        self.__meter.reset()
 
-        self.__correct_chars_typed_in_previous_lines = 0
+        self.__recorder.clear()
 
-        total_seconds = max(1, int(sum(len(inner) for inner in generated_text)))
+        self.__played_lines = []
+        self.__typed_text = ""
+        self.__last_insert_time = None
+        self.__ghost_position = None
+
+        self.__ghost_label.config(text="" if self.__ghost is None else "Призрак стартует вместе с первым нажатием")
+
+        chars_count = self.__text_swapper.chars_count
+
+        if chars_count is None:
+            total_seconds = ENDLESS_COUNTDOWN_SECONDS
+        else:
+            total_seconds = max(1, chars_count)
 
-        if self.__settings.difficulty is Difficulty.EASY:
+        if chars_count is None:
+            pass
+        elif self.__settings.difficulty is Difficulty.EASY:
             total_seconds = int(total_seconds * 0.85)
         elif self.__settings.difficulty is Difficulty.NORMAL:
             total_seconds = int(total_seconds * 0.75)
@@ -335,10 +616,8 @@ class TrainerFrame(BaseFrame):
         self.__text_display_next()
 
     def __text_display_next(self):
-        current = self.__text_swapper.current
-
-        if current is not None:
-            self.__correct_chars_typed_in_previous_lines += len(current)
+        if self.__typed_text:
+            self.__recorder.record(0, KeystrokeAction.LINE)
 
         text = self.__text_swapper.next
 
@@ -348,81 +627,336 @@ class TrainerFrame(BaseFrame):
             return
 
         self.__current_line = text if text else ""
+        self.__current_line_normalized = self.__profile.normalize(self.__current_line)
+        self.__played_lines.append(self.__current_line)
 
         self.__entry.delete(0, "end")
         self.__typed_text = ""
+        self.__line_matches = bytearray()
+        self.__correct_in_line = 0
         self.__errors = 0
 
-        self.__draw_colored_text("")
+        started = perf_counter()
+
+        self.__renderer.show_line(
+            self.__current_line,
+            self.__text_swapper.peek(TEXT_LOOKAHEAD_LINES),
+            self.__played_lines[-1 - TEXT_HISTORY_LINES:-1]
+        )
+
+        self.__render_timing.record(perf_counter() - started)
+
+        self.__draw_ghost_marker()
         self.__update_time_labels()
 
-    def __draw_colored_text(self, typed: str):
-        self.__text_display.config(state="normal")
+    def __apply_input(self, previous: str, typed: str) -> int:
+        """
+        Учесть изменение поля ввода: записать нажатия, обновить совпадения символов и счётчик скорости.
+        Обрабатываются только изменившиеся символы, поэтому обычное нажатие стоит O(1).
+
+        Returns:
+            Первая позиция, ввод на которой изменился
+        """
+
+        recorder = self.__recorder
+        matches = self.__line_matches
+        line_normalized = self.__current_line_normalized
+        line_len = len(line_normalized)
+
+        previous_len = len(previous)
+
+        if len(typed) == previous_len + 1 and typed.startswith(previous):
+            common = previous_len
+        else:
+            common = len(os.path.commonprefix((previous, typed)))
+
+        removed_correct = 0
+
+        for index in range(previous_len - 1, common - 1, -1):
+            recorder.record(ord(previous[index]), KeystrokeAction.DELETE)
+
+            removed_correct += matches[index]
+
+        del matches[common:]
+
+        added = self.__profile.normalize(typed[common:])
+        added_correct = 0
+
+        now = perf_counter()
+        latency = None
+
+        if len(added) == 1 and self.__last_insert_time is not None:
+            latency = now - self.__last_insert_time
+
+        if added:
+            self.__last_insert_time = now
+
+        for offset, char in enumerate(added):
+            index = common + offset
+
+            recorder.record(ord(typed[index]), KeystrokeAction.INSERT)
 
-        self.__text_display.delete("1.0", "end")
+            match = index < line_len and line_normalized[index] == char
 
-        line = self.__current_line
+            if index < line_len:
+                self.__error_model.record(self.__current_line[index], typed[index], match, latency)
 
-        for i, ch in enumerate(line):
-            if i < len(typed):
-                if self.__chars_match(ch, typed[i]):
-                    self.__text_display.insert("end", ch, "correct")
-                else:
-                    self.__text_display.insert("end", typed[i] if typed[i] != " " else "_", "wrong")
-            elif i == len(typed):
-                if len(typed) > 0 and ch.strip():
-                    self.__text_display.insert("end", ch, "active")
-                else:
-                    self.__text_display.insert("end", ch)
+            matches.append(match)
+            added_correct += match
+
+        self.__correct_in_line += added_correct - removed_correct
+
+        self.__meter.add(added_correct - removed_correct, len(added), len(added) - added_correct)
+
+        return common
+
+    def __save_error_model(self):
+        self._controller.save_error_model()
+
+    def __save_snapshot(self):
+        """Сохранить снимок текущего упражнения, чтобы при возвращении продолжить с того же места."""
+
+        swapper = self.__text_swapper
+
+        try:
+            if self.__text_kind is None or swapper is None or not self.__played_lines:
+                clear_snapshot(self.__user_profile.snapshot_path)
+
+                return
+
+            if self.__elapsed_running and self.__elapsed_start is not None:
+                elapsed = time.time() - self.__elapsed_start
             else:
-                self.__text_display.insert("end", ch)
+                elapsed = self.__elapsed_offset
+
+            snapshot = {
+                "version": SNAPSHOT_VERSION,
+                "kind": self.__text_kind,
+                "language": self.__settings.language.value,
+                "difficulty": self.__settings.difficulty.value,
+                "seed": self.__seed,
+                "text_id": self.__text_id,
+                "index": swapper.index - 1,
+                "typed": self.__typed_text,
+                "elapsed": elapsed,
+                "countdown_total": self.__countdown_time_total,
+                "countdown_left": self.__countdown_time_left,
+                "correct": self.__meter.total_correct,
+                "typed_count": self.__meter.total_typed,
+                "errors": self.__meter.total_errors
+            }
+
+            if isinstance(swapper, EndlessTextSwapper):
+                snapshot["text_seed"], snapshot["text_line"] = swapper.position
+            elif self.__text_kind == SNAPSHOT_KIND_CUSTOM:
+                save_snapshot_text(self.__user_profile.snapshot_text_path, self.__text_id, *swapper.source)
+
+            save_snapshot(self.__user_profile.snapshot_path, snapshot)
+        except Exception as ex:
+            self._controller.show_warning("Не удалось сохранить состояние тренажёра", f"Текст ошибки:\n{ex}")
+
+    def __restore_snapshot(self) -> bool:
+        """
+        Продолжить упражнение из снимка. Текст не генерируется и не делится на строки заново:
+        сгенерированный текст восстанавливается по сиду, загруженный - вместе с готовыми смещениями строк.
+
+        Returns:
+            Удалось ли восстановить упражнение
+        """
 
-        self.__text_display.tag_config("correct", foreground="green")
-        self.__text_display.tag_config("wrong", foreground="red")
-        self.__text_display.tag_config("active", background="blue")
-        self.__text_display.tag_add("center", "1.0", "end")
+        try:
+            snapshot = load_snapshot(self.__user_profile.snapshot_path)
+
+            if not snapshot or snapshot.get("version") != SNAPSHOT_VERSION:
+                return False
+
+            language = self.__settings.language
+            difficulty = self.__settings.difficulty
+
+            if snapshot["language"] != language.value or snapshot["difficulty"] != difficulty.value:
+                return False
+
+            kind = snapshot["kind"]
+
+            if kind == SNAPSHOT_KIND_ENDLESS and self.__settings.endless:
+                swapper = TextGenerator.endless_swapper(
+                    language,
+                    difficulty,
+                    seed=snapshot["text_seed"],
+                    line=snapshot["text_line"],
+                    index=snapshot["index"]
+                )
+            elif kind == SNAPSHOT_KIND_GENERATED and not self.__settings.endless:
+                swapper = TextGenerator.from_difficulty(language, difficulty, seed=snapshot["seed"]).swapper
+                swapper.seek(snapshot["index"])
+            elif kind == SNAPSHOT_KIND_CUSTOM:
+                source = load_snapshot_text(self.__user_profile.snapshot_text_path, snapshot["text_id"])
+
+                if source is None:
+                    return False
+
+                swapper = TextSwapper(*source)
+                swapper.seek(snapshot["index"])
+            else:
+                return False
+
+            if swapper.current is None:
+                return False
+
+            self.__seed = snapshot["seed"]
+            self.__text_kind = kind
+            self.__text_id = snapshot["text_id"]
+            self.__text_swapper = swapper
+            self.__ghost = None
+
+            self.__start_exercise()
+
+            self.__elapsed_offset = float(snapshot["elapsed"])
+            self.__countdown_time_total = snapshot["countdown_total"]
+            self.__countdown_time_left = snapshot["countdown_left"]
+            self.__meter.restore(snapshot["correct"], snapshot["typed_count"], snapshot["errors"])
 
-        self.__text_display.config(state="disabled")
+            self.__restore_typed(snapshot["typed"])
+        except Exception as ex:
+            self._controller.show_warning("Не удалось восстановить состояние тренажёра", f"Текст ошибки:\n{ex}")
 
-    @staticmethod
-    def __chars_match(expected: str, typed: str) -> bool:
-        if not expected or not typed:
             return False
 
-        if expected == typed:
-            return True
+        self.__update_stats()
+        self.__update_time_labels()
+
+        return True
+
+    def __restore_typed(self, typed: str):
+        """Вернуть введённый текст строки без записи нажатий и учёта скорости."""
+
+        line_normalized = self.__current_line_normalized
+        line_len = len(line_normalized)
 
-        return CONFUSABLES.get(expected) == typed
+        self.__typed_text = typed
+        self.__line_matches = bytearray(
+            index < line_len and line_normalized[index] == char
+            for index, char in enumerate(self.__profile.normalize(typed))
+        )
+        self.__correct_in_line = sum(self.__line_matches)
+        self.__errors = min(len(typed), len(self.__current_line)) - self.__correct_in_line
+
+        self.__entry.insert(0, typed)
+        self.__renderer.update(typed, self.__line_matches)
+
+    def __save_session(self):
+        """Сохранить журнал нажатий последнего прохождения."""
+
+        if not len(self.__recorder):
+            return
+
+        meta = {
+            "language": self.__settings.language.value,
+            "difficulty": self.__settings.difficulty.value,
+            "seed": self.__seed,
+            "endless": isinstance(self.__text_swapper, EndlessTextSwapper),
+            "finished_at": time.time(),
+            "lines": self.__played_lines
+        }
+
+        try:
+            save_keystrokes(self.__user_profile.last_session_path, self.__recorder, meta)
+        except Exception as ex:
+            self._controller.show_warning("Не удалось сохранить сессию", f"Текст ошибки:\n{ex}")
+
+    def __save_result(self, used_time: float, cpm: int, wpm: int):
+        """Дописать результат прохождения в историю профиля."""
+
+        if not self.__meter.total_typed:
+            return
+
+        record = {
+            "finished_at": time.time(),
+            "language": self.__settings.language.value,
+            "difficulty": self.__settings.difficulty.value,
+            "seed": self.__seed,
+            "endless": isinstance(self.__text_swapper, EndlessTextSwapper),
+            "time": round(used_time, 2),
+            "cpm": cpm,
+            "wpm": wpm,
+            "accuracy": round(self.__meter.accuracy, 1),
+            "typed": self.__meter.total_typed,
+            "errors": self.__meter.total_errors
+        }
+
+        try:
+            append_result(self.__user_profile.history_path, record)
+        except Exception as ex:
+            self._controller.show_warning("Не удалось сохранить результат", f"Текст ошибки:\n{ex}")
+
+    def __on_entry_edit(self) -> bool:
+        """
+        Реакция на вставку или удаление текста в поле ввода.
+        Проверка откладывается до простоя цикла событий, поэтому серия правок за один кадр
+        обрабатывается одной проверкой и одной перерисовкой, а клавиши без правки не обрабатываются вовсе.
+        """
+
+        if self.__input_job is None:
+            self.__input_job = self.__entry.after_idle(self.__check_input)
+
+        return True
+
+    def __cancel_input_check(self):
+        if self.__input_job is not None:
+            self.__entry.after_cancel(self.__input_job)
+
+            self.__input_job = None
+
+    def __check_input(self):
+        self.__input_job = None
 
-    def __check_input(self, event):
-        typed = self.__entry.get()
+        try:
+            typed = self.__entry.get()
+        except tk.TclError:
+            return
+
+        if typed == self.__typed_text:
+            return
+
+        started = perf_counter()
+
+        changed_from = self.__apply_input(self.__typed_text, typed)
 
         self.__typed_text = typed
 
         if not self.__elapsed_running and typed:
-            self.__elapsed_start = time.time()
+            self.__elapsed_start = time.time() - self.__elapsed_offset
             self.__elapsed_running = True
             self.__update_elapsed_label()
 
+            if self.__ghost is not None:
+                self.__update_ghost()
+
         if self.__settings.on_time and not self.__countdown_running and typed:
             self.__countdown_running = True
             self.__update_countdown()
 
-        self.__errors = sum(
-            1 for i in range(len(typed))
-            if i < len(self.__current_line) and not self.__chars_match(self.__current_line[i], typed[i])
-        )
+        self.__errors = min(len(typed), len(self.__current_line)) - self.__correct_in_line
+
+        render_started = perf_counter()
+
+        self.__renderer.update(typed, self.__line_matches, changed_from)
 
-        self.__draw_colored_text(typed)
+        self.__render_timing.record(perf_counter() - render_started)
 
         self.__update_stats()
 
-        if len(typed) == len(self.__current_line) and all(
-                self.__chars_match(self.__current_line[i], typed[i]) for i in range(len(self.__current_line))
-        ):
+        input_time = perf_counter() - started
+
+        self.__input_timing.record(input_time)
+        KEYSTROKE_SECONDS.observe(input_time)
+
+        if len(typed) == len(self.__current_line) == self.__correct_in_line:
             self.__text_display_next()
 
     def __update_countdown(self):
+        self.__countdown_job = None
+
         if not self.__countdown_running or not self.__settings.on_time:
             return
 
@@ -451,7 +985,50 @@ class TrainerFrame(BaseFrame):
         except tk.TclError:
             pass
 
-        self._parent.after(1000, self.__update_countdown)
+        self.__countdown_job = self._parent.after(1000, self.__update_countdown)
+
+    def __update_ghost(self):
+        """Сдвинуть призрака по записанной временной шкале."""
+
+        if not self.__elapsed_running or self.__ghost is None:
+            return
+
+        position = self.__ghost.line_position_at(time.time() - self.__elapsed_start)
+
+        if position != self.__ghost_position:
+            self.__ghost_position = position
+
+            self.__draw_ghost_marker()
+
+            line_index, offset = position
+
+            if self.__ghost.finished_at(time.time() - self.__elapsed_start):
+                ghost_text = "Призрак финишировал"
+            else:
+                ghost_text = f"Призрак: строка {line_index + 1}, символ {offset}"
+
+            try:
+                self.__ghost_label.config(text=ghost_text)
+            except tk.TclError:
+                pass
+
+        self._parent.after(GHOST_TICK_MS, self.__update_ghost)
+
+    def __draw_ghost_marker(self):
+        """Отметить позицию призрака, если он на той же строке."""
+
+        offset = None
+
+        if self.__ghost_position is not None:
+            line_index, line_offset = self.__ghost_position
+
+            if line_index == len(self.__played_lines) - 1:
+                offset = line_offset
+
+        try:
+            self.__renderer.show_ghost(offset)
+        except tk.TclError:
+            pass
 
     def __update_elapsed_label(self):
         if not self.__elapsed_running:
@@ -466,6 +1043,8 @@ class TrainerFrame(BaseFrame):
         except tk.TclError:
             pass
 
+        self.__update_stats()
+
         self._parent.after(250, self.__update_elapsed_label)
 
     def __update_time_labels(self):
@@ -496,13 +1075,9 @@ class TrainerFrame(BaseFrame):
                 used_time = 0
 
         used_time = max(used_time, 1)
-        correct_chars = sum(
-            1 for i in range(min(len(self.__typed_text), len(self.__current_line)))
-            if self.__chars_match(self.__current_line[i], self.__typed_text[i])
-        )
 
-        cpm = int((self.__correct_chars_typed_in_previous_lines + correct_chars) / used_time * 60)
-        wpm = int(cpm / 5)
+        cpm = self.__meter.session_cpm(used_time)
+        wpm = self.__meter.wpm(cpm)
 
         if time_is_up:
             result_msg = "Время вышло!"
@@ -511,33 +1086,35 @@ class TrainerFrame(BaseFrame):
 
         self.__stop_timers()
 
+        self.__save_session()
+        self.__save_result(used_time, cpm, wpm)
+        self.__save_error_model()
+
         messagebox.showinfo(
             result_msg,
             # f"Ошибки: {self.__errors}\n"
             f"Время: {used_time:.2f} сек\n"
-            f"Скорость:\n{cpm} CPM\n{wpm} WPM"
+            f"Скорость:\n{cpm} CPM\n{wpm} WPM\n"
+            f"Точность: {self.__meter.accuracy:.1f}%"
         )
 
         self.__update_text_display()
 
     def __update_stats(self):
-        if self.__elapsed_running and self.__elapsed_start is not None:
-            elapsed = time.time() - self.__elapsed_start
-        else:
-            elapsed = 0
+        now = perf_counter()
 
-        elapsed = max(elapsed, 1)
+        instant_cpm = self.__meter.instant_cpm(now)
+        cpm = self.__meter.rolling_cpm(now)
+        wpm = self.__meter.wpm(cpm)
 
-        correct_chars = sum(
-            1 for i in range(min(len(self.__typed_text), len(self.__current_line)))
-            if self.__chars_match(self.__current_line[i], self.__typed_text[i])
-        )
-
-        cpm = int((self.__correct_chars_typed_in_previous_lines + correct_chars) / elapsed * 60) if correct_chars > 0 else 0
-        wpm = int(cpm / 5)
+        if self.__race_client is not None:
+            self.__race_client.send_progress(max(len(self.__played_lines) - 1, 0), len(self.__typed_text), cpm)
 
         try:
-            self.__stats_label.config(text=f"{self.__text_swapper.index_decorated}   CPM: {cpm}   WPM: {wpm}") # Ошибки: {self.__errors}
+            self.__stats_label.config(
+                text=f"{self.__text_swapper.index_decorated}   CPM: {cpm} (сейчас {instant_cpm})   WPM: {wpm}   "
+                     f"Точность: {self.__meter.accuracy:.0f}%   Сид: {self.__seed}"
+            ) # Ошибки: {self.__errors}
         except tk.TclError:
             pass
 
@@ -547,13 +1124,55 @@ class TrainerFrame(BaseFrame):
             filetypes=[("Текстовые файлы", "*.txt")]
         )
 
-        if file_path:
-            try:
-                text = load_txt(file_path)
+        if not file_path:
+            return
+
+        language = self.__settings.language
+        difficulty = self.__settings.difficulty
+
+        def load_text():
+            text = yield Offload(load_normalized_text, file_path, language)
+            digest = yield Offload(get_file_digest, file_path)
+
+            text_generator = TextGenerator.from_difficulty(language, difficulty, text, tokenized=True)
+
+            yield Offload(text_generator.generate)
+
+            return text_generator, f"{digest}:{language.value}"
+
+        def on_error(ex: Exception):
+            self.__upload_task = None
+
+            self.__upload_text_btn.config(state="normal")
+
+            self._controller.show_error("Ошибка при открытии файла.", f"Не удалось открыть файл {file_path}.\nТекст ошибки:{ex}.")
+
+        self.__cancel_upload()
+
+        self.__upload_task = self._controller.scheduler.submit(
+            load_text(),
+            name="upload",
+            priority=TaskPriority.HIGH,
+            on_done=self.__on_text_uploaded,
+            on_error=on_error
+        )
+
+        self.__upload_text_btn.config(state="disabled")
+
+    def __on_text_uploaded(self, result: tuple[TextGenerator, str]):
+        self.__upload_task = None
+
+        self.__upload_text_btn.config(state="normal")
+
+        text_generator, text_id = result
+
+        self.__update_text_display(text_generator=text_generator, text_id=text_id)
+
+    def __cancel_upload(self):
+        if self.__upload_task is not None:
+            self.__upload_task.cancel()
 
-                self.__update_text_display(text)
-            except Exception as ex:
-                self._controller.show_error("Ошибка при открытии файла.", f"Не удалось открыть файл {file_path}.\nТекст ошибки:{ex}.")
+            self.__upload_task = None
 
     def _configure_style(self, style: ttk.Style):
         self._controller.configure_style_by_path(style, MENU_STYLE_PATH)
@@ -1,22 +1,41 @@
+import argparse
+import os
 import tkinter as tk
 from tkinter import messagebox, ttk
 import sv_ttk
 from functools import cached_property
+from pathlib import Path
+from time import perf_counter
 from typing import Optional, Any
 
-from config import APP_NAME, MAIN_STYLE_PATH, STYLES_DIR_PATH, ROUTE_SPECIAL_SYMBOL
+from config import APP_NAME, MAIN_STYLE_PATH, STYLES_DIR_PATH, DATA_DIR_PATH, WORDS_DIR_PATH, \
+    SESSIONS_DIR_PATH, PROFILES_DIR_PATH, PROFILES_INDEX_PATH, METRICS_DIR_PATH, METRICS_PATH
 from frames.base import BaseFrame
-from settings import SETTINGS_FILE_PATH, DEFAULT_SETTINGS, Settings
+from frames.router import FrameRouter
+from settings import SETTINGS_FILE_PATH, SETTINGS_SCHEMA, DEFAULT_SETTINGS, Settings
 
 from enums.route import Route
 from enums.theme_mode import ThemeMode
-from enums.settings import SettingsParam
+from enums.settings import SettingsParam, Language
+from enums.file_change import FileChange
+from enums.task_priority import TaskPriority
 
 from frames.menu import MenuFrame
 from frames.settings import SettingsFrame
+from frames.stats import StatsFrame
 from frames.trainer import TrainerFrame
 
-from utils.storage import load_json, save_json, get_files_paths_from_dir_path
+from utils.error_model import ErrorModel, load_error_model, save_error_model
+from utils.file_watcher import FileWatcher
+from utils.fonts import FontRegistry
+from utils.metrics import MetricsWriter, STARTUP_SECONDS, ERRORS_UI
+from utils.style_bundle import StyleBundle, compile_style_entries
+from utils.profiles import Profile, ProfileManager
+from utils.scheduler import Scheduler
+from utils.settings_store import SettingsStore
+from utils.storage import load_json, save_json, merge_dicts, get_files_paths_from_dir_path
+from utils.text_generator import load_words, reindex_corpus
+from window import TrainerWindow
 
 
 class Application(tk.Tk):
@@ -28,14 +47,19 @@ class Application(tk.Tk):
             settings_file_path: str,
             frames: dict,
             theme_mode: ThemeMode = ThemeMode.DARK,
-            geometry: Optional[str] = None
+            geometry: Optional[str] = None,
+            metrics_path: Optional[str] = None
     ):
         super().__init__()
 
+        self.__scheduler = Scheduler(self)
+        self.__fonts = FontRegistry(self)
+
+        self._theme_mode = theme_mode
+
         self.__style: ttk.Style
         self.__start_style()
 
-        self._theme_mode = theme_mode
         self.theme_mode = self._theme_mode
 
         self.title(title)
@@ -43,21 +67,182 @@ class Application(tk.Tk):
         if geometry:
             self.geometry(geometry)
 
-        self.__settings_file_path = settings_file_path
-        self.__settings: Settings = Settings(DEFAULT_SETTINGS)
+        self.__profiles = ProfileManager(PROFILES_INDEX_PATH)
+
+        try:
+            self.__profiles.load()
+        except Exception as ex:
+            self.show_warning("Не удалось загрузить список профилей", f"Текст ошибки:\n{ex}")
+
+        self.__default_settings_file_path = settings_file_path
+        self.__settings_file_path = self.__profile_settings_path(self.__profiles.active)
+        self.__settings_cache: dict[str, Settings] = {}
+        self.__error_models: dict[str, ErrorModel] = {}
+
+        self.__settings_store = SettingsStore(Settings(DEFAULT_SETTINGS))
         self.load_settings(apply=True)
 
-        self.__container: tk.Frame = self.__build_container()
+        self.__geometry = geometry
 
         self.__frames: dict[Route, type[BaseFrame]] = frames
 
-        self.__frame: Optional[BaseFrame] = None
+        self.__router = FrameRouter(FrameRouter.build_container(self), self, frames, self.__style)
+
+        self.__windows: list[TrainerWindow] = []
+        self.__windows_count = 0
+
+        self.prefetch_corpus(self.settings.language)
+
+        self.__scheduler.submit(self.__precompile_style_bundles(), name="styles", priority=TaskPriority.LOW)
+
+        self.__watcher = FileWatcher(
+            self,
+            DATA_DIR_PATH,
+            self.__on_data_changed,
+            exclude=(SESSIONS_DIR_PATH, PROFILES_DIR_PATH, METRICS_DIR_PATH)
+        )
+        self.__watcher.start()
+
+        self.__metrics_writer: Optional[MetricsWriter] = None
+
+        if metrics_path:
+            self.__metrics_writer = MetricsWriter(self, self.__scheduler, metrics_path)
+            self.__metrics_writer.start()
+
+        self.__settings_store.subscribe((SettingsParam.THEME_MODE.value,), self.__on_theme_mode_changed)
+        self.__settings_store.subscribe((SettingsParam.LANGUAGE.value,), self.__on_language_changed)
+
+    @property
+    def scheduler(self) -> Scheduler:
+        """Планировщик фоновых задач приложения."""
+
+        return self.__scheduler
 
-        self.__content: Optional[ttk.Frame] = None
+    @property
+    def fonts(self) -> FontRegistry:
+        """Общие объекты шрифтов."""
+
+        return self.__fonts
+
+    @property
+    def settings_store(self) -> SettingsStore:
+        """Текущие настройки с подпиской на изменение отдельных полей."""
+
+        return self.__settings_store
 
-        self.__route: Optional[Route] = None
+    @property
+    def profiles(self) -> list[Profile]:
+        return self.__profiles.profiles
+
+    @property
+    def profile(self) -> Profile:
+        """Активный профиль пользователя."""
 
-        self.__routes_history: list[Route] = []
+        return self.__profiles.active
+
+    @property
+    def error_model(self) -> ErrorModel:
+        """Модель ошибок активного профиля; загружается один раз и дальше берётся из памяти."""
+
+        profile = self.__profiles.active
+
+        model = self.__error_models.get(profile.id)
+
+        if model is None:
+            try:
+                model = load_error_model(profile.error_model_path)
+            except Exception as ex:
+                self.show_warning("Не удалось загрузить статистику ошибок", f"Текст ошибки:\n{ex}")
+
+                model = ErrorModel()
+
+            self.__error_models[profile.id] = model
+
+        return model
+
+    def save_error_model(self):
+        """Сохранить модель ошибок активного профиля, если она загружена."""
+
+        profile = self.__profiles.active
+
+        model = self.__error_models.get(profile.id)
+
+        if model is None:
+            return
+
+        try:
+            save_error_model(profile.error_model_path, model)
+        except Exception as ex:
+            self.show_warning("Не удалось сохранить статистику ошибок", f"Текст ошибки:\n{ex}")
+
+    def create_profile(self, name: str) -> Optional[Profile]:
+        """
+        Создать профиль и записать его в индекс.
+
+        Args:
+            name: Имя профиля
+
+        Returns:
+            Новый профиль или None, если индекс не удалось сохранить
+        """
+
+        profile = self.__profiles.create(name)
+
+        try:
+            self.__profiles.save()
+        except Exception as ex:
+            self.show_error("Не удалось создать профиль", f"Текст ошибки:\n{ex}")
+
+            return None
+
+        return profile
+
+    def switch_profile(self, profile_id: str):
+        """
+        Переключить активный профиль без пересоздания фреймов.
+        Открытые фреймы сохраняют данные прежнего профиля и подхватывают данные нового, а настройки
+        нового профиля приходят подписчикам как обычное изменение полей. Настройки и модели ошибок
+        профилей, открытых в этом сеансе, берутся из памяти.
+
+        Args:
+            profile_id: Идентификатор профиля
+        """
+
+        previous = self.__profiles.active
+
+        if profile_id == previous.id or self.__profiles.get(profile_id) is None:
+            return
+
+        frames = self.__router.frames + [frame for window in self.__windows for frame in window.frames]
+
+        for frame in frames:
+            frame.close_profile()
+
+        self.save_error_model()
+
+        self.__settings_cache[previous.id] = self.settings
+
+        profile = self.__profiles.activate(profile_id)
+
+        try:
+            self.__profiles.save()
+        except Exception as ex:
+            self.show_warning("Не удалось сохранить список профилей", f"Текст ошибки:\n{ex}")
+
+        self.__settings_file_path = self.__profile_settings_path(profile)
+
+        cached = self.__settings_cache.get(profile.id)
+
+        if cached is not None:
+            self.settings = cached
+        else:
+            self.load_settings()
+
+        for frame in frames:
+            frame.open_profile()
+
+    def __profile_settings_path(self, profile: Profile) -> str:
+        return self.__default_settings_file_path if profile.is_default else profile.settings_path
 
     @property
     def settings_file_path(self) -> str:
@@ -65,54 +250,70 @@ class Application(tk.Tk):
 
     @property
     def route(self) -> Optional[Route]:
-        return self.__route
+        return self.__router.route
 
     @route.setter
     def route(self, value: Route):
         self.go(value)
 
     def go(self, route: Route, force_refresh: bool = False):
-        if not force_refresh and self.__route == route and self.__content:
-            self.__frame.refresh(self.__style)
+        self.__router.go(route, force_refresh)
 
-            return
+    @property
+    def windows(self) -> list[TrainerWindow]:
+        """Дополнительные окна тренажёра."""
 
-        if route not in self.__frames.keys() and  route.value[0] != ROUTE_SPECIAL_SYMBOL:
-            return
+        return list(self.__windows)
 
-        if route is Route.ROUTE_BACK:
-            if len(self.__routes_history) > 1:
-                self.__routes_history.pop()
+    def open_window(self, geometry: Optional[str] = None) -> TrainerWindow:
+        """
+        Открыть дополнительное окно тренажёра в этом же процессе (режим киоска: например, по окну на монитор).
+        У окна свои фреймы, состояние упражнения и настройки, а корпуса слов, стили, шрифты, профили и
+        планировщик общие с приложением, поэтому окно не читает и не разбирает файлы данных заново.
 
-                route = self.__routes_history[-1]
-        else:
-            self.__routes_history.append(route)
+        Args:
+            geometry: Размер и положение окна (опционально; по умолчанию как у главного окна)
 
-        self.__frame = None
+        Returns:
+            Новое окно
+        """
 
-        if self.__content:
-            self.__content.destroy()
+        self.__windows_count += 1
 
-            self.__content = None
+        window = TrainerWindow(
+            self,
+            self.__windows_count,
+            self.__frames,
+            Settings(self.settings.data),
+            self.__style,
+            geometry or self.__geometry
+        )
 
-        frame_class = self.__frames.get(route)
+        self.__windows.append(window)
 
-        if not frame_class:
-            return
+        window.go(Route.ROUTE_MENU)
 
-        frame = frame_class(parent=self.__container, controller=self)
+        return window
 
-        frame.refresh(self.__style)
+    def _forget_window(self, window: TrainerWindow):
+        """Вызывается окном тренажёра при закрытии."""
 
-        frame_content = frame.content
+        if window in self.__windows:
+            self.__windows.remove(window)
 
-        frame_content.grid(row=0, column=0, sticky="nsew")
+    def destroy(self):
+        for window in list(self.__windows):
+            window.destroy()
 
-        self.__frame = frame
+        self.__router.close()
 
-        self.__content = frame_content
+        self.__watcher.stop()
+        self.__scheduler.shutdown()
 
-        self.__route = route
+        if self.__metrics_writer is not None:
+            self.__metrics_writer.stop()
+
+        super().destroy()
 
     @property
     def theme_mode(self) -> ThemeMode:
@@ -143,24 +344,22 @@ class Application(tk.Tk):
         except Exception as ex:
             self.show_error("Ошибка смены темы", f"Не удалось сменить тему.\nТекст ошибки: {ex}.")
 
-        self.refresh_styles()
-
         self._theme_mode = new_theme_mode
 
+        self.refresh_styles()
+
     @property
     def settings(self) -> Settings:
-        self.load_settings()
-
-        return self.__settings
+        return self.__settings_store.settings
 
     @settings.setter
     def settings(self, value: Settings):
         if not value:
             self.show_error("Пустой параметр", "Параметр value не может быть пустым!")
         else:
-            self.__settings = value
+            self.__settings_store.update(value)
 
-    def load_settings(self, default_data: Optional[dict[str, Any]] = DEFAULT_SETTINGS, path: Optional[str] = SETTINGS_FILE_PATH, apply: bool = False):
+    def load_settings(self, default_data: Optional[dict[str, Any]] = DEFAULT_SETTINGS, path: Optional[str] = None, apply: bool = False):
         """
         Загрузка настроек из файла .JSON.
 
@@ -170,6 +369,9 @@ class Application(tk.Tk):
             apply: Применить настройки?
         """
 
+        if not path:
+            path = self.__settings_file_path
+
         try:
             settings = load_json(path)
 
@@ -177,6 +379,12 @@ class Application(tk.Tk):
                 settings = default_data
 
                 self.save_settings(settings)
+            elif settings.get(SettingsParam.VERSION.value) != SETTINGS_SCHEMA.version:
+                settings = SETTINGS_SCHEMA.dump(SETTINGS_SCHEMA.validate(settings))
+
+                self.save_settings(settings)
+
+            self.settings = Settings(settings)
         except Exception as ex:
             self.show_warning(
                 "Не удалось загрузить настройки",
@@ -187,7 +395,7 @@ class Application(tk.Tk):
 
             self.save_settings(settings)
 
-        self.settings = Settings(settings)
+            self.settings = Settings(settings)
 
         if apply:
             self.apply_settings()
@@ -227,16 +435,43 @@ class Application(tk.Tk):
                 f"Текст ошибки:\n{str(ex)}"
             )
 
+            return
+
+        if path == self.__settings_file_path:
+            current = self.settings.data
+
+            merge_dicts(current, data)
+
+            self.settings = Settings(current)
+
+    def __on_theme_mode_changed(self, changes: dict[str, Any]):
+        theme_mode = changes[SettingsParam.THEME_MODE.value]
+
+        if theme_mode != self._theme_mode:
+            self.toggle_theme_mode(theme_mode)
+
+    def __on_language_changed(self, changes: dict[str, Any]):
+        self.prefetch_corpus(changes[SettingsParam.LANGUAGE.value])
+
+    def prefetch_corpus(self, language: Language):
+        """Загрузить корпус слов языка в фоне, чтобы первое упражнение не ждало чтения файлов."""
+
+        self.__scheduler.offload(load_words, language, name="corpus", priority=TaskPriority.LOW)
+
     @cached_property
     def default_settings(self) -> dict[str, Any]:
         return DEFAULT_SETTINGS
 
     @staticmethod
     def show_error(title: str = "Ошибка", message: str = "Произошла неизвестная ошибка"):
+        ERRORS_UI.inc()
+
         messagebox.showerror(title=title, message=f"{message}")
 
     @staticmethod
     def show_warning(title: str = "Предупреждение", message: str = ""):
+        ERRORS_UI.inc()
+
         messagebox.showwarning(title=title, message=message)
 
     @staticmethod
@@ -244,72 +479,175 @@ class Application(tk.Tk):
         messagebox.showinfo(title=title, message=message)
 
     def __start_style(self):
-        """Создать исходный стиль."""
+        """Создать исходный стиль и прочитать файлы стилей."""
 
         self.__style = ttk.Style()
 
+        self.__style_sources: dict[str, dict[str, Any]] = {}
+        self.__style_bundles: dict[ThemeMode, StyleBundle] = {}
+
+        for path in get_files_paths_from_dir_path(STYLES_DIR_PATH):
+            self.__load_style_source(path)
+
         self.configure_style_by_path(self.__style, MAIN_STYLE_PATH)
 
+    def __load_style_source(self, path: str) -> Optional[dict[str, Any]]:
+        try:
+            data = load_json(path)
+        except Exception as ex:
+            self.show_error("Ошибка обновления стилей", f"Произошла ошибка при обновлении стилей.\nТекст ошибка: {ex}.")
+
+            return None
+
+        self.__style_sources[path] = data
+
+        return data
+
+    def __style_bundle(self, theme_mode: ThemeMode) -> StyleBundle:
+        """Набор стилей темы; если он ещё не собран фоновой задачей, собирается сразу."""
+
+        bundle = self.__style_bundles.get(theme_mode)
+
+        if bundle is None:
+            for _ in self.__compile_style_bundle(theme_mode):
+                pass
+
+            bundle = self.__style_bundles[theme_mode]
+
+        return bundle
+
+    def __compile_style_bundle(self, theme_mode: ThemeMode):
+        """Собрать набор стилей темы по одному файлу за шаг."""
+
+        bundle = StyleBundle(theme_mode)
+
+        for path, data in list(self.__style_sources.items()):
+            bundle.add(path, compile_style_entries(data, theme_mode, self.__fonts.from_spec))
+
+            yield
+
+        self.__style_bundles.setdefault(theme_mode, bundle)
+
+    def __precompile_style_bundles(self):
+        for theme_mode in ThemeMode:
+            if theme_mode not in self.__style_bundles:
+                yield from self.__compile_style_bundle(theme_mode)
+
     def refresh_styles(self) -> ttk.Style:
-        """Перезагрузить стили."""
+        """Применить стили текущей темы из заранее собранного набора."""
 
         style = self.__style
 
-        paths: list[str] = get_files_paths_from_dir_path(STYLES_DIR_PATH)
-
-        for path in paths:
-            self.configure_style_by_path(style, path)
+        self.__style_bundle(self._theme_mode).apply(style)
 
         return style
 
     def configure_style_by_path(self, style, path):
         """
         Настроить стиль из файла .JSON.
+        Файл читается только один раз; дальше стили берутся из собранного набора текущей темы.
 
         Args:
             style: Исходный стиль
             path: Путь к файлу стиля
         """
 
-        try:
-            styles = load_json(path)
-        except Exception as ex:
-            self.show_error("Ошибка обновления стилей", f"Произошла ошибка при обновлении стилей.\nТекст ошибка: {ex}.")
+        path = str(Path(path))
 
+        if path not in self.__style_sources and not self.__update_style_source(path):
             return
 
-        for widget_style, params in styles.items():
-            style.configure(
-                widget_style,
-                **params
-            )
+        self.__style_bundle(self._theme_mode).apply(style, path)
 
-    def __build_container(self) -> tk.Frame:
-        """Создать контейнер для фреймов."""
+    def reload_style(self, path: str, removed: bool = False):
+        """
+        Перечитать один изменившийся файл стилей и применить только его стили.
 
-        container = tk.Frame(self, padx=25, pady=25)
+        Args:
+            path: Путь к файлу стиля
+            removed: Файл удалён?
+        """
+
+        path = str(Path(path))
+
+        if removed:
+            self.__style_sources.pop(path, None)
+
+            for bundle in self.__style_bundles.values():
+                bundle.remove(path)
+
+            return
+
+        if self.__update_style_source(path):
+            self.__style_bundle(self._theme_mode).apply(self.__style, path)
+
+    def __update_style_source(self, path: str) -> bool:
+        """Прочитать файл стилей и пересобрать его часть во всех собранных наборах."""
+
+        data = self.__load_style_source(path)
 
-        container.pack(fill="both", expand=True)
+        if data is None:
+            return False
 
-        container.grid_rowconfigure(0, weight=1)
+        for bundle in self.__style_bundles.values():
+            bundle.add(path, compile_style_entries(data, bundle.theme_mode, self.__fonts.from_spec))
 
-        container.grid_columnconfigure(0, weight=1)
+        return True
 
-        return container
+    def __on_data_changed(self, changes: list[tuple[str, FileChange]]):
+        """Применить изменения файлов данных без перезапуска: стили, корпуса слов и настройки."""
+
+        styles_dir = os.path.normpath(STYLES_DIR_PATH)
+        words_dir = os.path.normpath(WORDS_DIR_PATH)
+        settings_path = os.path.normpath(self.__settings_file_path)
+
+        for path, change in changes:
+            dir_path = os.path.dirname(path)
+
+            if dir_path == styles_dir and path.endswith(".json"):
+                self.reload_style(path, removed=change is FileChange.DELETED)
+            elif dir_path == words_dir and change is not FileChange.DELETED:
+                self.__scheduler.offload(
+                    reindex_corpus,
+                    path,
+                    name="corpus",
+                    priority=TaskPriority.LOW,
+                    on_error=lambda ex: self.show_warning("Не удалось обновить корпус слов", f"Текст ошибки:\n{ex}")
+                )
+            elif path == settings_path and change is not FileChange.DELETED:
+                self.load_settings()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=APP_NAME)
+    parser.add_argument("--windows", type=int, default=1, help="Количество окон тренажёра (режим киоска)")
+    parser.add_argument(
+        "--metrics", nargs="?", const=METRICS_PATH, default=None,
+        help=f"Выгружать метрики в файл .prom (Prometheus) или .jsonl (по умолчанию {METRICS_PATH})"
+    )
+
+    args = parser.parse_args()
+
+    started = perf_counter()
+
     app = Application(
         APP_NAME,
         SETTINGS_FILE_PATH,
         {
             Route.ROUTE_MENU: MenuFrame,
             Route.ROUTE_TRAINER: TrainerFrame,
-            Route.ROUTE_SETTINGS: SettingsFrame
+            Route.ROUTE_SETTINGS: SettingsFrame,
+            Route.ROUTE_STATS: StatsFrame
         },
-        geometry="1250x950"
+        geometry="1250x950",
+        metrics_path=args.metrics
     )
 
     app.go(Route.ROUTE_MENU)
 
+    for _ in range(args.windows - 1):
+        app.open_window()
+
+    app.after_idle(lambda: STARTUP_SECONDS.set(perf_counter() - started))
+
     app.mainloop()
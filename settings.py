@@ -1,9 +1,9 @@
 from typing import Any
 
-from enums.settings import SettingsParam, Language, Difficulty, Challenges
+from enums.settings import SettingsParam, Language, Difficulty, Challenges, Renderer
 from enums.theme_mode import ThemeMode
 
-from utils.validators import enum_value_validator, num_validator
+from utils.settings_schema import SettingsSchema, EnumField, IntRangeField, BoolField, GroupField
 
 from config import DATA_DIR_PATH
 
@@ -11,14 +11,18 @@ MIN_FONT_SIZE = 12
 MAX_FONT_SIZE = 34
 
 SETTINGS_FILE_PATH = DATA_DIR_PATH + "settings.json"
+SETTINGS_VERSION = 2
 
 DEFAULT_LANGUAGE_PARAM_VALUE = Language.RUSSIAN
 DEFAULT_DIFFICULTY_PARAM_VALUE = Difficulty.NORMAL
 DEFAULT_FONT_SIZE_PARAM_VALUE = MAX_FONT_SIZE
 DEFAULT_THEME_MODE_PARAM_VALUE = ThemeMode.DARK
 DEFAULT_ON_TIME_PARAM_VALUE = True
+DEFAULT_ENDLESS_PARAM_VALUE = False
+DEFAULT_RENDERER_PARAM_VALUE = Renderer.TEXT
 DEFAULT_CHALLENGES_PARAM_VALUE = {
-    Challenges.ON_TIME.value: DEFAULT_ON_TIME_PARAM_VALUE
+    Challenges.ON_TIME.value: DEFAULT_ON_TIME_PARAM_VALUE,
+    Challenges.ENDLESS.value: DEFAULT_ENDLESS_PARAM_VALUE
 }
 
 DEFAULT_SETTINGS = {
@@ -26,43 +30,46 @@ DEFAULT_SETTINGS = {
     SettingsParam.DIFFICULTY.value: DEFAULT_DIFFICULTY_PARAM_VALUE,
     SettingsParam.FONT_SIZE.value: DEFAULT_FONT_SIZE_PARAM_VALUE,
     SettingsParam.THEME_MODE.value: DEFAULT_THEME_MODE_PARAM_VALUE,
-    SettingsParam.CHALLENGES.value: DEFAULT_CHALLENGES_PARAM_VALUE
+    SettingsParam.CHALLENGES.value: DEFAULT_CHALLENGES_PARAM_VALUE,
+    SettingsParam.RENDERER.value: DEFAULT_RENDERER_PARAM_VALUE,
+    SettingsParam.VERSION.value: SETTINGS_VERSION
 }
 
 
-class Settings:
-    def __init__(self, settings: dict[str, Any]):
-        self.__language = settings.get(SettingsParam.LANGUAGE.value)
-
-        if enum_value_validator(self.__language, Language):
-            self.__language = Language(self.__language)
-        else:
-            self.__language = DEFAULT_LANGUAGE_PARAM_VALUE
-
-        self.__difficulty = settings.get(SettingsParam.DIFFICULTY.value)
+SETTINGS_SCHEMA = SettingsSchema(
+    {
+        SettingsParam.LANGUAGE.value: EnumField(Language, DEFAULT_LANGUAGE_PARAM_VALUE),
+        SettingsParam.DIFFICULTY.value: EnumField(Difficulty, DEFAULT_DIFFICULTY_PARAM_VALUE),
+        SettingsParam.THEME_MODE.value: EnumField(ThemeMode, DEFAULT_THEME_MODE_PARAM_VALUE),
+        SettingsParam.FONT_SIZE.value: IntRangeField(MIN_FONT_SIZE, MAX_FONT_SIZE, DEFAULT_FONT_SIZE_PARAM_VALUE),
+        SettingsParam.CHALLENGES.value: GroupField({
+            Challenges.ON_TIME.value: BoolField(DEFAULT_ON_TIME_PARAM_VALUE),
+            Challenges.ENDLESS.value: BoolField(DEFAULT_ENDLESS_PARAM_VALUE)
+        }),
+        SettingsParam.RENDERER.value: EnumField(Renderer, DEFAULT_RENDERER_PARAM_VALUE)
+    },
+    version=SETTINGS_VERSION,
+    version_key=SettingsParam.VERSION.value
+)
 
-        if enum_value_validator(self.__difficulty, Difficulty):
-            self.__difficulty = Difficulty(self.__difficulty)
-        else:
-            self.__difficulty = DEFAULT_DIFFICULTY_PARAM_VALUE
 
-        self.__theme_mode = settings.get(SettingsParam.THEME_MODE.value)
-
-        if enum_value_validator(self.__theme_mode, ThemeMode):
-            self.__theme_mode = ThemeMode(self.__theme_mode)
-        else:
-            self.__theme_mode = DEFAULT_THEME_MODE_PARAM_VALUE
+class Settings:
+    def __init__(self, settings: dict[str, Any]):
+        values = SETTINGS_SCHEMA.validate(settings)
 
-        self.__font_size = settings.get(SettingsParam.FONT_SIZE.value)
+        self.__values = values
 
-        self.__font_size = num_validator(self.__font_size, MIN_FONT_SIZE, MAX_FONT_SIZE)
+        self.__language: Language = values[SettingsParam.LANGUAGE.value]
+        self.__difficulty: Difficulty = values[SettingsParam.DIFFICULTY.value]
+        self.__theme_mode: ThemeMode = values[SettingsParam.THEME_MODE.value]
+        self.__font_size: int = values[SettingsParam.FONT_SIZE.value]
 
-        challenges = settings.get(SettingsParam.CHALLENGES.value, DEFAULT_CHALLENGES_PARAM_VALUE)
+        challenges = values[SettingsParam.CHALLENGES.value]
 
-        self.__on_time = challenges.get(Challenges.ON_TIME.value)
+        self.__on_time: bool = challenges[Challenges.ON_TIME.value]
+        self.__endless: bool = challenges[Challenges.ENDLESS.value]
 
-        if not isinstance(self.__on_time, bool):
-            self.__on_time = DEFAULT_ON_TIME_PARAM_VALUE
+        self.__renderer: Renderer = values[SettingsParam.RENDERER.value]
 
     @property
     def language(self) -> Language:
@@ -83,20 +90,35 @@ class Settings:
     @property
     def challenges(self) -> dict[str, Any]:
         return {
-            Challenges.ON_TIME.value: self.on_time
+            Challenges.ON_TIME.value: self.on_time,
+            Challenges.ENDLESS.value: self.endless
         }
 
     @property
     def on_time(self) -> bool:
         return self.__on_time
 
+    @property
+    def endless(self) -> bool:
+        return self.__endless
+
+    @property
+    def renderer(self) -> Renderer:
+        return self.__renderer
+
     @property
     def json(self) -> dict[str, Any]:
         return {
             SettingsParam.LANGUAGE.value: self.language,
             SettingsParam.DIFFICULTY.value: self.difficulty,
             SettingsParam.FONT_SIZE.value: self.font_size,
-            SettingsParam.CHALLENGES.value: {
-                Challenges.ON_TIME.value: self.on_time
-            }
+            SettingsParam.CHALLENGES.value: self.challenges,
+            SettingsParam.RENDERER.value: self.renderer,
+            SettingsParam.VERSION.value: SETTINGS_VERSION
         }
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """Все поля настроек в виде для записи в файл (вместе с темой и версией)."""
+
+        return SETTINGS_SCHEMA.dump(self.__values)
@@ -0,0 +1,228 @@
+import heapq
+import json
+import struct
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from config import ERROR_MODEL_SIZE
+from errors import FileSuffixError, FileReadError, FileWriteError
+from utils.metrics import STORAGE_READ_SECONDS, STORAGE_WRITE_SECONDS, ERRORS_STORAGE, timed
+
+ERROR_MODEL_FILE_SUFFIX = ".bin"
+ERROR_MODEL_FILE_MAGIC = b"FTEM"
+ERROR_MODEL_FILE_VERSION = 1
+
+OTHER_KEY = ""
+
+
+class ErrorModel:
+    """
+    Статистика ошибок по клавишам.
+    Символы отображаются в компактные индексы; матрица путаниц (ожидаемый, введённый) хранится плоским массивом
+    array('I'), а суммы по строкам ведутся отдельно, поэтому запись нажатия и расчёт доли ошибок по клавише - O(1).
+    Последний индекс зарезервирован под все символы, не поместившиеся в таблицу.
+    """
+
+    def __init__(self, size: int = ERROR_MODEL_SIZE):
+        self.__size = size
+        self.__indexes: dict[str, int] = {OTHER_KEY: size - 1}
+        self.__keys: list[str] = []
+
+        self.__confusions = array("I", bytes(4 * size * size))
+        self.__hits = array("I", bytes(4 * size))
+        self.__errors = array("I", bytes(4 * size))
+        self.__latency_sum = array("d", bytes(8 * size))
+        self.__latency_count = array("I", bytes(4 * size))
+
+    def __index(self, char: str) -> int:
+        index = self.__indexes.get(char)
+
+        if index is not None:
+            return index
+
+        if len(self.__keys) >= self.__size - 1:
+            return self.__size - 1
+
+        index = len(self.__keys)
+
+        self.__keys.append(char)
+        self.__indexes[char] = index
+
+        return index
+
+    def record(self, expected: str, typed: str, correct: bool, latency: Optional[float] = None):
+        """
+        Учесть нажатие.
+
+        Args:
+            expected: Ожидаемый символ
+            typed: Введённый символ
+            correct: Верно ли введён символ
+            latency: Время с предыдущего нажатия в секундах (опционально)
+        """
+
+        expected_index = self.__index(expected.lower())
+
+        self.__hits[expected_index] += 1
+
+        if not correct:
+            self.__errors[expected_index] += 1
+            self.__confusions[expected_index * self.__size + self.__index(typed.lower())] += 1
+
+        if latency is not None:
+            self.__latency_sum[expected_index] += latency
+            self.__latency_count[expected_index] += 1
+
+    def error_rate(self, char: str) -> Optional[float]:
+        """Доля ошибок при наборе символа или None, если символ не встречался."""
+
+        index = self.__indexes.get(char.lower())
+
+        if index is None or not self.__hits[index]:
+            return None
+
+        return self.__errors[index] / self.__hits[index]
+
+    def mean_latency(self, char: str) -> Optional[float]:
+        """Среднее время набора символа в секундах или None, если данных нет."""
+
+        index = self.__indexes.get(char.lower())
+
+        if index is None or not self.__latency_count[index]:
+            return None
+
+        return self.__latency_sum[index] / self.__latency_count[index]
+
+    def hits(self, char: str) -> int:
+        index = self.__indexes.get(char.lower())
+
+        return 0 if index is None else self.__hits[index]
+
+    def top_confusions(self, count: int = 10) -> list[tuple[str, str, int]]:
+        """
+        Самые частые путаницы.
+
+        Returns:
+            Список (ожидаемый символ, введённый символ, количество)
+        """
+
+        size = self.__size
+        keys = self.__keys + [OTHER_KEY] * (size - len(self.__keys))
+
+        top = heapq.nlargest(count, ((value, index) for index, value in enumerate(self.__confusions) if value))
+
+        return [(keys[index // size], keys[index % size], value) for value, index in top]
+
+    def to_bytes(self) -> bytes:
+        header = json.dumps({"size": self.__size, "keys": self.__keys}, ensure_ascii=False).encode("utf-8")
+
+        return b"".join((
+            ERROR_MODEL_FILE_MAGIC,
+            struct.pack("<BI", ERROR_MODEL_FILE_VERSION, len(header)),
+            header,
+            self.__confusions.tobytes(),
+            self.__hits.tobytes(),
+            self.__errors.tobytes(),
+            self.__latency_sum.tobytes(),
+            self.__latency_count.tobytes()
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ErrorModel":
+        """
+        Raises:
+            ValueError: Неверный формат данных
+        """
+
+        if data[:len(ERROR_MODEL_FILE_MAGIC)] != ERROR_MODEL_FILE_MAGIC:
+            raise ValueError("Неверная сигнатура файла статистики ошибок.")
+
+        position = len(ERROR_MODEL_FILE_MAGIC)
+
+        version, header_len = struct.unpack_from("<BI", data, position)
+
+        if version != ERROR_MODEL_FILE_VERSION:
+            raise ValueError("Неподдерживаемая версия файла статистики ошибок.")
+
+        position += struct.calcsize("<BI")
+
+        header = json.loads(data[position:position + header_len].decode("utf-8"))
+        position += header_len
+
+        model = cls(int(header["size"]))
+
+        for key in header["keys"]:
+            model.__index(key)
+
+        for target in (model.__confusions, model.__hits, model.__errors, model.__latency_sum, model.__latency_count):
+            length = len(target) * target.itemsize
+
+            if position + length > len(data):
+                raise ValueError("Файл статистики ошибок обрезан.")
+
+            target[:] = array(target.typecode, data[position:position + length])
+            position += length
+
+        return model
+
+
+def _check_suffix(path: Path):
+    file_suffix = path.suffix.lower()
+
+    if file_suffix != ERROR_MODEL_FILE_SUFFIX:
+        raise FileSuffixError(ERROR_MODEL_FILE_SUFFIX, file_suffix)
+
+
+@timed(STORAGE_READ_SECONDS, ERRORS_STORAGE)
+def load_error_model(path: str) -> ErrorModel:
+    """
+    Загружает статистику ошибок из файла. Если файла нет, возвращает пустую статистику.
+
+    Args:
+        path: Путь к файлу
+
+    Raises:
+        FileSuffixError: Неверное расширение файла
+        FileReadError: Ошибка при чтении файла или неверный формат
+    """
+
+    path = Path(path)
+
+    _check_suffix(path)
+
+    if not path.exists():
+        return ErrorModel()
+
+    try:
+        with open(path, "rb") as file:
+            return ErrorModel.from_bytes(file.read())
+    except (PermissionError, OSError, ValueError, KeyError, struct.error) as ex:
+        raise FileReadError(str(path.absolute()), str(ex))
+
+
+@timed(STORAGE_WRITE_SECONDS, ERRORS_STORAGE)
+def save_error_model(path: str, model: ErrorModel):
+    """
+    Сохраняет статистику ошибок в файл.
+
+    Args:
+        path: Путь к файлу
+        model: Статистика ошибок
+
+    Raises:
+        FileSuffixError: Неверное расширение файла
+        FileWriteError: Ошибка при записи в файл
+    """
+
+    path = Path(path)
+
+    _check_suffix(path)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "wb") as file:
+            file.write(model.to_bytes())
+    except (PermissionError, OSError) as ex:
+        raise FileWriteError(str(path.absolute()), str(ex))
@@ -0,0 +1,126 @@
+import os
+from typing import Callable, Iterable, Optional
+
+from config import FILE_WATCH_INTERVAL_MS
+from enums.file_change import FileChange
+
+
+class FileWatcher:
+    """
+    Отслеживание изменений файлов в каталоге опросом в цикле событий Tk.
+    Каталоги обходятся через os.scandir, для каждого файла хранится (mtime, размер) с прошлого опроса,
+    поэтому опрос - это обход каталогов без чтения файлов.
+    """
+
+    def __init__(
+            self,
+            root,
+            dir_path: str,
+            on_change: Callable[[list[tuple[str, FileChange]]], None],
+            interval_ms: int = FILE_WATCH_INTERVAL_MS,
+            exclude: Iterable[str] = ()
+    ):
+        """
+        Args:
+            root: Корневой виджет Tk
+            dir_path: Отслеживаемый каталог
+            on_change: Обработчик; получает список (путь, изменение) за один опрос
+            interval_ms: Интервал опроса, мс (опционально)
+            exclude: Каталоги, которые не нужно отслеживать (опционально)
+        """
+
+        self.__root = root
+        self.__dir_path = os.path.normpath(dir_path)
+        self.__on_change = on_change
+        self.__interval_ms = interval_ms
+        self.__exclude = frozenset(os.path.normpath(path) for path in exclude)
+
+        self.__files: dict[str, tuple[int, int]] = {}
+        self.__job: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self.__job is not None
+
+    def start(self):
+        """Запомнить текущее состояние файлов и начать опрос."""
+
+        if self.__job is not None:
+            return
+
+        self.__files = self.__scan()
+
+        self.__job = self.__root.after(self.__interval_ms, self.__tick)
+
+    def stop(self):
+        if self.__job is not None:
+            try:
+                self.__root.after_cancel(self.__job)
+            except Exception:
+                pass
+
+            self.__job = None
+
+    def poll(self) -> list[tuple[str, FileChange]]:
+        """
+        Сравнить файлы с прошлым опросом.
+
+        Returns:
+            Список (путь, изменение)
+        """
+
+        previous = self.__files
+        current = self.__scan()
+
+        changes = []
+
+        for path, signature in current.items():
+            old_signature = previous.get(path)
+
+            if old_signature is None:
+                changes.append((path, FileChange.CREATED))
+            elif old_signature != signature:
+                changes.append((path, FileChange.MODIFIED))
+
+        for path in previous.keys() - current.keys():
+            changes.append((path, FileChange.DELETED))
+
+        self.__files = current
+
+        return changes
+
+    def __tick(self):
+        self.__job = None
+
+        try:
+            changes = self.poll()
+
+            if changes:
+                self.__on_change(changes)
+        finally:
+            self.__job = self.__root.after(self.__interval_ms, self.__tick)
+
+    def __scan(self) -> dict[str, tuple[int, int]]:
+        files = {}
+        stack = [self.__dir_path]
+
+        while stack:
+            dir_path = stack.pop()
+
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.path not in self.__exclude:
+                                    stack.append(entry.path)
+                            elif entry.is_file():
+                                stat = entry.stat()
+
+                                files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+        return files
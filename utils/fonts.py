@@ -0,0 +1,113 @@
+import tkinter.font as tkfont
+from typing import Optional
+
+FONT_WEIGHT_NORMAL = "normal"
+FONT_WEIGHT_BOLD = "bold"
+
+
+class FontRegistry:
+    """
+    Общие объекты шрифтов приложения.
+    Виджеты получают один и тот же tkinter.font.Font вместо кортежа, поэтому Tk не разбирает шрифт заново
+    для каждого виджета, а изменение размера шрифта роли - один Font.configure, который сразу применяется
+    ко всем виджетам с этим шрифтом.
+    """
+
+    def __init__(self, root):
+        self.__root = root
+
+        self.__fonts: dict[tuple[str, int, str], tkfont.Font] = {}
+        self.__roles: dict[str, tkfont.Font] = {}
+        self.__role_keys: dict[str, tuple[str, int, str]] = {}
+
+    def scoped(self) -> "FontRegistry":
+        """
+        Реестр для другого окна: неизменяемые шрифты общие, а шрифты ролей свои,
+        чтобы изменение размера текста в одном окне не меняло его в остальных.
+        """
+
+        registry = FontRegistry(self.__root)
+
+        registry.__fonts = self.__fonts
+
+        return registry
+
+    def get(self, family: str, size: int, weight: str = FONT_WEIGHT_NORMAL) -> tkfont.Font:
+        """
+        Неизменяемый шрифт: один объект на сочетание семейства, размера и начертания.
+
+        Args:
+            family: Семейство
+            size: Размер
+            weight: Начертание (опционально)
+        """
+
+        key = (family, size, weight)
+
+        font = self.__fonts.get(key)
+
+        if font is None:
+            font = tkfont.Font(root=self.__root, family=family, size=size, weight=weight)
+
+            self.__fonts[key] = font
+
+        return font
+
+    def role(self, name: str, family: str, size: int, weight: str = FONT_WEIGHT_NORMAL) -> tkfont.Font:
+        """
+        Шрифт роли (например, текста упражнения). Объект у роли один; если параметры изменились,
+        он перенастраивается на месте.
+
+        Args:
+            name: Роль
+            family: Семейство
+            size: Размер
+            weight: Начертание (опционально)
+        """
+
+        key = (family, size, weight)
+
+        font = self.__roles.get(name)
+
+        if font is None:
+            font = tkfont.Font(root=self.__root, family=family, size=size, weight=weight)
+
+            self.__roles[name] = font
+        elif self.__role_keys[name] != key:
+            font.configure(family=family, size=size, weight=weight)
+
+        self.__role_keys[name] = key
+
+        return font
+
+    def resize(self, name: str, size: int) -> Optional[tkfont.Font]:
+        """
+        Изменить размер шрифта роли.
+
+        Returns:
+            Шрифт роли или None, если роль ещё не создана
+        """
+
+        font = self.__roles.get(name)
+
+        if font is not None:
+            family, _, weight = self.__role_keys[name]
+
+            self.role(name, family, size, weight)
+
+        return font
+
+    def from_spec(self, spec) -> tkfont.Font:
+        """
+        Шрифт по описанию из файла стилей: ["Семейство", размер, "начертание"].
+
+        Raises:
+            ValueError: Неверное описание шрифта
+        """
+
+        if isinstance(spec, (list, tuple)) and len(spec) >= 2 and isinstance(spec[0], str):
+            weight = spec[2] if len(spec) > 2 else FONT_WEIGHT_NORMAL
+
+            return self.get(spec[0], int(spec[1]), weight)
+
+        raise ValueError(f"Неверное описание шрифта: {spec}.")
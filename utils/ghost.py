@@ -0,0 +1,91 @@
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+from enums.keystroke_action import KeystrokeAction
+from utils.keystrokes import KeystrokeRecorder
+
+
+class GhostTimeline:
+    """
+    Позиция курсора призрака во времени.
+    Строится один раз по журналу нажатий; позиция на момент времени ищется бинарным поиском.
+    """
+
+    def __init__(self, recorder: KeystrokeRecorder, lines: list[str]):
+        self.__line_starts = array("I", accumulate((len(line) for line in lines), initial=0))
+        self.__total_chars = self.__line_starts[-1]
+
+        self.__timestamps = array("d")
+        self.__positions = array("I")
+
+        elapsed_us = 0
+        line_index = 0
+        line_cursor = 0
+
+        for delta_us, _, action in recorder.events():
+            elapsed_us += delta_us
+
+            if action is KeystrokeAction.INSERT:
+                line_cursor += 1
+            elif action is KeystrokeAction.DELETE:
+                line_cursor = max(line_cursor - 1, 0)
+            else:
+                line_index += 1
+                line_cursor = 0
+
+            if line_index >= len(lines):
+                position = self.__total_chars
+            else:
+                position = self.__line_starts[line_index] + min(line_cursor, len(lines[line_index]))
+
+            self.__timestamps.append(elapsed_us / 1_000_000)
+            self.__positions.append(position)
+
+    @property
+    def duration(self) -> float:
+        return self.__timestamps[-1] if self.__timestamps else 0.0
+
+    @property
+    def total_chars(self) -> int:
+        return self.__total_chars
+
+    def position_at(self, elapsed: float) -> int:
+        """
+        Позиция курсора призрака (сквозной индекс символа) через elapsed секунд от начала.
+
+        Args:
+            elapsed: Время от первого нажатия в секундах
+        """
+
+        index = bisect_right(self.__timestamps, elapsed) - 1
+
+        if index < 0:
+            return 0
+
+        return self.__positions[index]
+
+    def line_position_at(self, elapsed: float) -> tuple[int, int]:
+        """
+        Строка и смещение в строке курсора призрака через elapsed секунд от начала.
+
+        Args:
+            elapsed: Время от первого нажатия в секундах
+
+        Returns:
+            Индекс строки и смещение курсора в ней
+        """
+
+        position = self.position_at(elapsed)
+
+        line_index = bisect_right(self.__line_starts, position) - 1
+
+        if line_index >= len(self.__line_starts) - 1:
+            line_index = len(self.__line_starts) - 2
+
+        return line_index, position - self.__line_starts[line_index]
+
+    def finished_at(self, elapsed: float) -> bool:
+        """Закончил ли призрак свою запись через elapsed секунд от начала."""
+
+        return elapsed >= self.duration
@@ -0,0 +1,341 @@
+import csv
+import json
+import math
+import os
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator, Optional, TextIO, Union
+
+from errors import FileSuffixError, FileWriteError
+from utils.metrics import STORAGE_WRITE_SECONDS, ERRORS_STORAGE, timed
+
+HISTORY_FILE_SUFFIX = ".jsonl"
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_JSONL = "jsonl"
+
+HISTORY_FIELDS = (
+    "profile",
+    "finished_at",
+    "date",
+    "language",
+    "difficulty",
+    "seed",
+    "endless",
+    "time",
+    "cpm",
+    "wpm",
+    "accuracy",
+    "typed",
+    "errors"
+)
+
+
+def _check_suffix(path: Path):
+    file_suffix = path.suffix.lower()
+
+    if file_suffix != HISTORY_FILE_SUFFIX:
+        raise FileSuffixError(HISTORY_FILE_SUFFIX, file_suffix)
+
+
+@timed(STORAGE_WRITE_SECONDS, ERRORS_STORAGE)
+def append_result(path: str, record: dict[str, Any]):
+    """
+    Дописывает результат упражнения в журнал истории (одна строка .JSONL на упражнение).
+    Журнал только дописывается, поэтому запись не зависит от его размера.
+
+    Args:
+        path: Путь к журналу
+        record: Результат упражнения
+
+    Raises:
+        FileSuffixError: Неверное расширение файла
+        FileWriteError: Ошибка при записи в файл
+    """
+
+    path = Path(path)
+
+    _check_suffix(path)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, ensure_ascii=False))
+            file.write("\n")
+    except (PermissionError, OSError) as ex:
+        raise FileWriteError(str(path.absolute()), str(ex))
+
+
+class HistoryFilter:
+    """Отбор результатов по времени завершения и сложности."""
+
+    def __init__(
+            self,
+            since: Optional[float] = None,
+            until: Optional[float] = None,
+            difficulties: Optional[set[str]] = None
+    ):
+        """
+        Args:
+            since: Не раньше этого времени (timestamp, опционально)
+            until: Раньше этого времени (timestamp, опционально)
+            difficulties: Допустимые сложности (опционально)
+        """
+
+        self.__since = since
+        self.__until = until
+        self.__difficulties = frozenset(difficulties) if difficulties else None
+
+    @classmethod
+    def from_dates(
+            cls,
+            since: Optional[date] = None,
+            until: Optional[date] = None,
+            difficulties: Optional[set[str]] = None
+    ) -> "HistoryFilter":
+        """
+        Отбор по календарным дням в местном времени; оба дня входят в диапазон.
+
+        Args:
+            since: Первый день (опционально)
+            until: Последний день (опционально)
+            difficulties: Допустимые сложности (опционально)
+        """
+
+        return cls(
+            datetime.combine(since, datetime.min.time()).timestamp() if since else None,
+            datetime.combine(until + timedelta(days=1), datetime.min.time()).timestamp() if until else None,
+            difficulties
+        )
+
+    def matches(self, record: dict[str, Any]) -> bool:
+        finished_at = record.get("finished_at")
+
+        if isinstance(finished_at, bool) or not isinstance(finished_at, (int, float)):
+            return False
+
+        if not math.isfinite(finished_at):
+            return False
+
+        if self.__since is not None and finished_at < self.__since:
+            return False
+
+        if self.__until is not None and finished_at >= self.__until:
+            return False
+
+        if self.__difficulties is not None and record.get("difficulty") not in self.__difficulties:
+            return False
+
+        return True
+
+
+class HistoryExporter:
+    """
+    Потоковая выгрузка журналов истории в CSV или JSONL.
+    Журналы читаются построчно и каждая подходящая строка сразу записывается, поэтому расход памяти
+    не зависит от количества упражнений. Выгрузка идёт порциями (write_chunk), между которыми
+    можно показать прогресс или отменить её.
+
+    Если вместо потока передан путь, выгрузчик сам открывает файл при первой порции и сам закрывает его
+    по завершении или отмене - в том потоке, где выполнялась последняя порция, поэтому отмена из потока
+    интерфейса не закрывает файл под пишущей порцией.
+    """
+
+    def __init__(
+            self,
+            output: Union[TextIO, str],
+            export_format: str,
+            sources: list[tuple[str, str]],
+            history_filter: Optional[HistoryFilter] = None
+    ):
+        """
+        Args:
+            output: Поток для записи или путь к файлу
+            export_format: Формат (csv или jsonl)
+            sources: Пары (имя профиля, путь к журналу)
+            history_filter: Отбор результатов (опционально)
+
+        Raises:
+            ValueError: Неизвестный формат
+        """
+
+        if export_format not in (EXPORT_FORMAT_CSV, EXPORT_FORMAT_JSONL):
+            raise ValueError(f"Неизвестный формат выгрузки: {export_format}.")
+
+        self.__owns_output = isinstance(output, str)
+        self.__output_path = output if self.__owns_output else None
+        self.__output: Optional[TextIO] = None if self.__owns_output else output
+        self.__format = export_format
+        self.__sources = sources
+        self.__filter = history_filter or HistoryFilter()
+
+        self.__csv_writer = None
+        self.__header_written = False
+
+        self.__lock = threading.Lock()
+        self.__busy = False
+        self.__cancelled = False
+
+        self.__total_bytes = sum(os.path.getsize(path) for _, path in sources if os.path.isfile(path))
+        self.__read_bytes = 0
+        self.__rows = 0
+        self.__finished = False
+
+        self.__records = self.__iter_records()
+
+    @property
+    def total_bytes(self) -> int:
+        return self.__total_bytes
+
+    @property
+    def read_bytes(self) -> int:
+        return self.__read_bytes
+
+    @property
+    def rows(self) -> int:
+        """Количество записанных строк."""
+
+        return self.__rows
+
+    @property
+    def finished(self) -> bool:
+        return self.__finished
+
+    @property
+    def progress(self) -> float:
+        """Доля прочитанных данных от 0 до 1."""
+
+        if self.__finished or not self.__total_bytes:
+            return 1.0 if self.__finished else 0.0
+
+        return min(self.__read_bytes / self.__total_bytes, 1.0)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.__cancelled
+
+    def write_chunk(self, max_rows: int) -> "HistoryExporter":
+        """
+        Записать следующую порцию строк. Можно вызывать из пула потоков.
+
+        Args:
+            max_rows: Максимальное количество строк в порции
+
+        Returns:
+            Сам выгрузчик (для чтения прогресса)
+        """
+
+        with self.__lock:
+            if self.__cancelled or self.__finished:
+                return self
+
+            self.__busy = True
+
+        try:
+            self.__write_rows(max_rows)
+        except Exception:
+            self.__cancelled = True
+
+            raise
+        finally:
+            with self.__lock:
+                self.__busy = False
+
+                if self.__cancelled or self.__finished:
+                    self.__close_output()
+
+        return self
+
+    def cancel(self):
+        """
+        Отменить выгрузку. Если порция сейчас пишется в другом потоке, файл закроет она,
+        иначе файл закрывается сразу.
+        """
+
+        with self.__lock:
+            self.__cancelled = True
+
+            if not self.__busy:
+                self.__close_output()
+
+    def __write_rows(self, max_rows: int):
+        if self.__output is None:
+            self.__output = open(self.__output_path, "w", encoding="utf-8", newline="")
+
+        if not self.__header_written:
+            self.__header_written = True
+
+            if self.__format == EXPORT_FORMAT_CSV:
+                self.__csv_writer = csv.writer(self.__output)
+                self.__csv_writer.writerow(HISTORY_FIELDS)
+
+        for _ in range(max_rows):
+            row = next(self.__records, None)
+
+            if row is None:
+                self.__finished = True
+
+                break
+
+            self.__write_row(row)
+
+            self.__rows += 1
+
+    def __close_output(self):
+        if self.__owns_output and self.__output is not None and not self.__output.closed:
+            self.__output.close()
+
+    def run(self, chunk_rows: int, on_progress=None) -> int:
+        """
+        Выгрузить всё.
+
+        Args:
+            chunk_rows: Строк в порции
+            on_progress: Вызывается после каждой порции с самим выгрузчиком (опционально)
+
+        Returns:
+            Количество записанных строк
+        """
+
+        while not self.__finished and not self.__cancelled:
+            self.write_chunk(chunk_rows)
+
+            if on_progress is not None:
+                on_progress(self)
+
+        return self.__rows
+
+    def __iter_records(self) -> Iterator[dict[str, Any]]:
+        for profile_name, path in self.__sources:
+            try:
+                file = open(path, "rb")
+            except FileNotFoundError:
+                continue
+
+            with file:
+                for raw in file:
+                    self.__read_bytes += len(raw)
+
+                    try:
+                        record = json.loads(raw)
+                    except ValueError:
+                        continue
+
+                    if not isinstance(record, dict) or not self.__filter.matches(record):
+                        continue
+
+                    try:
+                        finished_date = datetime.fromtimestamp(record["finished_at"]).isoformat(sep=" ", timespec="seconds")
+                    except (ValueError, OverflowError, OSError):
+                        continue
+
+                    yield {**record, "profile": profile_name, "date": finished_date}
+
+    def __write_row(self, row: dict[str, Any]):
+        if self.__csv_writer is not None:
+            self.__csv_writer.writerow([row.get(field, "") for field in HISTORY_FIELDS])
+        else:
+            self.__output.write(json.dumps({field: row.get(field) for field in HISTORY_FIELDS}, ensure_ascii=False))
+            self.__output.write("\n")
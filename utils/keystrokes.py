@@ -0,0 +1,304 @@
+import json
+from array import array
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Iterator, Optional
+
+from enums.keystroke_action import KeystrokeAction
+from errors import FileSuffixError, FileReadError, FileWriteError
+from utils.metrics import STORAGE_READ_SECONDS, STORAGE_WRITE_SECONDS, ERRORS_STORAGE, timed
+
+KEYSTROKES_FILE_SUFFIX = ".ftks"
+KEYSTROKES_FILE_MAGIC = b"FTKS"
+KEYSTROKES_FILE_VERSION = 1
+
+ACTION_BITS = 2
+ACTION_MASK = (1 << ACTION_BITS) - 1
+
+MAX_DELTA_US = 0xFFFFFFFF
+
+DEFAULT_RECORDER_CAPACITY = 4096
+
+
+class KeystrokeRecorder:
+    """
+    Журнал нажатий клавиш.
+    События хранятся в трёх предвыделенных массивах: задержка от предыдущего события в микросекундах,
+    код символа и действие. Объекты Python на каждое событие не создаются.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_RECORDER_CAPACITY):
+        capacity = max(capacity, 1)
+
+        self.__deltas = array("I", bytes(4 * capacity))
+        self.__codepoints = array("I", bytes(4 * capacity))
+        self.__actions = array("B", bytes(capacity))
+        self.__capacity = capacity
+        self.__length = 0
+        self.__last_ns: Optional[int] = None
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def record(self, codepoint: int, action: int):
+        """
+        Записать событие.
+
+        Args:
+            codepoint: Код символа (0, если символа нет)
+            action: Действие KeystrokeAction
+        """
+
+        now_ns = perf_counter_ns()
+
+        index = self.__length
+
+        if index == self.__capacity:
+            self.__grow()
+
+        last_ns = self.__last_ns
+        self.__last_ns = now_ns
+
+        if last_ns is None:
+            delta_us = 0
+        else:
+            delta_us = (now_ns - last_ns) // 1000
+
+            if delta_us > MAX_DELTA_US:
+                delta_us = MAX_DELTA_US
+
+        self.__deltas[index] = delta_us
+        self.__codepoints[index] = codepoint
+        self.__actions[index] = action
+
+        self.__length = index + 1
+
+    def append(self, delta_us: int, codepoint: int, action: int):
+        """
+        Добавить событие с уже известной задержкой (при загрузке из файла).
+
+        Args:
+            delta_us: Задержка от предыдущего события в микросекундах
+            codepoint: Код символа
+            action: Действие KeystrokeAction
+        """
+
+        if self.__length == self.__capacity:
+            self.__grow()
+
+        index = self.__length
+
+        self.__deltas[index] = min(delta_us, MAX_DELTA_US)
+        self.__codepoints[index] = codepoint
+        self.__actions[index] = action
+
+        self.__length = index + 1
+
+    def clear(self):
+        """Очистить журнал, сохранив выделенную память."""
+
+        self.__length = 0
+        self.__last_ns = None
+
+    def __grow(self):
+        capacity = self.__capacity
+
+        self.__deltas.frombytes(bytes(4 * capacity))
+        self.__codepoints.frombytes(bytes(4 * capacity))
+        self.__actions.frombytes(bytes(capacity))
+
+        self.__capacity = capacity * 2
+
+    def events(self) -> Iterator[tuple[int, int, KeystrokeAction]]:
+        """События в виде (задержка в микросекундах, код символа, действие)."""
+
+        for index in range(self.__length):
+            yield self.__deltas[index], self.__codepoints[index], KeystrokeAction(self.__actions[index])
+
+    @property
+    def deltas(self) -> array:
+        return self.__deltas[:self.__length]
+
+    @property
+    def codepoints(self) -> array:
+        return self.__codepoints[:self.__length]
+
+    @property
+    def actions(self) -> array:
+        return self.__actions[:self.__length]
+
+    @property
+    def duration_us(self) -> int:
+        return sum(self.__deltas[:self.__length])
+
+    def to_bytes(self, meta: Optional[dict[str, Any]] = None) -> bytes:
+        """
+        Сериализовать журнал.
+        Формат: сигнатура, версия, метаданные JSON, количество событий и события.
+        Каждое событие - varint((задержка << 2) | действие) и varint разности кодов символов в zigzag-кодировке.
+
+        Args:
+            meta: Метаданные сессии (опционально)
+
+        Returns:
+            Сериализованный журнал
+        """
+
+        meta_bytes = json.dumps(meta or {}, ensure_ascii=False).encode("utf-8")
+
+        result = bytearray(KEYSTROKES_FILE_MAGIC)
+        result.append(KEYSTROKES_FILE_VERSION)
+
+        _write_varint(result, len(meta_bytes))
+        result += meta_bytes
+
+        _write_varint(result, self.__length)
+
+        previous_codepoint = 0
+
+        for index in range(self.__length):
+            codepoint = self.__codepoints[index]
+            codepoint_delta = codepoint - previous_codepoint
+            previous_codepoint = codepoint
+
+            _write_varint(result, (self.__deltas[index] << ACTION_BITS) | self.__actions[index])
+            _write_varint(result, (codepoint_delta << 1) ^ (codepoint_delta >> 63))
+
+        return bytes(result)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> tuple["KeystrokeRecorder", dict[str, Any]]:
+        """
+        Десериализовать журнал.
+
+        Args:
+            data: Сериализованный журнал
+
+        Returns:
+            Журнал и метаданные сессии
+
+        Raises:
+            ValueError: Неверный формат данных
+        """
+
+        if data[:len(KEYSTROKES_FILE_MAGIC)] != KEYSTROKES_FILE_MAGIC:
+            raise ValueError("Неверная сигнатура файла нажатий.")
+
+        position = len(KEYSTROKES_FILE_MAGIC)
+
+        if position >= len(data) or data[position] != KEYSTROKES_FILE_VERSION:
+            raise ValueError("Неподдерживаемая версия файла нажатий.")
+
+        position += 1
+
+        meta_len, position = _read_varint(data, position)
+        meta = json.loads(data[position:position + meta_len].decode("utf-8"))
+        position += meta_len
+
+        count, position = _read_varint(data, position)
+
+        recorder = cls(count)
+
+        codepoint = 0
+
+        for _ in range(count):
+            packed, position = _read_varint(data, position)
+            zigzag, position = _read_varint(data, position)
+
+            codepoint += (zigzag >> 1) ^ -(zigzag & 1)
+
+            recorder.append(packed >> ACTION_BITS, codepoint, packed & ACTION_MASK)
+
+        return recorder, meta
+
+
+def _write_varint(buffer: bytearray, value: int):
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+
+    while True:
+        if position >= len(data):
+            raise ValueError("Файл нажатий обрезан.")
+
+        byte = data[position]
+        position += 1
+
+        result |= (byte & 0x7F) << shift
+
+        if byte < 0x80:
+            return result, position
+
+        shift += 7
+
+
+def _check_suffix(path: Path):
+    file_suffix = path.suffix.lower()
+
+    if file_suffix != KEYSTROKES_FILE_SUFFIX:
+        raise FileSuffixError(KEYSTROKES_FILE_SUFFIX, file_suffix)
+
+
+@timed(STORAGE_WRITE_SECONDS, ERRORS_STORAGE)
+def save_keystrokes(path: str, recorder: KeystrokeRecorder, meta: Optional[dict[str, Any]] = None):
+    """
+    Сохраняет журнал нажатий в файл .FTKS.
+
+    Args:
+        path: Путь к файлу
+        recorder: Журнал нажатий
+        meta: Метаданные сессии (опционально)
+
+    Raises:
+        FileSuffixError: Неверное расширение файла
+        FileWriteError: Ошибка при записи в файл
+    """
+
+    path = Path(path)
+
+    _check_suffix(path)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "wb") as file:
+            file.write(recorder.to_bytes(meta))
+    except (PermissionError, OSError) as ex:
+        raise FileWriteError(str(path.absolute()), str(ex))
+
+
+@timed(STORAGE_READ_SECONDS, ERRORS_STORAGE)
+def load_keystrokes(path: str) -> Optional[tuple[KeystrokeRecorder, dict[str, Any]]]:
+    """
+    Загружает журнал нажатий из файла .FTKS.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Журнал и метаданные сессии или None, если файла нет
+
+    Raises:
+        FileSuffixError: Неверное расширение файла
+        FileReadError: Ошибка при чтении файла или неверный формат
+    """
+
+    path = Path(path)
+
+    _check_suffix(path)
+
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, "rb") as file:
+            return KeystrokeRecorder.from_bytes(file.read())
+    except (PermissionError, OSError, ValueError) as ex:
+        raise FileReadError(str(path.absolute()), str(ex))
@@ -0,0 +1,115 @@
+import re
+from typing import Optional
+
+from enums.settings import Language
+from config import RUSSIAN_WORDS_PATH, RUSSIAN_WORDS_REGEX, ENGLISH_WORDS_PATH, ENGLISH_WORDS_REGEX, MIX_WORDS_REGEX
+
+RUS_TO_LAT = {
+    "а": "a", "А": "A",
+    "е": "e", "Е": "E",
+    "о": "o", "О": "O",
+    "с": "c", "С": "C",
+    "р": "p", "Р": "P",
+    "у": "y", "К": "K",
+    "х": "x", "Х": "X",
+    "М": "M", "Т": "T",
+    "Н": "H", "В": "B"
+}
+
+CONFUSABLES = RUS_TO_LAT.copy()
+
+CONFUSABLES.update({v: k for k, v in RUS_TO_LAT.items()})
+
+LAT_TO_RUS = {v: k for k, v in RUS_TO_LAT.items()}
+
+SPLIT_CHARS = frozenset((" ", ".", ",", ";", "!", "?"))
+
+CONFUSABLES_TABLE = str.maketrans(RUS_TO_LAT)
+
+
+class LanguageProfile:
+    """Скомпилированные данные языка: регулярное выражение, таблица нормализации, символы разбиения и корпуса."""
+
+    def __init__(
+            self,
+            language: Language,
+            regex: re.Pattern,
+            corpora: tuple[tuple[str, re.Pattern], ...],
+            split_chars: frozenset[str] = SPLIT_CHARS,
+            normalization_table: Optional[dict[int, str]] = None
+    ):
+        self.__language = language
+        self.__regex = regex
+        self.__corpora = corpora
+        self.__split_chars = split_chars
+        self.__normalization_table = normalization_table if normalization_table is not None else CONFUSABLES_TABLE
+
+    @property
+    def language(self) -> Language:
+        return self.__language
+
+    @property
+    def regex(self) -> re.Pattern:
+        return self.__regex
+
+    @property
+    def corpora(self) -> tuple[tuple[str, re.Pattern], ...]:
+        """Пары (путь к корпусу, регулярное выражение для его слов)."""
+
+        return self.__corpora
+
+    @property
+    def corpus_paths(self) -> tuple[str, ...]:
+        return tuple(path for path, _ in self.__corpora)
+
+    @property
+    def split_chars(self) -> frozenset[str]:
+        return self.__split_chars
+
+    @property
+    def normalization_table(self) -> dict[int, str]:
+        return self.__normalization_table
+
+    def normalize(self, text: str) -> str:
+        """
+        Приводит визуально одинаковые символы к одному виду для сравнения.
+
+        Args:
+            text: Исходная строка
+
+        Returns:
+            Нормализованная строка той же длины
+        """
+
+        return text.translate(self.__normalization_table)
+
+
+def _build_language_profiles() -> dict[Language, LanguageProfile]:
+    russian_regex = re.compile(RUSSIAN_WORDS_REGEX)
+    english_regex = re.compile(ENGLISH_WORDS_REGEX)
+
+    russian_corpus = (RUSSIAN_WORDS_PATH, russian_regex)
+    english_corpus = (ENGLISH_WORDS_PATH, english_regex)
+
+    return {
+        Language.RUSSIAN: LanguageProfile(Language.RUSSIAN, russian_regex, (russian_corpus,)),
+        Language.ENGLISH: LanguageProfile(Language.ENGLISH, english_regex, (english_corpus,)),
+        Language.MIX: LanguageProfile(Language.MIX, re.compile(MIX_WORDS_REGEX), (russian_corpus, english_corpus))
+    }
+
+
+LANGUAGE_PROFILES: dict[Language, LanguageProfile] = _build_language_profiles()
+
+
+def get_language_profile(language: Language) -> LanguageProfile:
+    """
+    Возвращает профиль языка.
+
+    Args:
+        language: Язык
+
+    Returns:
+        Профиль языка
+    """
+
+    return LANGUAGE_PROFILES[Language(language)]
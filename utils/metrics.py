@@ -0,0 +1,371 @@
+import functools
+import json
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+from config import METRICS_BUCKETS, METRICS_WRITE_INTERVAL_MS
+from enums.route import Route
+from errors import FileSuffixError, FileWriteError
+
+METRICS_FORMAT_PROMETHEUS = ".prom"
+METRICS_FORMAT_JSONL = ".jsonl"
+
+METRIC_COUNTER = "counter"
+METRIC_GAUGE = "gauge"
+METRIC_HISTOGRAM = "histogram"
+
+
+class Counter:
+    """Монотонно растущий счётчик."""
+
+    def __init__(self):
+        self.__value = 0
+
+    @property
+    def value(self) -> float:
+        return self.__value
+
+    def inc(self, amount: float = 1):
+        self.__value += amount
+
+
+class Gauge:
+    """Текущее значение."""
+
+    def __init__(self):
+        self.__value = 0.0
+
+    @property
+    def value(self) -> float:
+        return self.__value
+
+    def set(self, value: float):
+        self.__value = value
+
+
+class Histogram:
+    """
+    Гистограмма длительностей с фиксированными границами корзин.
+    Корзины выделяются при создании, поэтому замер - поиск корзины и три сложения без выделения памяти.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = METRICS_BUCKETS):
+        self.__buckets = buckets
+        self.__counts = [0] * (len(buckets) + 1)
+        self.__sum = 0.0
+        self.__count = 0
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        return self.__buckets
+
+    @property
+    def sum(self) -> float:
+        return self.__sum
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    @property
+    def cumulative_counts(self) -> list[int]:
+        """Накопленные количества по корзинам; последняя - все замеры (+Inf)."""
+
+        counts = []
+        total = 0
+
+        for count in self.__counts:
+            total += count
+            counts.append(total)
+
+        return counts
+
+    def observe(self, seconds: float):
+        self.__counts[bisect_left(self.__buckets, seconds)] += 1
+        self.__sum += seconds
+        self.__count += 1
+
+
+class MetricsRegistry:
+    """
+    Метрики приложения.
+    Метрики создаются заранее (в том числе для каждого значения метки), а места измерения держат ссылку
+    на готовый объект, поэтому в горячих путях нет ни поиска по имени, ни выделения памяти.
+    """
+
+    def __init__(self):
+        self.__families: dict[str, tuple[str, str, list[tuple[dict[str, str], Any]]]] = {}
+
+    def counter(self, name: str, description: str, labels: Optional[dict[str, str]] = None) -> Counter:
+        return self.__register(name, description, METRIC_COUNTER, labels, Counter())
+
+    def gauge(self, name: str, description: str, labels: Optional[dict[str, str]] = None) -> Gauge:
+        return self.__register(name, description, METRIC_GAUGE, labels, Gauge())
+
+    def histogram(
+            self,
+            name: str,
+            description: str,
+            labels: Optional[dict[str, str]] = None,
+            buckets: tuple[float, ...] = METRICS_BUCKETS
+    ) -> Histogram:
+        return self.__register(name, description, METRIC_HISTOGRAM, labels, Histogram(buckets))
+
+    def __register(self, name: str, description: str, kind: str, labels: Optional[dict[str, str]], metric):
+        """
+        Raises:
+            ValueError: Метрика с этим именем уже зарегистрирована с другим типом
+        """
+
+        family = self.__families.setdefault(name, (kind, description, []))
+
+        if family[0] != kind:
+            raise ValueError(f"Метрика {name} уже зарегистрирована с типом {family[0]}.")
+
+        family[2].append((labels or {}, metric))
+
+        return metric
+
+    def render_prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus (для textfile collector)."""
+
+        lines = []
+
+        for name, (kind, description, metrics) in self.__families.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+
+            for labels, metric in metrics:
+                if kind == METRIC_HISTOGRAM:
+                    bounds = [_format_value(bound) for bound in metric.buckets] + ["+Inf"]
+
+                    for bound, count in zip(bounds, metric.cumulative_counts):
+                        lines.append(f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}")
+
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(metric.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {metric.count}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(metric.value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def render_json(self, timestamp: Optional[float] = None) -> dict[str, Any]:
+        """Снимок метрик одним словарем (для строки JSON Lines)."""
+
+        metrics = {}
+
+        for name, (kind, _, family) in self.__families.items():
+            values = []
+
+            for labels, metric in family:
+                if kind == METRIC_HISTOGRAM:
+                    value = {
+                        "buckets": dict(zip([*map(str, metric.buckets), "+Inf"], metric.cumulative_counts)),
+                        "sum": metric.sum,
+                        "count": metric.count
+                    }
+                else:
+                    value = metric.value
+
+                values.append({"labels": labels, "value": value})
+
+            metrics[name] = {"type": kind, "values": values}
+
+        return {"timestamp": time.time() if timestamp is None else timestamp, "metrics": metrics}
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+
+    pairs = []
+
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        pairs.append(f'{key}="{value}"')
+
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+METRICS = MetricsRegistry()
+
+STARTUP_SECONDS = METRICS.gauge("trainer_startup_seconds", "Время от запуска до показа первого экрана, сек.")
+
+NAVIGATION_SECONDS = {
+    route: METRICS.histogram(
+        "trainer_navigation_seconds",
+        "Время перехода между экранами, сек.",
+        {"route": route.name.lower().removeprefix("route_")}
+    )
+    for route in Route
+    if route is not Route.ROUTE_BACK
+}
+
+KEYSTROKE_SECONDS = METRICS.histogram("trainer_keystroke_seconds", "Время обработки ввода, сек.")
+
+GENERATION_SECONDS = METRICS.histogram("trainer_generation_seconds", "Время подготовки текста упражнения, сек.")
+
+STORAGE_READ_SECONDS = METRICS.histogram("trainer_storage_seconds", "Время чтения и записи файлов, сек.", {"op": "read"})
+STORAGE_WRITE_SECONDS = METRICS.histogram("trainer_storage_seconds", "Время чтения и записи файлов, сек.", {"op": "write"})
+
+ERRORS_UI = METRICS.counter("trainer_errors_total", "Количество ошибок.", {"kind": "ui"})
+ERRORS_STORAGE = METRICS.counter("trainer_errors_total", "Количество ошибок.", {"kind": "storage"})
+ERRORS_TASK = METRICS.counter("trainer_errors_total", "Количество ошибок.", {"kind": "task"})
+
+
+def timed(histogram: Histogram, errors: Optional[Counter] = None) -> Callable:
+    """
+    Декоратор: записать время выполнения функции в гистограмму, а исключение - в счётчик ошибок.
+
+    Args:
+        histogram: Гистограмма
+        errors: Счётчик ошибок (опционально)
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+
+            try:
+                return function(*args, **kwargs)
+            except Exception:
+                if errors is not None:
+                    errors.inc()
+
+                raise
+            finally:
+                histogram.observe(perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+def write_metrics(path: str, text: str):
+    """
+    Записать метрики в файл целиком.
+    Prometheus-файл записывается во временный и подменяется, поэтому сборщик никогда не видит его наполовину
+    записанным; в JSON Lines снимок дописывается одной строкой за одну запись.
+
+    Args:
+        path: Путь к файлу (.prom или .jsonl)
+        text: Подготовленный текст
+
+    Raises:
+        FileSuffixError: Неверное расширение файла
+        FileWriteError: Ошибка при записи в файл
+    """
+
+    path = Path(path)
+
+    file_suffix = path.suffix.lower()
+
+    if file_suffix not in (METRICS_FORMAT_PROMETHEUS, METRICS_FORMAT_JSONL):
+        raise FileSuffixError(METRICS_FORMAT_PROMETHEUS, file_suffix)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if file_suffix == METRICS_FORMAT_JSONL:
+            with open(path, "a", encoding="utf-8") as file:
+                file.write(text)
+        else:
+            temp_path = path.with_suffix(path.suffix + ".tmp")
+
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write(text)
+
+            os.replace(temp_path, path)
+    except (PermissionError, OSError) as ex:
+        raise FileWriteError(str(path.absolute()), str(ex))
+
+
+class MetricsWriter:
+    """
+    Периодическая выгрузка метрик в файл для агента мониторинга.
+    Снимок готовится в потоке интерфейса (это только чтение счётчиков), а запись в файл уходит в пул потоков.
+    """
+
+    def __init__(self, root, scheduler, path: str, interval_ms: int = METRICS_WRITE_INTERVAL_MS, registry: MetricsRegistry = METRICS):
+        """
+        Args:
+            root: Корневой виджет Tk (для after)
+            scheduler: Планировщик приложения
+            path: Путь к файлу; формат определяется расширением (.prom или .jsonl)
+            interval_ms: Период выгрузки, мс
+            registry: Метрики (опционально)
+        """
+
+        self.__root = root
+        self.__scheduler = scheduler
+        self.__path = path
+        self.__interval_ms = interval_ms
+        self.__registry = registry
+
+        self.__job: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def start(self):
+        if self.__job is None:
+            self.__job = self.__root.after(self.__interval_ms, self.__tick)
+
+    def stop(self, flush: bool = True):
+        """
+        Остановить выгрузку.
+
+        Args:
+            flush: Записать последний снимок сразу, в текущем потоке
+        """
+
+        if self.__job is not None:
+            try:
+                self.__root.after_cancel(self.__job)
+            except Exception:
+                pass
+
+            self.__job = None
+
+        if flush:
+            try:
+                write_metrics(self.__path, self.__render())
+            except (FileSuffixError, FileWriteError):
+                pass
+
+    def __render(self) -> str:
+        if self.__path.lower().endswith(METRICS_FORMAT_JSONL):
+            return json.dumps(self.__registry.render_json(), ensure_ascii=False) + "\n"
+
+        return self.__registry.render_prometheus()
+
+    def __tick(self):
+        self.__job = self.__root.after(self.__interval_ms, self.__tick)
+
+        self.__scheduler.offload(
+            write_metrics,
+            self.__path,
+            self.__render(),
+            name="metrics",
+            on_error=self.__on_error
+        )
+
+    @staticmethod
+    def __on_error(_: Exception):
+        """
+        Ошибка записи не прерывает работу тренажёра: следующая попытка - по таймеру.
+        Сама ошибка уже учтена планировщиком в trainer_errors_total{kind="task"}.
+        """
+
+        pass
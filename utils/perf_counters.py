@@ -0,0 +1,80 @@
+from array import array
+from typing import Optional
+
+from config import PERF_SAMPLES_WINDOW
+
+
+class TimingCounter:
+    """
+    Счётчик длительностей операции.
+    Запись замера - несколько арифметических операций и запись в кольцевой буфер фиксированного размера;
+    среднее и перцентиль считаются только по запросу (например, при обновлении HUD).
+    """
+
+    def __init__(self, window: int = PERF_SAMPLES_WINDOW):
+        """
+        Args:
+            window: Количество последних замеров для перцентиля
+        """
+
+        self.__samples = array("d", bytes(8 * window))
+        self.__window = window
+        self.__position = 0
+
+        self.__count = 0
+        self.__total = 0.0
+        self.__last: Optional[float] = None
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    @property
+    def last(self) -> Optional[float]:
+        """Последний замер, сек."""
+
+        return self.__last
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Среднее по всем замерам, сек."""
+
+        if not self.__count:
+            return None
+
+        return self.__total / self.__count
+
+    def record(self, seconds: float):
+        self.__samples[self.__position] = seconds
+        self.__position = (self.__position + 1) % self.__window
+
+        self.__count += 1
+        self.__total += seconds
+        self.__last = seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Перцентиль по последним замерам.
+
+        Args:
+            q: Доля от 0 до 1 (например, 0.99)
+
+        Returns:
+            Значение, сек., или None, если замеров нет
+        """
+
+        size = min(self.__count, self.__window)
+
+        if not size:
+            return None
+
+        samples = sorted(self.__samples[:size])
+
+        return samples[min(int(q * size), size - 1)]
+
+    def reset(self):
+        self.__position = 0
+
+        self.__count = 0
+        self.__total = 0.0
+        self.__last = None
@@ -0,0 +1,264 @@
+import json
+import os
+import secrets
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from config import PROFILES_DIR_PATH, ERROR_MODEL_PATH, SESSIONS_DIR_PATH, HISTORY_PATH, DEFAULT_PROFILE_ID, DEFAULT_PROFILE_NAME
+from errors import FileSuffixError, FileReadError, FileWriteError
+from settings import SETTINGS_FILE_PATH
+
+PROFILES_INDEX_FILE_SUFFIX = ".json"
+PROFILES_INDEX_VERSION = 1
+PROFILE_SHARD_LEN = 2
+
+
+class Profile:
+    """
+    Профиль пользователя.
+    Данные профиля лежат в собственном каталоге PROFILES_DIR_PATH/<первые символы id>/<id>/: разбиение по
+    подкаталогам не даёт одному каталогу разрастаться до сотен записей. Общий профиль использует прежние
+    пути в DATA_DIR_PATH, поэтому уже накопленные данные остаются на месте.
+    """
+
+    def __init__(self, profile_id: str, name: str, created_at: float, station: Optional[int] = None):
+        """
+        Args:
+            profile_id: Идентификатор
+            name: Имя
+            created_at: Время создания (timestamp)
+            station: Номер дополнительного окна тренажёра (опционально)
+        """
+
+        self.__id = profile_id
+        self.__name = name
+        self.__created_at = created_at
+        self.__station = station
+
+    @property
+    def id(self) -> str:
+        return self.__id
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @name.setter
+    def name(self, value: str):
+        self.__name = value
+
+    @property
+    def created_at(self) -> float:
+        return self.__created_at
+
+    @property
+    def is_default(self) -> bool:
+        return self.__id == DEFAULT_PROFILE_ID
+
+    @property
+    def station(self) -> Optional[int]:
+        return self.__station
+
+    def for_station(self, station: int) -> "Profile":
+        """
+        Профиль для дополнительного окна тренажёра.
+        Незаконченное и последнее упражнения у каждого окна свои, а настройки, статистика ошибок и история
+        общие для профиля.
+
+        Args:
+            station: Номер окна
+        """
+
+        return Profile(self.__id, self.__name, self.__created_at, station)
+
+    @property
+    def dir_path(self) -> str:
+        return f"{PROFILES_DIR_PATH}{self.__id[:PROFILE_SHARD_LEN]}/{self.__id}/"
+
+    @property
+    def settings_path(self) -> str:
+        return SETTINGS_FILE_PATH if self.is_default else self.dir_path + "settings.json"
+
+    @property
+    def error_model_path(self) -> str:
+        return ERROR_MODEL_PATH if self.is_default else self.dir_path + "error_model.bin"
+
+    @property
+    def sessions_dir_path(self) -> str:
+        dir_path = SESSIONS_DIR_PATH if self.is_default else self.dir_path + "sessions/"
+
+        if self.__station is not None:
+            dir_path += f"station_{self.__station}/"
+
+        return dir_path
+
+    @property
+    def last_session_path(self) -> str:
+        return self.sessions_dir_path + "last.ftks"
+
+    @property
+    def snapshot_path(self) -> str:
+        return self.sessions_dir_path + "snapshot.json"
+
+    @property
+    def snapshot_text_path(self) -> str:
+        return self.sessions_dir_path + "snapshot_text.bin"
+
+    @property
+    def history_path(self) -> str:
+        return HISTORY_PATH if self.is_default else self.dir_path + "sessions/history.jsonl"
+
+    @property
+    def json(self) -> dict[str, Any]:
+        return {
+            "id": self.__id,
+            "name": self.__name,
+            "created_at": self.__created_at
+        }
+
+
+class ProfileManager:
+    """
+    Список профилей и активный профиль.
+    Список хранится в одном индексном файле, поэтому для вывода и переключения профилей не нужно обходить
+    их каталоги - файлы профиля читаются, только когда профиль становится активным.
+    """
+
+    def __init__(self, index_path: str):
+        self.__index_path = index_path
+
+        self.__profiles: dict[str, Profile] = {}
+        self.__active_id = DEFAULT_PROFILE_ID
+
+        self.__add_default()
+
+    @property
+    def profiles(self) -> list[Profile]:
+        """Профили в порядке создания."""
+
+        return list(self.__profiles.values())
+
+    @property
+    def active(self) -> Profile:
+        return self.__profiles[self.__active_id]
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return self.__profiles.get(profile_id)
+
+    def load(self):
+        """
+        Загрузить индекс профилей. Если индекса нет, доступен только общий профиль.
+
+        Raises:
+            FileSuffixError: Неверное расширение файла
+            FileReadError: Ошибка при чтении файла или неверный формат
+        """
+
+        path = self.__check_path()
+
+        if not path.exists():
+            return
+
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+
+            profiles = {}
+
+            for item in data.get("profiles", []):
+                profile = Profile(str(item["id"]), str(item["name"]), float(item.get("created_at", 0)))
+
+                profiles[profile.id] = profile
+        except (PermissionError, OSError, ValueError, KeyError, TypeError, AttributeError) as ex:
+            raise FileReadError(str(path.absolute()), str(ex))
+
+        self.__profiles = profiles
+
+        self.__add_default()
+
+        active_id = data.get("active")
+
+        self.__active_id = active_id if active_id in self.__profiles else DEFAULT_PROFILE_ID
+
+    def save(self):
+        """
+        Сохранить индекс профилей. Файл записывается во временный и подменяется целиком.
+
+        Raises:
+            FileSuffixError: Неверное расширение файла
+            FileWriteError: Ошибка при записи в файл
+        """
+
+        path = self.__check_path()
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+
+        data = {
+            "version": PROFILES_INDEX_VERSION,
+            "active": self.__active_id,
+            "profiles": [profile.json for profile in self.__profiles.values()]
+        }
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(data, file, ensure_ascii=False, indent=2)
+
+            os.replace(temp_path, path)
+        except (PermissionError, OSError) as ex:
+            raise FileWriteError(str(path.absolute()), str(ex))
+
+    def create(self, name: str) -> Profile:
+        """
+        Создать профиль. Каталог профиля появится при первой записи его данных.
+
+        Args:
+            name: Имя профиля
+
+        Returns:
+            Новый профиль
+        """
+
+        profile_id = secrets.token_hex(8)
+
+        while profile_id in self.__profiles:
+            profile_id = secrets.token_hex(8)
+
+        profile = Profile(profile_id, name, time.time())
+
+        self.__profiles[profile_id] = profile
+
+        return profile
+
+    def activate(self, profile_id: str) -> Profile:
+        """
+        Сделать профиль активным.
+
+        Raises:
+            KeyError: Профиль не найден
+        """
+
+        if profile_id not in self.__profiles:
+            raise KeyError(profile_id)
+
+        self.__active_id = profile_id
+
+        return self.__profiles[profile_id]
+
+    def __add_default(self):
+        if DEFAULT_PROFILE_ID not in self.__profiles:
+            self.__profiles = {
+                DEFAULT_PROFILE_ID: Profile(DEFAULT_PROFILE_ID, DEFAULT_PROFILE_NAME, 0.0),
+                **self.__profiles
+            }
+
+    def __check_path(self) -> Path:
+        path = Path(self.__index_path)
+
+        file_suffix = path.suffix.lower()
+
+        if file_suffix != PROFILES_INDEX_FILE_SUFFIX:
+            raise FileSuffixError(PROFILES_INDEX_FILE_SUFFIX, file_suffix)
+
+        return path
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import queue
+import threading
+from typing import Any, Optional
+
+from config import RACE_DEFAULT_ROOM, RACE_PROGRESS_INTERVAL
+
+CONNECT_TIMEOUT = 5
+
+
+class RaceClient:
+    """
+    Клиент гонки.
+    Сетевой обмен идёт в отдельном потоке со своим циклом asyncio; поток интерфейса только кладёт
+    последний прогресс и забирает события методом poll, поэтому никогда не ждёт сокет.
+    """
+
+    def __init__(self, host: str, port: int, name: str, room: str = RACE_DEFAULT_ROOM, progress_interval: float = RACE_PROGRESS_INTERVAL):
+        self.__host = host
+        self.__port = port
+        self.__name = name
+        self.__room = room
+        self.__progress_interval = progress_interval
+
+        self.__events: queue.SimpleQueue = queue.SimpleQueue()
+        self.__progress: Optional[tuple[int, int, int]] = None
+        self.__sent_progress: Optional[tuple[int, int, int]] = None
+        self.__player_id: Optional[int] = None
+        self.__closed = False
+
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__stop_event: Optional[asyncio.Event] = None
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def player_id(self) -> Optional[int]:
+        return self.__player_id
+
+    def start(self):
+        """Подключиться к серверу в фоновом потоке."""
+
+        if self.__thread is not None:
+            return
+
+        self.__thread = threading.Thread(target=self.__run, name="race-client", daemon=True)
+        self.__thread.start()
+
+    def close(self):
+        """Отключиться от сервера."""
+
+        self.__closed = True
+
+        loop = self.__loop
+        stop_event = self.__stop_event
+
+        if loop is not None and stop_event is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(stop_event.set)
+            except RuntimeError:
+                pass
+
+    def send_progress(self, line: int, offset: int, cpm: int):
+        """
+        Запомнить прогресс для отправки. Отправляется только последнее значение не чаще progress_interval.
+
+        Args:
+            line: Индекс строки
+            offset: Смещение курсора в строке
+            cpm: Текущая скорость
+        """
+
+        self.__progress = (line, offset, cpm)
+
+    def poll(self) -> list[tuple[str, Any]]:
+        """
+        Забрать накопившиеся события (вызывается из потока интерфейса).
+
+        Returns:
+            Список событий: ("state", список участников), ("error", текст) или ("closed", None)
+        """
+
+        events = []
+
+        while True:
+            try:
+                events.append(self.__events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def __run(self):
+        try:
+            asyncio.run(self.__main())
+        except Exception as ex:
+            self.__events.put(("error", str(ex)))
+
+        self.__events.put(("closed", None))
+
+    async def __main(self):
+        self.__loop = asyncio.get_running_loop()
+        self.__stop_event = asyncio.Event()
+
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self.__host, self.__port), CONNECT_TIMEOUT)
+
+        if self.__closed:
+            writer.close()
+
+            return
+
+        writer.write(json.dumps({"type": "join", "name": self.__name, "room": self.__room}).encode("utf-8") + b"\n")
+
+        tasks = [
+            asyncio.create_task(self.__receive(reader)),
+            asyncio.create_task(self.__send_loop(writer)),
+            asyncio.create_task(self.__stop_event.wait())
+        ]
+
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            writer.close()
+
+    async def __receive(self, reader: asyncio.StreamReader):
+        while True:
+            raw = await reader.readline()
+
+            if not raw:
+                return
+
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                continue
+
+            if not isinstance(message, dict):
+                continue
+
+            message_type = message.get("type")
+
+            if message_type == "welcome":
+                self.__player_id = message.get("id")
+            elif message_type == "state":
+                self.__events.put(("state", message.get("players", [])))
+
+    async def __send_loop(self, writer: asyncio.StreamWriter):
+        while True:
+            await asyncio.sleep(self.__progress_interval)
+
+            progress = self.__progress
+
+            if progress is None or progress == self.__sent_progress:
+                continue
+
+            self.__sent_progress = progress
+
+            line, offset, cpm = progress
+
+            writer.write(json.dumps({"type": "progress", "line": line, "offset": offset, "cpm": cpm}).encode("utf-8") + b"\n")
+
+            await writer.drain()
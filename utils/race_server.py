@@ -0,0 +1,205 @@
+import asyncio
+import itertools
+import json
+from typing import Any, Optional
+
+from config import RACE_DEFAULT_HOST, RACE_DEFAULT_PORT, RACE_DEFAULT_ROOM, RACE_BROADCAST_INTERVAL
+
+MAX_MESSAGE_SIZE = 4096
+MAX_WRITE_BUFFER_SIZE = 256 * 1024
+MAX_NAME_LEN = 32
+
+
+class RacePlayer:
+    """Участник гонки."""
+
+    def __init__(self, player_id: int, name: str, room: str, writer: asyncio.StreamWriter):
+        self.id = player_id
+        self.name = name
+        self.room = room
+        self.writer = writer
+        self.line = 0
+        self.offset = 0
+        self.cpm = 0
+
+    @property
+    def json(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "line": self.line,
+            "offset": self.offset,
+            "cpm": self.cpm
+        }
+
+
+class RaceServer:
+    """
+    Сервер гонок.
+    Протокол - JSON по строке на сообщение. Клиент отправляет join и progress,
+    сервер раз в RACE_BROADCAST_INTERVAL рассылает state всем участникам комнаты, в которой были изменения.
+    """
+
+    def __init__(self, host: str = RACE_DEFAULT_HOST, port: int = RACE_DEFAULT_PORT, broadcast_interval: float = RACE_BROADCAST_INTERVAL):
+        self.__host = host
+        self.__port = port
+        self.__broadcast_interval = broadcast_interval
+        self.__ids = itertools.count(1)
+        self.__rooms: dict[str, dict[int, RacePlayer]] = {}
+        self.__dirty_rooms: set[str] = set()
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__broadcast_task: Optional[asyncio.Task] = None
+
+    @property
+    def port(self) -> int:
+        if self.__server and self.__server.sockets:
+            return self.__server.sockets[0].getsockname()[1]
+
+        return self.__port
+
+    async def start(self):
+        self.__server = await asyncio.start_server(self.__handle_client, self.__host, self.__port, limit=MAX_MESSAGE_SIZE)
+        self.__broadcast_task = asyncio.create_task(self.__broadcast_loop())
+
+    async def stop(self):
+        if self.__broadcast_task:
+            self.__broadcast_task.cancel()
+
+        if self.__server:
+            self.__server.close()
+
+            await self.__server.wait_closed()
+
+        for room in self.__rooms.values():
+            for player in room.values():
+                player.writer.close()
+
+    async def serve_forever(self):
+        await self.start()
+
+        try:
+            await self.__server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def __handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        player: Optional[RacePlayer] = None
+
+        try:
+            while True:
+                try:
+                    raw = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    break
+
+                if not raw:
+                    break
+
+                try:
+                    message = json.loads(raw)
+                except ValueError:
+                    continue
+
+                if not isinstance(message, dict):
+                    continue
+
+                message_type = message.get("type")
+
+                if message_type == "join" and player is None:
+                    player = self.__join(message, writer)
+                elif message_type == "progress" and player is not None:
+                    self.__update_progress(player, message)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if player is not None:
+                self.__leave(player)
+
+            writer.close()
+
+    def __join(self, message: dict[str, Any], writer: asyncio.StreamWriter) -> RacePlayer:
+        name = str(message.get("name") or "Игрок")[:MAX_NAME_LEN]
+        room = str(message.get("room") or RACE_DEFAULT_ROOM)[:MAX_NAME_LEN]
+
+        player = RacePlayer(next(self.__ids), name, room, writer)
+
+        self.__rooms.setdefault(room, {})[player.id] = player
+        self.__dirty_rooms.add(room)
+
+        self.__send(player, json.dumps({"type": "welcome", "id": player.id}).encode("utf-8") + b"\n")
+
+        return player
+
+    def __update_progress(self, player: RacePlayer, message: dict[str, Any]):
+        try:
+            player.line = int(message.get("line", player.line))
+            player.offset = int(message.get("offset", player.offset))
+            player.cpm = int(message.get("cpm", player.cpm))
+        except (TypeError, ValueError):
+            return
+
+        self.__dirty_rooms.add(player.room)
+
+    def __leave(self, player: RacePlayer):
+        room = self.__rooms.get(player.room)
+
+        if room is None:
+            return
+
+        room.pop(player.id, None)
+
+        if room:
+            self.__dirty_rooms.add(player.room)
+        else:
+            del self.__rooms[player.room]
+
+    def __send(self, player: RacePlayer, data: bytes):
+        transport = player.writer.transport
+
+        if transport.is_closing():
+            return
+
+        if transport.get_write_buffer_size() > MAX_WRITE_BUFFER_SIZE:
+            transport.abort()
+
+            return
+
+        player.writer.write(data)
+
+    async def __broadcast_loop(self):
+        while True:
+            await asyncio.sleep(self.__broadcast_interval)
+
+            if not self.__dirty_rooms:
+                continue
+
+            dirty_rooms, self.__dirty_rooms = self.__dirty_rooms, set()
+
+            for room_name in dirty_rooms:
+                room = self.__rooms.get(room_name)
+
+                if not room:
+                    continue
+
+                data = json.dumps(
+                    {"type": "state", "players": [player.json for player in room.values()]},
+                    ensure_ascii=False
+                ).encode("utf-8") + b"\n"
+
+                for player in list(room.values()):
+                    self.__send(player, data)
+
+
+def run_race_server(host: str = RACE_DEFAULT_HOST, port: int = RACE_DEFAULT_PORT):
+    """
+    Запускает сервер гонок и блокирует поток до остановки.
+
+    Args:
+        host: Адрес для прослушивания
+        port: Порт
+    """
+
+    try:
+        asyncio.run(RaceServer(host, port).serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,416 @@
+import heapq
+import itertools
+import queue
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable, Generator, Optional
+
+from config import SCHEDULER_BUDGET_MS, SCHEDULER_POLL_MS, SCHEDULER_WORKERS
+from enums.task_priority import TaskPriority
+from utils.metrics import ERRORS_TASK
+
+
+class Offload:
+    """
+    Шаг задачи для пула потоков.
+    Задача отдаёт его через yield, а результат (или исключение) возвращается в генератор уже в потоке интерфейса.
+    """
+
+    def __init__(self, function: Callable, *args, **kwargs):
+        self.__function = function
+        self.__args = args
+        self.__kwargs = kwargs
+
+    def run(self) -> tuple[Any, float]:
+        """Выполнить шаг и вернуть результат вместе со временем выполнения в секундах."""
+
+        started = perf_counter()
+
+        result = self.__function(*self.__args, **self.__kwargs)
+
+        return result, perf_counter() - started
+
+
+class ScheduledTask:
+    """Задача планировщика: генератор, который выполняется по шагам между событиями интерфейса."""
+
+    def __init__(
+            self,
+            task_id: int,
+            name: str,
+            priority: TaskPriority,
+            generator: Generator,
+            on_done: Optional[Callable[[Any], None]] = None,
+            on_error: Optional[Callable[[Exception], None]] = None
+    ):
+        self.__id = task_id
+        self.__name = name
+        self.__priority = priority
+        self.__generator = generator
+        self.__on_done = on_done
+        self.__on_error = on_error
+
+        self.__cancelled = False
+        self.__finished = False
+        self.__time_spent = 0.0
+        self.__thread_time = 0.0
+        self.__steps = 0
+
+        self.__resume_value: Any = None
+        self.__resume_error: Optional[BaseException] = None
+
+    @property
+    def id(self) -> int:
+        return self.__id
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def priority(self) -> TaskPriority:
+        return self.__priority
+
+    @property
+    def cancelled(self) -> bool:
+        return self.__cancelled
+
+    @property
+    def finished(self) -> bool:
+        return self.__finished
+
+    @property
+    def time_spent(self) -> float:
+        """Время выполнения шагов в потоке интерфейса, сек."""
+
+        return self.__time_spent
+
+    @property
+    def thread_time(self) -> float:
+        """Время выполнения шагов в пуле потоков, сек."""
+
+        return self.__thread_time
+
+    @property
+    def steps(self) -> int:
+        return self.__steps
+
+    def cancel(self):
+        """Отменить задачу. Генератор закрывается, обработчики результата не вызываются."""
+
+        if self.__cancelled or self.__finished:
+            return
+
+        self.__cancelled = True
+
+        self.__generator.close()
+
+    def _resume_with(self, value: Any = None, error: Optional[BaseException] = None, thread_time: float = 0.0):
+        self.__resume_value = value
+        self.__resume_error = error
+        self.__thread_time += thread_time
+
+    def _step(self) -> Any:
+        """
+        Выполнить один шаг генератора.
+
+        Returns:
+            Значение, отданное генератором через yield
+
+        Raises:
+            StopIteration: Задача завершилась
+        """
+
+        value, error = self.__resume_value, self.__resume_error
+
+        self.__resume_value = None
+        self.__resume_error = None
+
+        started = perf_counter()
+
+        try:
+            if error is not None:
+                return self.__generator.throw(error)
+
+            return self.__generator.send(value)
+        finally:
+            self.__time_spent += perf_counter() - started
+            self.__steps += 1
+
+    def _finish(self, result: Any = None, error: Optional[Exception] = None) -> bool:
+        """
+        Завершить задачу и вызвать обработчик.
+
+        Returns:
+            Был ли вызван обработчик (для ошибки без обработчика - False)
+        """
+
+        self.__finished = True
+
+        if error is not None:
+            if self.__on_error is None:
+                return False
+
+            self.__on_error(error)
+        elif self.__on_done is not None:
+            self.__on_done(result)
+
+        return True
+
+
+class Scheduler:
+    """
+    Кооперативный планировщик фоновых задач в цикле событий Tk.
+    Задачи - генераторы: каждый yield отдаёт управление, и шаги выполняются в простое цикла событий
+    не дольше budget_ms за раз, сначала задачи с более высоким приоритетом. Тяжёлые шаги (yield Offload(...))
+    уходят в пул потоков, а их результаты забираются в поток интерфейса опросом через after.
+    """
+
+    def __init__(
+            self,
+            root,
+            budget_ms: int = SCHEDULER_BUDGET_MS,
+            poll_ms: int = SCHEDULER_POLL_MS,
+            workers: int = SCHEDULER_WORKERS
+    ):
+        self.__root = root
+        self.__budget = budget_ms / 1000
+        self.__poll_ms = poll_ms
+        self.__workers = workers
+
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__ids = itertools.count(1)
+        self.__sequence = itertools.count()
+
+        self.__ready: list[tuple[int, int, ScheduledTask]] = []
+        self.__waiting: dict[int, ScheduledTask] = {}
+        self.__results: queue.SimpleQueue = queue.SimpleQueue()
+
+        self.__tick_job: Optional[str] = None
+        self.__poll_job: Optional[str] = None
+        self.__closed = False
+
+        self.__completed = 0
+        self.__time_by_name: dict[str, float] = {}
+        self.__thread_time_by_name: dict[str, float] = {}
+        self.__steps_by_name: dict[str, int] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """Количество задач, ожидающих шага в потоке интерфейса."""
+
+        return sum(1 for _, _, task in self.__ready if not task.cancelled)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Счётчики планировщика: глубина очереди, задачи в пуле потоков и время по именам задач (мс)."""
+
+        return {
+            "ready": self.queue_depth,
+            "waiting": len(self.__waiting),
+            "completed": self.__completed,
+            "tasks": {
+                name: {
+                    "time_ms": self.__time_by_name[name] * 1000,
+                    "thread_time_ms": self.__thread_time_by_name.get(name, 0.0) * 1000,
+                    "steps": self.__steps_by_name.get(name, 0)
+                }
+                for name in self.__time_by_name
+            }
+        }
+
+    def submit(
+            self,
+            generator: Generator,
+            name: Optional[str] = None,
+            priority: TaskPriority = TaskPriority.NORMAL,
+            on_done: Optional[Callable[[Any], None]] = None,
+            on_error: Optional[Callable[[Exception], None]] = None
+    ) -> ScheduledTask:
+        """
+        Поставить задачу в очередь.
+
+        Args:
+            generator: Генератор задачи; его возвращаемое значение передаётся в on_done
+            name: Имя задачи для счётчиков (опционально)
+            priority: Приоритет
+            on_done: Обработчик результата (опционально)
+            on_error: Обработчик ошибки (опционально)
+
+        Returns:
+            Задача, которую можно отменить
+        """
+
+        task = ScheduledTask(next(self.__ids), name or "task", priority, generator, on_done, on_error)
+
+        if self.__closed:
+            task.cancel()
+
+            return task
+
+        self.__push(task)
+
+        return task
+
+    def offload(
+            self,
+            function: Callable,
+            *args,
+            name: Optional[str] = None,
+            priority: TaskPriority = TaskPriority.NORMAL,
+            on_done: Optional[Callable[[Any], None]] = None,
+            on_error: Optional[Callable[[Exception], None]] = None
+    ) -> ScheduledTask:
+        """Выполнить функцию в пуле потоков и передать результат в on_done в потоке интерфейса."""
+
+        def run():
+            return (yield Offload(function, *args))
+
+        return self.submit(run(), name or getattr(function, "__name__", None), priority, on_done, on_error)
+
+    def shutdown(self):
+        """Отменить все задачи и остановить пул потоков."""
+
+        self.__closed = True
+
+        for job in (self.__tick_job, self.__poll_job):
+            if job is not None:
+                try:
+                    self.__root.after_cancel(job)
+                except Exception:
+                    pass
+
+        self.__tick_job = None
+        self.__poll_job = None
+
+        for _, _, task in self.__ready:
+            task.cancel()
+
+        for task in self.__waiting.values():
+            task.cancel()
+
+        self.__ready.clear()
+        self.__waiting.clear()
+
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+
+            self.__executor = None
+
+    def __push(self, task: ScheduledTask):
+        heapq.heappush(self.__ready, (task.priority, next(self.__sequence), task))
+
+        if self.__tick_job is None:
+            self.__tick_job = self.__root.after_idle(self.__tick)
+
+    def __tick(self):
+        """Выполнять шаги задач, пока не исчерпан бюджет времени."""
+
+        self.__tick_job = None
+
+        deadline = perf_counter() + self.__budget
+
+        while self.__ready and perf_counter() < deadline:
+            _, _, task = heapq.heappop(self.__ready)
+
+            if not task.cancelled:
+                self.__run_step(task)
+
+        if self.__ready and self.__tick_job is None and not self.__closed:
+            self.__tick_job = self.__root.after_idle(self.__tick)
+
+    def __run_step(self, task: ScheduledTask):
+        started_time = task.time_spent
+
+        try:
+            item = task._step()
+        except StopIteration as stop:
+            self.__account(task, started_time)
+            self.__finish(task, stop.value)
+
+            return
+        except Exception as ex:
+            self.__account(task, started_time)
+            self.__finish(task, error=ex)
+
+            return
+
+        self.__account(task, started_time)
+
+        if task.cancelled:
+            return
+
+        if isinstance(item, Offload):
+            self.__submit_offload(task, item)
+        else:
+            self.__push(task)
+
+    def __account(self, task: ScheduledTask, started_time: float):
+        name = task.name
+
+        self.__time_by_name[name] = self.__time_by_name.get(name, 0.0) + task.time_spent - started_time
+        self.__steps_by_name[name] = self.__steps_by_name.get(name, 0) + 1
+
+    def __finish(self, task: ScheduledTask, result: Any = None, error: Optional[Exception] = None):
+        self.__completed += 1
+
+        if error is not None:
+            ERRORS_TASK.inc()
+
+        try:
+            handled = task._finish(result, error)
+        except Exception:
+            self.__root.report_callback_exception(*sys.exc_info())
+
+            return
+
+        if not handled:
+            self.__root.report_callback_exception(type(error), error, error.__traceback__)
+
+    def __submit_offload(self, task: ScheduledTask, item: Offload):
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.__workers, thread_name_prefix="scheduler")
+
+        self.__waiting[task.id] = task
+
+        future = self.__executor.submit(item.run)
+        future.add_done_callback(lambda done: self.__results.put((task, done)))
+
+        if self.__poll_job is None:
+            self.__poll_job = self.__root.after(self.__poll_ms, self.__poll)
+
+    def __poll(self):
+        """Забрать результаты пула потоков и вернуть задачи в очередь."""
+
+        self.__poll_job = None
+
+        while True:
+            try:
+                task, future = self.__results.get_nowait()
+            except queue.Empty:
+                break
+
+            self.__resume(task, future)
+
+        if self.__waiting and not self.__closed:
+            self.__poll_job = self.__root.after(self.__poll_ms, self.__poll)
+
+    def __resume(self, task: ScheduledTask, future: Future):
+        self.__waiting.pop(task.id, None)
+
+        if task.cancelled or future.cancelled():
+            return
+
+        error = future.exception()
+
+        if error is not None:
+            task._resume_with(error=error)
+        else:
+            result, thread_time = future.result()
+
+            task._resume_with(result, thread_time=thread_time)
+
+            self.__thread_time_by_name[task.name] = self.__thread_time_by_name.get(task.name, 0.0) + thread_time
+
+        self.__push(task)
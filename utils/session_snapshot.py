@@ -0,0 +1,197 @@
+import json
+import struct
+from array import array
+from pathlib import Path
+from typing import Any, Optional
+
+from errors import FileSuffixError, FileReadError, FileWriteError
+from utils.metrics import STORAGE_READ_SECONDS, STORAGE_WRITE_SECONDS, ERRORS_STORAGE, timed
+
+SNAPSHOT_FILE_SUFFIX = ".json"
+SNAPSHOT_TEXT_FILE_SUFFIX = ".bin"
+SNAPSHOT_TEXT_FILE_MAGIC = b"FTTX"
+SNAPSHOT_TEXT_FILE_VERSION = 1
+SNAPSHOT_TEXT_HEADER = "<BII"
+
+SNAPSHOT_KIND_GENERATED = "generated"
+SNAPSHOT_KIND_ENDLESS = "endless"
+SNAPSHOT_KIND_CUSTOM = "custom"
+
+_text_cache: dict[str, tuple[str, array]] = {}
+
+
+def _check_suffix(path: Path, suffix: str):
+    file_suffix = path.suffix.lower()
+
+    if file_suffix != suffix:
+        raise FileSuffixError(suffix, file_suffix)
+
+
+@timed(STORAGE_WRITE_SECONDS, ERRORS_STORAGE)
+def save_snapshot(path: str, snapshot: dict[str, Any]):
+    """
+    Сохраняет снимок состояния тренажёра в файл .JSON (файл перезаписывается целиком).
+
+    Args:
+        path: Путь к файлу
+        snapshot: Снимок состояния
+
+    Raises:
+        FileSuffixError: Неверное расширение файла
+        FileWriteError: Ошибка при записи в файл
+    """
+
+    path = Path(path)
+
+    _check_suffix(path, SNAPSHOT_FILE_SUFFIX)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, ensure_ascii=False)
+    except (PermissionError, OSError) as ex:
+        raise FileWriteError(str(path.absolute()), str(ex))
+
+
+@timed(STORAGE_READ_SECONDS, ERRORS_STORAGE)
+def load_snapshot(path: str) -> Optional[dict[str, Any]]:
+    """
+    Загружает снимок состояния тренажёра.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Снимок состояния или None, если файла нет
+
+    Raises:
+        FileSuffixError: Неверное расширение файла
+        FileReadError: Ошибка при чтении файла или неверный формат
+    """
+
+    path = Path(path)
+
+    _check_suffix(path, SNAPSHOT_FILE_SUFFIX)
+
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (PermissionError, OSError, ValueError) as ex:
+        raise FileReadError(str(path.absolute()), str(ex))
+
+
+def clear_snapshot(path: str):
+    """Удаляет снимок состояния, если он есть."""
+
+    try:
+        Path(path).unlink(missing_ok=True)
+    except (PermissionError, OSError) as ex:
+        raise FileWriteError(str(Path(path).absolute()), str(ex))
+
+
+@timed(STORAGE_WRITE_SECONDS, ERRORS_STORAGE)
+def save_snapshot_text(path: str, text_id: str, text: str, offsets: array):
+    """
+    Сохраняет исходный текст снимка вместе с готовым массивом смещений строк,
+    чтобы при восстановлении текст не приходилось заново разбирать и делить на строки.
+    Если текст с таким идентификатором уже сохранён в этом процессе, файл не перезаписывается.
+
+    Args:
+        path: Путь к файлу
+        text_id: Идентификатор текста
+        text: Текст
+        offsets: Массив смещений строк
+
+    Raises:
+        FileSuffixError: Неверное расширение файла
+        FileWriteError: Ошибка при записи в файл
+    """
+
+    path = Path(path)
+
+    _check_suffix(path, SNAPSHOT_TEXT_FILE_SUFFIX)
+
+    cached = _text_cache.get(text_id)
+
+    if cached is not None and cached[0] is text and path.exists():
+        return
+
+    encoded_id = text_id.encode("utf-8")
+    encoded_text = text.encode("utf-8")
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "wb") as file:
+            file.write(SNAPSHOT_TEXT_FILE_MAGIC)
+            file.write(struct.pack(SNAPSHOT_TEXT_HEADER, SNAPSHOT_TEXT_FILE_VERSION, len(encoded_id), len(offsets)))
+            file.write(encoded_id)
+            file.write(offsets.tobytes())
+            file.write(encoded_text)
+    except (PermissionError, OSError) as ex:
+        raise FileWriteError(str(path.absolute()), str(ex))
+
+    _text_cache.clear()
+    _text_cache[text_id] = (text, offsets)
+
+
+@timed(STORAGE_READ_SECONDS, ERRORS_STORAGE)
+def load_snapshot_text(path: str, text_id: str) -> Optional[tuple[str, array]]:
+    """
+    Загружает исходный текст снимка. Текст, сохранённый или загруженный в этом процессе, берётся из памяти.
+
+    Args:
+        path: Путь к файлу
+        text_id: Ожидаемый идентификатор текста
+
+    Returns:
+        Текст и массив смещений строк или None, если сохранён другой текст или файла нет
+
+    Raises:
+        FileSuffixError: Неверное расширение файла
+        FileReadError: Ошибка при чтении файла или неверный формат
+    """
+
+    cached = _text_cache.get(text_id)
+
+    if cached is not None:
+        return cached
+
+    path = Path(path)
+
+    _check_suffix(path, SNAPSHOT_TEXT_FILE_SUFFIX)
+
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, "rb") as file:
+            if file.read(len(SNAPSHOT_TEXT_FILE_MAGIC)) != SNAPSHOT_TEXT_FILE_MAGIC:
+                raise ValueError("Неверная сигнатура файла текста.")
+
+            version, id_len, offsets_count = struct.unpack(
+                SNAPSHOT_TEXT_HEADER,
+                file.read(struct.calcsize(SNAPSHOT_TEXT_HEADER))
+            )
+
+            if version != SNAPSHOT_TEXT_FILE_VERSION:
+                raise ValueError("Неподдерживаемая версия файла текста.")
+
+            if file.read(id_len).decode("utf-8") != text_id:
+                return None
+
+            offsets = array("I")
+            offsets.frombytes(file.read(offsets_count * offsets.itemsize))
+
+            text = file.read().decode("utf-8")
+    except (PermissionError, OSError, ValueError, struct.error) as ex:
+        raise FileReadError(str(path.absolute()), str(ex))
+
+    _text_cache.clear()
+    _text_cache[text_id] = (text, offsets)
+
+    return text, offsets
@@ -0,0 +1,218 @@
+import math
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Callable, Optional
+
+
+class SchemaField(ABC):
+    """Поле схемы настроек: приводит сырое значение из файла к допустимому или возвращает значение по умолчанию."""
+
+    def __init__(self, default: Any):
+        self._default = default
+
+    @property
+    def default(self) -> Any:
+        return self._default
+
+    @abstractmethod
+    def validate(self, value: Any) -> Any:
+        """
+        Проверить значение. Никогда не выбрасывает исключений: неверное значение заменяется значением по умолчанию.
+
+        Args:
+            value: Сырое значение
+        """
+
+        pass
+
+    def dump(self, value: Any) -> Any:
+        """Значение в виде, пригодном для записи в .JSON."""
+
+        return value
+
+
+class EnumField(SchemaField):
+    """Поле-перечисление. Таблица значение -> элемент строится один раз, поэтому проверка - поиск в словаре."""
+
+    def __init__(self, enum_class: type[Enum], default: Enum):
+        super().__init__(default)
+
+        self.__lookup: dict[Any, Enum] = {}
+
+        for member in enum_class:
+            self.__lookup[member.value] = member
+
+            if isinstance(member.value, str):
+                self.__lookup[member.value.lower()] = member
+
+    def lookup(self, value: Any) -> Optional[Enum]:
+        """
+        Элемент перечисления по значению.
+
+        Returns:
+            Элемент или None, если значение недопустимо
+        """
+
+        if not isinstance(value, str):
+            return None
+
+        member = self.__lookup.get(value)
+
+        if member is None:
+            member = self.__lookup.get(value.lower())
+
+        return member
+
+    def validate(self, value: Any) -> Enum:
+        member = self.lookup(value)
+
+        return self._default if member is None else member
+
+    def dump(self, value: Enum) -> Any:
+        return value.value
+
+
+class IntRangeField(SchemaField):
+    """Целое число в диапазоне; значения за границами прижимаются к ним."""
+
+    def __init__(self, min_value: int, max_value: int, default: int):
+        super().__init__(default)
+
+        self.__min_value = min_value
+        self.__max_value = max_value
+
+    def validate(self, value: Any) -> int:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return self._default
+
+        if isinstance(value, float) and not math.isfinite(value):
+            return self._default
+
+        return min(max(int(value), self.__min_value), self.__max_value)
+
+
+class BoolField(SchemaField):
+    def validate(self, value: Any) -> bool:
+        return value if isinstance(value, bool) else self._default
+
+
+class GroupField(SchemaField):
+    """Вложенная группа полей (словарь в файле настроек)."""
+
+    def __init__(self, fields: dict[str, SchemaField]):
+        super().__init__({name: field.default for name, field in fields.items()})
+
+        self.__fields = fields
+
+    @property
+    def fields(self) -> dict[str, SchemaField]:
+        return self.__fields
+
+    def validate(self, value: Any) -> dict[str, Any]:
+        if not isinstance(value, dict):
+            value = {}
+
+        return {name: field.validate(value.get(name)) for name, field in self.__fields.items()}
+
+    def dump(self, value: dict[str, Any]) -> dict[str, Any]:
+        return {name: field.dump(value[name]) for name, field in self.__fields.items()}
+
+
+class SettingsSchema:
+    """
+    Схема настроек.
+    Описывается декларативно и компилируется один раз в список пар (ключ, проверка поля); проверка всего словаря -
+    один проход по полям. Устаревшие форматы файла поднимаются до текущей версии цепочкой миграций.
+    """
+
+    def __init__(
+            self,
+            fields: dict[str, SchemaField],
+            version: int,
+            version_key: str,
+            migrations: Optional[dict[int, Callable[[dict[str, Any]], dict[str, Any]]]] = None
+    ):
+        """
+        Args:
+            fields: Поля схемы
+            version: Текущая версия формата
+            version_key: Ключ версии в файле
+            migrations: Миграции: версия N -> функция, переводящая данные версии N в N + 1 (опционально)
+        """
+
+        self.__fields = fields
+        self.__version = version
+        self.__version_key = version_key
+        self.__migrations = migrations or {}
+
+        self.__compiled: tuple[tuple[str, Callable[[Any], Any]], ...] = tuple(
+            (name, field.validate) for name, field in fields.items()
+        )
+
+    @property
+    def version(self) -> int:
+        return self.__version
+
+    def field(self, name: str) -> SchemaField:
+        return self.__fields[name]
+
+    @property
+    def defaults(self) -> dict[str, Any]:
+        return {name: field.default for name, field in self.__fields.items()}
+
+    def migrate(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Поднять данные до текущей версии. Файлы без ключа версии считаются версией 1; версия без миграции
+        только получает ключ версии, данные не меняются.
+
+        Args:
+            data: Сырые данные
+        """
+
+        version = data.get(self.__version_key, 1)
+
+        if isinstance(version, bool) or not isinstance(version, int):
+            version = 1
+
+        data = dict(data)
+
+        while version < self.__version:
+            migration = self.__migrations.get(version)
+
+            if migration is not None:
+                data = migration(data)
+
+            version += 1
+
+        data[self.__version_key] = self.__version
+
+        return data
+
+    def validate(self, data: Any) -> dict[str, Any]:
+        """
+        Проверить все поля за один проход. Каждое неверное поле заменяется значением по умолчанию,
+        остальные сохраняются.
+
+        Args:
+            data: Сырые данные настроек
+
+        Returns:
+            Проверенные значения всех полей
+        """
+
+        if not isinstance(data, dict):
+            data = {}
+        else:
+            data = self.migrate(data)
+
+        get = data.get
+
+        return {name: validate(get(name)) for name, validate in self.__compiled}
+
+    def dump(self, values: dict[str, Any]) -> dict[str, Any]:
+        """Проверенные значения в виде для записи в .JSON (с ключом версии)."""
+
+        result = {name: field.dump(values[name]) for name, field in self.__fields.items()}
+        result[self.__version_key] = self.__version
+
+        return result
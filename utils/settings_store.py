@@ -0,0 +1,99 @@
+import itertools
+from typing import Any, Callable, Iterable
+
+from enums.settings import SettingsParam, Challenges
+from settings import Settings
+
+OBSERVABLE_FIELDS = (
+    SettingsParam.LANGUAGE.value,
+    SettingsParam.DIFFICULTY.value,
+    SettingsParam.THEME_MODE.value,
+    SettingsParam.FONT_SIZE.value,
+    SettingsParam.RENDERER.value,
+    Challenges.ON_TIME.value,
+    Challenges.ENDLESS.value
+)
+
+
+class SettingsStore:
+    """
+    Текущие настройки приложения с подпиской на изменения.
+    Подписчик указывает интересующие его поля и при замене настроек получает только изменившиеся из них,
+    поэтому может применить изменение на месте, не пересобирая себя целиком.
+    """
+
+    def __init__(self, settings: Settings):
+        self.__settings = settings
+
+        self.__ids = itertools.count(1)
+        self.__subscribers: dict[int, tuple[frozenset[str], Callable[[dict[str, Any]], None]]] = {}
+
+    @property
+    def settings(self) -> Settings:
+        return self.__settings
+
+    def subscribe(self, fields: Iterable[str], callback: Callable[[dict[str, Any]], None]) -> int:
+        """
+        Подписаться на изменение полей настроек.
+
+        Args:
+            fields: Имена полей (из OBSERVABLE_FIELDS)
+            callback: Обработчик; получает словарь "поле - новое значение" только с изменившимися полями
+
+        Returns:
+            Идентификатор подписки
+
+        Raises:
+            ValueError: Неизвестное поле
+        """
+
+        fields = frozenset(fields)
+
+        unknown = fields.difference(OBSERVABLE_FIELDS)
+
+        if unknown:
+            raise ValueError(f"Неизвестные поля настроек: {', '.join(sorted(unknown))}.")
+
+        subscription_id = next(self.__ids)
+
+        self.__subscribers[subscription_id] = (fields, callback)
+
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int):
+        self.__subscribers.pop(subscription_id, None)
+
+    def update(self, settings: Settings) -> dict[str, Any]:
+        """
+        Заменить настройки и оповестить подписчиков об изменившихся полях.
+
+        Args:
+            settings: Новые настройки
+
+        Returns:
+            Изменившиеся поля с новыми значениями
+        """
+
+        previous = self.__settings
+
+        self.__settings = settings
+
+        changed = {
+            field: getattr(settings, field)
+            for field in OBSERVABLE_FIELDS
+            if getattr(settings, field) != getattr(previous, field)
+        }
+
+        if not changed:
+            return changed
+
+        for subscription_id, (fields, callback) in list(self.__subscribers.items()):
+            if subscription_id not in self.__subscribers:
+                continue
+
+            delta = {field: value for field, value in changed.items() if field in fields}
+
+            if delta:
+                callback(delta)
+
+        return changed
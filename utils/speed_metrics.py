@@ -0,0 +1,207 @@
+from array import array
+from time import perf_counter
+from typing import Optional
+
+from config import SPEED_BUCKET_SECONDS, SPEED_INSTANT_WINDOW_SECONDS, SPEED_ROLLING_WINDOW_SECONDS
+
+CHARS_PER_WORD = 5
+MIN_WINDOW_SECONDS = 1.0
+
+
+class SpeedMeter:
+    """
+    Скорость печати в реальном времени.
+    Верные символы складываются в кольцо временных корзин; суммы за короткое и длинное окно
+    поддерживаются вычитанием выбывающих корзин, поэтому каждое обновление и каждый запрос - O(1).
+    """
+
+    def __init__(
+            self,
+            bucket_seconds: float = SPEED_BUCKET_SECONDS,
+            instant_window: float = SPEED_INSTANT_WINDOW_SECONDS,
+            rolling_window: float = SPEED_ROLLING_WINDOW_SECONDS
+    ):
+        self.__bucket_seconds = bucket_seconds
+        self.__instant_buckets = max(1, round(instant_window / bucket_seconds))
+        self.__rolling_buckets = max(self.__instant_buckets, round(rolling_window / bucket_seconds))
+
+        self.__ring = array("i", bytes(4 * self.__rolling_buckets))
+
+        self.__started: Optional[float] = None
+        self.__bucket = 0
+        self.__instant_sum = 0
+        self.__rolling_sum = 0
+
+        self.__total_correct = 0
+        self.__total_typed = 0
+        self.__total_errors = 0
+
+    def reset(self):
+        ring = self.__ring
+
+        for index in range(len(ring)):
+            ring[index] = 0
+
+        self.__started = None
+        self.__bucket = 0
+        self.__instant_sum = 0
+        self.__rolling_sum = 0
+
+        self.__total_correct = 0
+        self.__total_typed = 0
+        self.__total_errors = 0
+
+    def restore(self, total_correct: int, total_typed: int, total_errors: int):
+        """
+        Восстановить накопленные за сессию счётчики. Окна скорости начинаются заново.
+
+        Args:
+            total_correct: Количество верных символов
+            total_typed: Количество введённых символов
+            total_errors: Количество ошибок
+        """
+
+        self.__total_correct = total_correct
+        self.__total_typed = total_typed
+        self.__total_errors = total_errors
+
+    @property
+    def started(self) -> bool:
+        return self.__started is not None
+
+    @property
+    def total_correct(self) -> int:
+        return self.__total_correct
+
+    @property
+    def total_typed(self) -> int:
+        return self.__total_typed
+
+    @property
+    def total_errors(self) -> int:
+        return self.__total_errors
+
+    def start(self, now: Optional[float] = None):
+        if self.__started is None:
+            self.__started = perf_counter() if now is None else now
+
+    def add(self, correct: int, typed: int = 0, errors: int = 0, now: Optional[float] = None):
+        """
+        Учесть изменение ввода.
+
+        Args:
+            correct: Изменение количества верных символов (отрицательное при удалении верных символов)
+            typed: Количество введённых символов
+            errors: Количество ошибочно введённых символов
+            now: Время perf_counter (опционально)
+        """
+
+        if now is None:
+            now = perf_counter()
+
+        if self.__started is None:
+            self.__started = now
+
+        self.__advance(now)
+
+        self.__ring[self.__bucket % len(self.__ring)] += correct
+        self.__instant_sum += correct
+        self.__rolling_sum += correct
+
+        self.__total_correct += correct
+        self.__total_typed += typed
+        self.__total_errors += errors
+
+    def __advance(self, now: float):
+        """Сдвинуть кольцо до корзины текущего момента, обнулив выбывающие корзины."""
+
+        target = int((now - self.__started) / self.__bucket_seconds)
+        steps = target - self.__bucket
+
+        if steps <= 0:
+            return
+
+        ring = self.__ring
+        size = len(ring)
+
+        if steps >= size:
+            for index in range(size):
+                ring[index] = 0
+
+            self.__instant_sum = 0
+            self.__rolling_sum = 0
+            self.__bucket = target
+
+            return
+
+        instant_buckets = self.__instant_buckets
+
+        for _ in range(steps):
+            self.__bucket += 1
+
+            slot = self.__bucket % size
+
+            self.__instant_sum -= ring[(self.__bucket - instant_buckets) % size]
+            self.__rolling_sum -= ring[slot]
+
+            ring[slot] = 0
+
+    def elapsed(self, now: Optional[float] = None) -> float:
+        if self.__started is None:
+            return 0.0
+
+        return (perf_counter() if now is None else now) - self.__started
+
+    def __window_cpm(self, instant: bool, now: Optional[float]) -> int:
+        if self.__started is None:
+            return 0
+
+        if now is None:
+            now = perf_counter()
+
+        self.__advance(now)
+
+        if instant:
+            window_sum, window_buckets = self.__instant_sum, self.__instant_buckets
+        else:
+            window_sum, window_buckets = self.__rolling_sum, self.__rolling_buckets
+
+        window_seconds = min(window_buckets * self.__bucket_seconds, self.elapsed(now))
+
+        return max(0, int(window_sum / max(window_seconds, MIN_WINDOW_SECONDS) * 60))
+
+    def instant_cpm(self, now: Optional[float] = None) -> int:
+        """Скорость за последние SPEED_INSTANT_WINDOW_SECONDS секунд."""
+
+        return self.__window_cpm(True, now)
+
+    def rolling_cpm(self, now: Optional[float] = None) -> int:
+        """Скорость за последние SPEED_ROLLING_WINDOW_SECONDS секунд."""
+
+        return self.__window_cpm(False, now)
+
+    def session_cpm(self, elapsed: Optional[float] = None) -> int:
+        """
+        Средняя скорость за сессию.
+
+        Args:
+            elapsed: Длительность сессии в секундах (опционально, по умолчанию - время с первого ввода)
+        """
+
+        if elapsed is None:
+            elapsed = self.elapsed()
+
+        return max(0, int(self.__total_correct / max(elapsed, MIN_WINDOW_SECONDS) * 60))
+
+    @staticmethod
+    def wpm(cpm: int) -> int:
+        return int(cpm / CHARS_PER_WORD)
+
+    @property
+    def accuracy(self) -> float:
+        """Доля верно введённых символов в процентах."""
+
+        if not self.__total_typed:
+            return 100.0
+
+        return (self.__total_typed - self.__total_errors) / self.__total_typed * 100
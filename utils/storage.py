@@ -4,8 +4,10 @@ from typing import Any, Optional
 
 from config import DEFAULT_JSON_INDENT
 from errors import FileReadError, FileWriteError, FileSuffixError
+from utils.metrics import STORAGE_READ_SECONDS, STORAGE_WRITE_SECONDS, ERRORS_STORAGE, timed
 
 
+@timed(STORAGE_READ_SECONDS, ERRORS_STORAGE)
 def load_txt(path: str, default_data: Optional[str] = None) -> str:
     """
     Загружает данные из файла .TXT.
@@ -93,6 +95,7 @@ def merge_dicts(source: dict, update: dict) -> Optional[dict]:
             source[key] = value
 
 
+@timed(STORAGE_READ_SECONDS, ERRORS_STORAGE)
 def load_json(path: str, default_data: Optional[dict[str, Any]] = None) -> dict[str, Any]:
     """
     Загружает данные из файла .JSON.
@@ -136,6 +139,7 @@ def load_json(path: str, default_data: Optional[dict[str, Any]] = None) -> dict[
         raise FileReadError(str(path.absolute()), str(ex))
 
 
+@timed(STORAGE_WRITE_SECONDS, ERRORS_STORAGE)
 def save_json(path: str, data: dict[str, Any], indent: int = DEFAULT_JSON_INDENT):
     """
     Сохраняет данные в файл .JSON, не трогая другие данные.
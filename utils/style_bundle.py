@@ -0,0 +1,120 @@
+from typing import Any, Callable, Optional
+
+from enums.theme_mode import ThemeMode
+
+STYLE_THEMES_KEY = "themes"
+STYLE_MAP_KEY = "map"
+STYLE_FONT_KEY = "font"
+
+StyleEntry = tuple[str, dict[str, Any], dict[str, list[tuple]]]
+
+
+def compile_style_entries(
+        data: dict[str, Any],
+        theme_mode: ThemeMode,
+        resolve_font: Optional[Callable[[Any], Any]] = None
+) -> list[StyleEntry]:
+    """
+    Собирает готовые вызовы style.configure/style.map из данных файла стилей для выбранной темы.
+
+    Формат файла: {"Имя.TStyle": {параметры, "map": {"параметр": [["состояние", ..., "значение"], ...]}}, ...}.
+    Необязательный ключ "themes" содержит варианты для тем: {"dark": {стили}, "light": {стили}};
+    параметры варианта дополняют и переопределяют общие.
+
+    Args:
+        data: Данные файла стилей
+        theme_mode: Тема
+        resolve_font: Функция, превращающая описание шрифта в объект шрифта (опционально)
+
+    Returns:
+        Список (имя стиля, параметры configure, параметры map)
+    """
+
+    merged: dict[str, dict[str, Any]] = {}
+
+    variants = data.get(STYLE_THEMES_KEY)
+    variant = variants.get(theme_mode.value) if isinstance(variants, dict) else None
+
+    for source in (data, variant or {}):
+        for style_name, params in source.items():
+            if style_name == STYLE_THEMES_KEY or not isinstance(params, dict):
+                continue
+
+            target = merged.setdefault(style_name, {})
+
+            for key, value in params.items():
+                if key == STYLE_MAP_KEY and isinstance(value, dict):
+                    target.setdefault(STYLE_MAP_KEY, {}).update(value)
+                else:
+                    target[key] = value
+
+    entries = []
+
+    for style_name, params in merged.items():
+        style_map = params.pop(STYLE_MAP_KEY, {})
+
+        if resolve_font is not None and STYLE_FONT_KEY in params:
+            try:
+                params[STYLE_FONT_KEY] = resolve_font(params[STYLE_FONT_KEY])
+            except ValueError:
+                pass
+
+        entries.append((
+            style_name,
+            params,
+            {option: [tuple(state_spec) for state_spec in specs] for option, specs in style_map.items()}
+        ))
+
+    return entries
+
+
+class StyleBundle:
+    """
+    Стили одной темы, собранные заранее из всех файлов стилей.
+    Применение - это только вызовы style.configure/style.map без чтения и разбора файлов.
+    """
+
+    def __init__(self, theme_mode: ThemeMode):
+        self.__theme_mode = theme_mode
+
+        self.__parts: dict[str, list[StyleEntry]] = {}
+
+    @property
+    def theme_mode(self) -> ThemeMode:
+        return self.__theme_mode
+
+    def has(self, source: str) -> bool:
+        return source in self.__parts
+
+    def add(self, source: str, entries: list[StyleEntry]):
+        """
+        Добавить (или заменить) стили одного файла.
+
+        Args:
+            source: Путь к файлу стилей
+            entries: Скомпилированные стили файла
+        """
+
+        self.__parts[source] = entries
+
+    def remove(self, source: str):
+        self.__parts.pop(source, None)
+
+    def apply(self, style, source: Optional[str] = None):
+        """
+        Применить стили.
+
+        Args:
+            style: Стиль ttk
+            source: Путь к файлу, стили которого нужно применить; по умолчанию - все (опционально)
+        """
+
+        parts = self.__parts.values() if source is None else (self.__parts.get(source, ()),)
+
+        for entries in parts:
+            for style_name, params, style_map in entries:
+                if params:
+                    style.configure(style_name, **params)
+
+                if style_map:
+                    style.map(style_name, **style_map)
@@ -1,18 +1,19 @@
+import os
 import re
-from typing import Optional
+from typing import Iterable, Optional, Union
 
 from errors import FileSuffixError, FileReadError
 
 from utils.storage import load_txt
 
 
-def load_text_from_file_with_regex(path: str, regex_pattern: Optional[str] = None) -> list[str]:
+def load_text_from_file_with_regex(path: str, regex_pattern: Optional[Union[str, re.Pattern]] = None) -> list[str]:
     """
     Получает данные из файла прогоняет их через регулярное выражение.
 
     Args:
         path: Путь к файлу
-        regex_pattern: Паттерн регулярного выражения (опционально)
+        regex_pattern: Паттерн или скомпилированное регулярное выражение (опционально)
 
     Raises:
         FileSuffixError: Неверное расширение файла данных
@@ -25,4 +26,33 @@ def load_text_from_file_with_regex(path: str, regex_pattern: Optional[str] = Non
     except FileReadError:
         raise
 
-    return re.findall(re.compile(regex_pattern), text)
+    if isinstance(regex_pattern, re.Pattern):
+        return regex_pattern.findall(text)
+
+    return re.findall(regex_pattern, text)
+
+
+def get_files_version(paths: Iterable[str]) -> tuple:
+    """
+    Возвращает версию набора файлов, построенную по времени изменения и размеру каждого файла.
+
+    Args:
+        paths: Пути к файлам
+
+    Returns:
+        Кортеж, меняющийся при любом изменении файлов
+    """
+
+    version = []
+
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            version.append((path, None, None))
+
+            continue
+
+        version.append((path, stat.st_mtime_ns, stat.st_size))
+
+    return tuple(version)
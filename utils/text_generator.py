@@ -0,0 +1,576 @@
+import itertools
+import os
+import re
+import random
+from array import array
+from collections import OrderedDict, deque
+from typing import Callable, Iterator, Optional
+
+from enums.settings import Difficulty, Language
+from config import RUSSIAN_WORDS_PATH, ENGLISH_WORDS_PATH, MAX_TEXT_SEED, GENERATED_TEXT_CACHE_SIZE
+from utils.language_profiles import LanguageProfile, get_language_profile
+from utils.text_files import load_text_from_file_with_regex, get_files_version
+
+CORPUS_PATHS = (RUSSIAN_WORDS_PATH, ENGLISH_WORDS_PATH)
+
+MULTIPLE_SPACES_REGEX = re.compile(" {2,}")
+
+_generated_text_cache: OrderedDict[tuple, tuple[str, array]] = OrderedDict()
+
+_words_cache: dict[Language, tuple[tuple, list[str]]] = {}
+
+_corpus_file_cache: dict[tuple[str, str], tuple[tuple, list[str]]] = {}
+
+
+def get_corpus_version() -> tuple:
+    """Версия корпусов слов."""
+
+    return get_files_version(CORPUS_PATHS)
+
+
+def _load_corpus_file(path: str, regex: re.Pattern) -> list[str]:
+    """Слова одного файла корпуса; файл перечитывается, только если он изменился."""
+
+    version = get_files_version((path,))
+    key = (path, regex.pattern)
+
+    cached = _corpus_file_cache.get(key)
+
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    words = load_text_from_file_with_regex(path, regex)
+
+    _corpus_file_cache[key] = (version, words)
+
+    return words
+
+
+def load_words(language: Language) -> list[str]:
+    """
+    Загружает слова корпуса языка.
+    С диска перечитываются только изменившиеся файлы корпуса.
+
+    Args:
+        language: Язык
+
+    Returns:
+        Список слов
+
+    Raises:
+        FileSuffixError: Неверное расширение файла данных
+        FileReadError: Ошибка при чтении файла данных
+    """
+
+    profile = get_language_profile(language)
+
+    corpus_version = get_files_version(profile.corpus_paths)
+
+    cached = _words_cache.get(language)
+
+    if cached is not None and cached[0] == corpus_version:
+        return cached[1]
+
+    words = []
+
+    for path, regex in profile.corpora:
+        words += _load_corpus_file(path, regex)
+
+    _words_cache[language] = (corpus_version, words)
+
+    return words
+
+
+def reindex_corpus(path: str) -> list[Language]:
+    """
+    Переиндексирует изменившийся файл корпуса для всех языков, которые его используют.
+
+    Args:
+        path: Путь к файлу корпуса
+
+    Returns:
+        Языки, корпус которых был переиндексирован
+
+    Raises:
+        FileSuffixError: Неверное расширение файла данных
+        FileReadError: Ошибка при чтении файла данных
+    """
+
+    path = os.path.normpath(path)
+
+    languages = [
+        language
+        for language in Language
+        if any(os.path.normpath(corpus_path) == path for corpus_path in get_language_profile(language).corpus_paths)
+    ]
+
+    for language in languages:
+        load_words(language)
+
+    return languages
+
+
+class TextGenerator:
+    """Тренажёр."""
+
+    def __init__(
+            self,
+            language: Language,
+            text: Optional[str] = None,
+            max_len: Optional[int] = 50,
+            symbols: bool = False,
+            letters: bool = False,
+            register: bool = False,
+            seed: Optional[int] = None,
+            tokenized: bool = False
+    ):
+        if seed is None:
+            seed = random.randrange(MAX_TEXT_SEED)
+
+        self.__language = language
+        self.__profile: LanguageProfile = get_language_profile(language)
+        self.__text = text
+        self.__max_len = max_len
+        self.__symbols = symbols
+        self.__letters = letters
+        self.__register = register
+        self.__seed = seed
+        self.__tokenized = tokenized
+        self.__random = random.Random(seed)
+        self.__result: Optional[tuple[str, array]] = None
+
+    @classmethod
+    def from_difficulty(
+            cls,
+            language: Language,
+            difficulty: Difficulty,
+            text: Optional[str] = None,
+            max_len: Optional[int] = 50,
+            seed: Optional[int] = None,
+            tokenized: bool = False
+    ) -> "TextGenerator":
+        """
+        Создаёт генератор с усложнениями, соответствующими сложности.
+
+        Args:
+            language: Язык текста
+            difficulty: Сложность
+            text: Исходный текст (опционально)
+            max_len: Максимальная длина строки (опционально)
+            seed: Сид генерации (опционально)
+            tokenized: Исходный текст уже состоит из слов языка, разделённых пробелом
+        """
+
+        return cls(
+            language,
+            text,
+            max_len=max_len,
+            symbols=difficulty in [Difficulty.HARD, Difficulty.INSANE],
+            letters=difficulty in [Difficulty.HARD, Difficulty.INSANE],
+            register=difficulty in [Difficulty.NORMAL, Difficulty.INSANE],
+            seed=seed,
+            tokenized=tokenized
+        )
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    @property
+    def text(self) -> list[str]:
+        text, offsets = self.generate()
+
+        return [text[offsets[i]:offsets[i + 1]] for i in range(0, len(offsets), 2)]
+
+    @property
+    def swapper(self) -> "TextSwapper":
+        text, offsets = self.generate()
+
+        return TextSwapper(text, offsets)
+
+    def generate(self) -> tuple[str, array]:
+        """
+        Генерирует текст и разбивает его на строки.
+
+        Returns:
+            Текст и массив смещений строк вида [начало, конец, начало, конец, ...]
+        """
+
+        if self.__result is not None:
+            return self.__result
+
+        if not self.__text:
+            cache_key = self.__cache_key()
+
+            cached = _generated_text_cache.get(cache_key)
+
+            if cached is not None:
+                _generated_text_cache.move_to_end(cache_key)
+
+                self.__result = cached
+
+                return cached
+
+            self.__result = self.__build_text()
+
+            _generated_text_cache[cache_key] = self.__result
+
+            if len(_generated_text_cache) > GENERATED_TEXT_CACHE_SIZE:
+                _generated_text_cache.popitem(last=False)
+
+            return self.__result
+
+        self.__result = self.__build_text()
+
+        return self.__result
+
+    @classmethod
+    def endless_swapper(
+            cls,
+            language: Language,
+            difficulty: Difficulty,
+            max_len: Optional[int] = 50,
+            seed: Optional[int] = None,
+            line: int = 0,
+            index: int = 0
+    ) -> "EndlessTextSwapper":
+        """
+        Бесконечный текст: тексты генерируются по очереди с сидами seed, seed + 1, ...
+
+        Args:
+            language: Язык текста
+            difficulty: Сложность
+            max_len: Максимальная длина строки (опционально)
+            seed: Начальный сид (опционально)
+            line: Номер строки первого текста, с которой начать
+            index: Количество уже пройденных строк
+        """
+
+        if seed is None:
+            seed = random.randrange(MAX_TEXT_SEED)
+
+        return EndlessTextSwapper(
+            lambda text_seed: cls.from_difficulty(language, difficulty, max_len=max_len, seed=text_seed).swapper,
+            seed,
+            line,
+            index
+        )
+
+    def __cache_key(self) -> tuple:
+        """Ключ кэша сгенерированных текстов."""
+
+        corpus_version = get_corpus_version()
+
+        return (
+            corpus_version,
+            self.__language,
+            self.__symbols,
+            self.__letters,
+            self.__register,
+            self.__seed,
+            self.__max_len
+        )
+
+    def __build_text(self) -> tuple[str, array]:
+        if not self.__text:
+            self.generate_text()
+        elif not self.__tokenized:
+            self.__text = " ".join(self.__profile.regex.findall(self.__text))
+
+        if self.__symbols:
+            self.__generate_symbols()
+
+        if self.__register:
+            self.__generate_register()
+
+        self.__text = MULTIPLE_SPACES_REGEX.sub(" ", self.__text)
+
+        return self.__text, self.__split_text()
+
+    def generate_text(self):
+        target_len = self.__random.randrange(125, 250)
+
+        if self.__letters:
+            join_symbol = ""
+        else:
+            join_symbol = " "
+
+        words = load_words(self.__language)
+
+        result = []
+        result_len = -1
+
+        while result_len < target_len:
+            word = self.__random.choice(words)
+
+            if self.__letters:
+                word = self.__random.choice(word)
+
+            result.append(word)
+            result_len += len(word) + 1
+
+        result = [r.strip() for r in result]
+
+        self.__text = join_symbol.join(result)
+
+    def __generate_symbols(self):
+        symbols = '!"№;%:?*()'
+        result = []
+
+        for ch in self.__text:
+            result.append(ch)
+            if self.__random.random() < 0.25:
+                for _ in range(self.__random.randint(1, 2)):
+                    result.append(self.__random.choice(symbols))
+
+        self.__text = "".join(result)
+
+    def __generate_register(self):
+        self.__text = "".join(
+            ch.upper() if ch.isalpha() and self.__random.random() < 0.5 else ch.lower()
+            if ch.isalpha() else ch
+            for ch in self.__text
+        )
+
+    def __split_text(self) -> array:
+        text = self.__text
+        text_len = len(text)
+        offsets = array("I")
+        index = 0
+        letter = self.__max_len
+        split_chars = self.__profile.split_chars
+
+        while index < text_len:
+            chunk_end = min(index + letter, text_len)
+            cut_pos = None
+
+            for idx in range(chunk_end - 1, index - 1, -1):
+                if text[idx] in split_chars:
+                    cut_pos = idx + 1
+                    break
+
+            if cut_pos is None:
+                line_start, line_end = index, chunk_end
+            else:
+                line_start, line_end = index, cut_pos
+
+            index = line_end
+
+            while line_start < line_end and text[line_start] == " ":
+                line_start += 1
+
+            while line_end > line_start and text[line_end - 1] == " ":
+                line_end -= 1
+
+            if line_start < line_end:
+                offsets.append(line_start)
+                offsets.append(line_end)
+
+        return offsets
+
+
+class TextSwapper:
+    """
+    Переключатель строк текста.
+    Хранит один исходный текст и массив смещений строк; строка создаётся только когда становится текущей.
+    """
+
+    def __init__(self, text: str, offsets: array):
+        self.__text = text
+        self.__offsets = offsets
+        self.__current_index = 0
+        self.__lines_count = len(offsets) // 2
+        self.__current: Optional[str] = self.__line(0)
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "TextSwapper":
+        """
+        Создаёт переключатель из готового списка строк.
+
+        Args:
+            lines: Строки текста
+        """
+
+        offsets = array("I")
+        position = 0
+
+        for line in lines:
+            offsets.append(position)
+            position += len(line)
+            offsets.append(position)
+            position += 1
+
+        return cls("\n".join(lines), offsets)
+
+    def __line(self, index: int) -> Optional[str]:
+        if index >= self.__lines_count:
+            return None
+
+        return self.__text[self.__offsets[2 * index]:self.__offsets[2 * index + 1]]
+
+    @property
+    def index(self) -> int:
+        return self.__current_index
+
+    @property
+    def source(self) -> tuple[str, array]:
+        """Исходный текст и массив смещений строк."""
+
+        return self.__text, self.__offsets
+
+    def seek(self, index: int):
+        """
+        Перейти к строке без перебора предыдущих.
+
+        Args:
+            index: Номер строки, которую вернёт следующий вызов next
+        """
+
+        self.__current_index = min(max(index, 0), self.__lines_count)
+        self.__current = self.__line(self.__current_index)
+
+    @property
+    def total(self) -> Optional[int]:
+        return self.__lines_count
+
+    @property
+    def chars_count(self) -> Optional[int]:
+        offsets = self.__offsets
+
+        return sum(offsets[i + 1] - offsets[i] for i in range(0, len(offsets), 2))
+
+    @property
+    def current(self) -> Optional[str]:
+        return self.__current
+
+    @property
+    def next(self) -> Optional[str]:
+        line = self.__current
+
+        if line is None:
+            return None
+
+        self.__current_index += 1
+        self.__current = self.__line(self.__current_index)
+
+        return line
+
+    def peek(self, count: int) -> list[str]:
+        """
+        Следующие строки без переключения.
+
+        Args:
+            count: Максимальное количество строк
+        """
+
+        stop = min(self.__current_index + count, self.__lines_count)
+
+        return [self.__line(index) for index in range(self.__current_index, stop)]
+
+    @property
+    def index_decorated(self) -> str:
+        return f"{self.__current_index}/{self.__lines_count}"
+
+
+class EndlessTextSwapper:
+    """
+    Переключатель строк бесконечного текста.
+    Тексты создаются по очереди с сидами seed, seed + 1, ..., а в памяти держатся только строки, показанные заранее.
+    Позиция задаётся сидом текста и номером строки в нём, поэтому продолжить можно с любого места
+    без генерации предыдущих текстов.
+    """
+
+    def __init__(self, make_text: Callable[[int], TextSwapper], seed: int, line: int = 0, index: int = 0):
+        """
+        Args:
+            make_text: Создаёт переключатель текста по сиду
+            seed: Сид первого текста
+            line: Номер строки первого текста, с которой начать
+            index: Количество уже пройденных строк
+        """
+
+        self.__make_text = make_text
+        self.__lines = self.__iterate(seed, line)
+        self.__current_index = index
+        self.__buffer: deque[tuple[int, int, str]] = deque()
+        self.__position: Optional[tuple[int, int]] = None
+
+        self.__fill(1)
+
+    def __iterate(self, seed: int, line: int) -> Iterator[tuple[int, int, str]]:
+        for text_seed in itertools.count(seed):
+            text_seed %= MAX_TEXT_SEED
+
+            text = self.__make_text(text_seed)
+            text.seek(line)
+
+            while True:
+                text_line = text.next
+
+                if text_line is None:
+                    break
+
+                yield text_seed, text.index - 1, text_line
+
+            line = 0
+
+    def __fill(self, count: int):
+        while len(self.__buffer) < count:
+            item = next(self.__lines, None)
+
+            if item is None:
+                return
+
+            self.__buffer.append(item)
+
+    @property
+    def index(self) -> int:
+        return self.__current_index
+
+    @property
+    def total(self) -> Optional[int]:
+        return None
+
+    @property
+    def chars_count(self) -> Optional[int]:
+        return None
+
+    @property
+    def position(self) -> Optional[tuple[int, int]]:
+        """Сид текста и номер строки в нём для последней выданной строки."""
+
+        return self.__position
+
+    @property
+    def current(self) -> Optional[str]:
+        return self.__buffer[0][2] if self.__buffer else None
+
+    @property
+    def next(self) -> Optional[str]:
+        if not self.__buffer:
+            return None
+
+        text_seed, line_index, line = self.__buffer.popleft()
+
+        self.__position = (text_seed, line_index)
+        self.__current_index += 1
+
+        self.__fill(1)
+
+        return line
+
+    def peek(self, count: int) -> list[str]:
+        """
+        Следующие строки без переключения.
+
+        Args:
+            count: Максимальное количество строк
+        """
+
+        self.__fill(count)
+
+        return [line for _, _, line in itertools.islice(self.__buffer, count)]
+
+    @property
+    def index_decorated(self) -> str:
+        return f"{self.__current_index}/∞"
@@ -0,0 +1,173 @@
+import codecs
+import hashlib
+import io
+import os
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+from config import NORMALIZATION_CHUNK_SIZE, NORMALIZED_TEXT_CACHE_SIZE
+from enums.settings import Language
+from errors import FileSuffixError, FileReadError
+from utils.language_profiles import get_language_profile
+
+TYPOGRAPHY_TABLE = str.maketrans({
+    "“": "\"", "”": "\"", "„": "\"", "‟": "\"",
+    "«": "\"", "»": "\"", "″": "\"",
+    "‘": "'", "’": "'", "‚": "'", "‛": "'", "′": "'",
+    "‹": "'", "›": "'",
+    "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-", "―": "-", "−": "-",
+    "\u00a0": " ", "\u2002": " ", "\u2003": " ", "\u2007": " ", "\u2008": " ", "\u2009": " ", "\u200a": " ",
+    "\u202f": " ", "\u3000": " ", "\t": " ",
+    "…": "...",
+    "ﬀ": "ff", "ﬁ": "fi", "ﬂ": "fl", "ﬃ": "ffi", "ﬄ": "ffl", "ﬅ": "st", "ﬆ": "st",
+    "\u00ad": None, "\u200b": None, "\u200c": None, "\u200d": None, "\u2060": None, "\ufeff": None
+})
+
+WHITESPACE_CHARS = (" ", "\n", "\r", "\t", "\u00a0")
+
+_normalized_text_cache: OrderedDict[tuple[str, Language], str] = OrderedDict()
+
+_file_digests: dict[tuple[str, int, int], str] = {}
+
+
+def normalize_chunk(text: str) -> str:
+    """
+    Приводит фрагмент текста к NFC и заменяет типографские символы на их простые аналоги.
+
+    Args:
+        text: Фрагмент текста
+
+    Returns:
+        Нормализованный фрагмент
+    """
+
+    return unicodedata.normalize("NFC", text).translate(TYPOGRAPHY_TABLE)
+
+
+def _check_txt_suffix(path: Path):
+    file_suffix = path.suffix.lower()
+    suffix = ".txt"
+
+    if file_suffix != suffix:
+        raise FileSuffixError(suffix, file_suffix)
+
+
+def get_file_digest(path: str) -> str:
+    """
+    Возвращает хэш содержимого файла.
+    Для неизменённого файла (тот же путь, размер и время изменения) хэш берётся из кэша без чтения.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Хэш содержимого файла
+
+    Raises:
+        FileReadError: Ошибка при чтении файла данных
+    """
+
+    try:
+        real_path = os.path.realpath(path)
+        stat = os.stat(real_path)
+
+        quick_key = (real_path, stat.st_size, stat.st_mtime_ns)
+
+        digest = _file_digests.get(quick_key)
+
+        if digest is not None:
+            return digest
+
+        hasher = hashlib.blake2b(digest_size=16)
+
+        with open(real_path, "rb") as file:
+            while chunk := file.read(NORMALIZATION_CHUNK_SIZE):
+                hasher.update(chunk)
+    except OSError as ex:
+        raise FileReadError(str(Path(path).absolute()), str(ex))
+
+    digest = hasher.hexdigest()
+
+    _file_digests[quick_key] = digest
+
+    return digest
+
+
+def load_normalized_text(path: str, language: Language) -> str:
+    """
+    Загружает файл .TXT, нормализует его и оставляет только слова языка, разделённые пробелом.
+    Файл обрабатывается потоково по фрагментам; результат кэшируется по хэшу содержимого.
+
+    Args:
+        path: Путь к файлу
+        language: Язык текста
+
+    Returns:
+        Слова текста, разделённые пробелом
+
+    Raises:
+        FileSuffixError: Неверное расширение файла данных
+        FileReadError: Ошибка при чтении файла данных
+    """
+
+    _check_txt_suffix(Path(path))
+
+    cache_key = (get_file_digest(path), Language(language))
+
+    cached = _normalized_text_cache.get(cache_key)
+
+    if cached is not None:
+        _normalized_text_cache.move_to_end(cache_key)
+
+        return cached
+
+    regex = get_language_profile(language).regex
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    result = io.StringIO()
+    carry = ""
+    separator = ""
+
+    def flush(piece: str):
+        nonlocal separator
+
+        tokens = regex.findall(normalize_chunk(piece))
+
+        if tokens:
+            result.write(separator)
+            result.write(" ".join(tokens))
+
+            separator = " "
+
+    try:
+        with open(path, "rb") as file:
+            while chunk := file.read(NORMALIZATION_CHUNK_SIZE):
+                buffer = carry + decoder.decode(chunk)
+
+                cut = max(buffer.rfind(char) for char in WHITESPACE_CHARS)
+
+                if cut < 0 and len(buffer) < 4 * NORMALIZATION_CHUNK_SIZE:
+                    carry = buffer
+
+                    continue
+
+                if cut < 0:
+                    cut = len(buffer) - 1
+
+                flush(buffer[:cut + 1])
+
+                carry = buffer[cut + 1:]
+    except OSError as ex:
+        raise FileReadError(str(Path(path).absolute()), str(ex))
+
+    flush(carry + decoder.decode(b"", final=True))
+
+    text = result.getvalue()
+
+    _normalized_text_cache[cache_key] = text
+
+    if len(_normalized_text_cache) > NORMALIZED_TEXT_CACHE_SIZE:
+        _normalized_text_cache.popitem(last=False)
+
+    return text
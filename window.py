@@ -0,0 +1,187 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Optional, Any
+
+from enums.route import Route
+from enums.settings import SettingsParam
+from enums.theme_mode import ThemeMode
+from frames.base import BaseFrame
+from frames.router import FrameRouter
+from settings import Settings
+from utils.error_model import ErrorModel
+from utils.fonts import FontRegistry
+from utils.profiles import Profile
+from utils.scheduler import Scheduler
+from utils.settings_store import SettingsStore
+from utils.storage import merge_dicts
+
+
+class TrainerWindow(tk.Toplevel):
+    """
+    Дополнительное окно тренажёра в процессе приложения.
+    Для фреймов окно - такой же контроллер, как приложение: у него свои маршруты, настройки и шрифты ролей,
+    а корпуса слов, собранные стили, профили, модели ошибок и планировщик берутся у приложения.
+    Тема ttk одна на процесс, поэтому смена темы в окне меняет её во всех окнах.
+    """
+
+    def __init__(
+            self,
+            app,
+            index: int,
+            frames: dict[Route, type[BaseFrame]],
+            settings: Settings,
+            style: ttk.Style,
+            geometry: Optional[str] = None
+    ):
+        """
+        Args:
+            app: Приложение
+            index: Номер окна
+            frames: Классы фреймов по маршрутам
+            settings: Начальные настройки окна
+            style: Стиль ttk приложения
+            geometry: Размер и положение окна (опционально)
+        """
+
+        super().__init__(app)
+
+        self.__app = app
+        self.__index = index
+
+        self.__fonts = app.fonts.scoped()
+
+        self.__settings_store = SettingsStore(settings)
+
+        if geometry:
+            self.geometry(geometry)
+
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+
+        self.__router = FrameRouter(FrameRouter.build_container(self), self, frames, style)
+
+        self.__settings_store.subscribe((SettingsParam.THEME_MODE.value,), self.__on_theme_mode_changed)
+        self.__settings_store.subscribe((SettingsParam.LANGUAGE.value,), self.__on_language_changed)
+
+    @property
+    def index(self) -> int:
+        return self.__index
+
+    @property
+    def frames(self) -> list[BaseFrame]:
+        return self.__router.frames
+
+    @property
+    def scheduler(self) -> Scheduler:
+        return self.__app.scheduler
+
+    @property
+    def fonts(self) -> FontRegistry:
+        return self.__fonts
+
+    @property
+    def settings_store(self) -> SettingsStore:
+        return self.__settings_store
+
+    @property
+    def settings(self) -> Settings:
+        return self.__settings_store.settings
+
+    @settings.setter
+    def settings(self, value: Settings):
+        self.__settings_store.update(value)
+
+    def save_settings(self, data: dict[str, Any], path: Optional[str] = None):
+        """
+        Применить настройки окна. Настройки окна живут, пока открыто окно, и в файл не записываются.
+
+        Args:
+            data: Настройки в формате словаря
+            path: Не используется (для совместимости с приложением)
+        """
+
+        current = self.settings.data
+
+        merge_dicts(current, data)
+
+        self.settings = Settings(current)
+
+    @property
+    def profiles(self) -> list[Profile]:
+        return self.__app.profiles
+
+    @property
+    def profile(self) -> Profile:
+        """Активный профиль с собственными файлами незаконченного упражнения окна."""
+
+        return self.__app.profile.for_station(self.__index)
+
+    @property
+    def error_model(self) -> ErrorModel:
+        return self.__app.error_model
+
+    def save_error_model(self):
+        self.__app.save_error_model()
+
+    def create_profile(self, name: str) -> Optional[Profile]:
+        return self.__app.create_profile(name)
+
+    def switch_profile(self, profile_id: str):
+        self.__app.switch_profile(profile_id)
+
+    @property
+    def route(self) -> Optional[Route]:
+        return self.__router.route
+
+    @route.setter
+    def route(self, value: Route):
+        self.go(value)
+
+    def go(self, route: Route, force_refresh: bool = False):
+        self.__router.go(route, force_refresh)
+
+    def open_window(self, geometry: Optional[str] = None) -> "TrainerWindow":
+        return self.__app.open_window(geometry)
+
+    @property
+    def theme_mode(self) -> ThemeMode:
+        return self.__app.theme_mode
+
+    def toggle_theme_mode(self, theme_mode: Optional[ThemeMode] = None):
+        self.__app.toggle_theme_mode(theme_mode)
+
+    def refresh_styles(self) -> ttk.Style:
+        return self.__app.refresh_styles()
+
+    def configure_style_by_path(self, style, path):
+        self.__app.configure_style_by_path(style, path)
+
+    def title(self, string: Optional[str] = None):
+        if string is None:
+            return super().title()
+
+        return super().title(f"{string} - Окно {self.__index}")
+
+    def show_error(self, title: str = "Ошибка", message: str = "Произошла неизвестная ошибка"):
+        self.__app.show_error(title, message)
+
+    def show_warning(self, title: str = "Предупреждение", message: str = ""):
+        self.__app.show_warning(title, message)
+
+    def show_info(self, title: str = "Информация", message: str = ""):
+        self.__app.show_info(title, message)
+
+    def destroy(self):
+        self.__router.close()
+
+        self.__app._forget_window(self)
+
+        super().destroy()
+
+    def __on_theme_mode_changed(self, changes: dict[str, Any]):
+        theme_mode = changes[SettingsParam.THEME_MODE.value]
+
+        if theme_mode != self.__app.theme_mode:
+            self.__app.toggle_theme_mode(theme_mode)
+
+    def __on_language_changed(self, changes: dict[str, Any]):
+        self.__app.prefetch_corpus(changes[SettingsParam.LANGUAGE.value])